@@ -1,8 +1,10 @@
 """ML Pipeline Package for WinMix TipsterHub."""
 
+from .evaluation_report import EvaluationReport
+from .feature_store import TeamFeatureStore
 from .ml_logging import MLLogger, get_logger
 from .prediction_engine import PredictionEngine
 from .train_model import ModelTrainer
 
 __version__ = "1.0.0"
-__all__ = ["MLLogger", "get_logger", "PredictionEngine", "ModelTrainer"]
+__all__ = ["MLLogger", "get_logger", "PredictionEngine", "ModelTrainer", "TeamFeatureStore", "EvaluationReport"]
@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""Walk-forward historical backtesting.
+
+History is replayed in date order. At every retraining boundary a fresh
+model and preprocessor are fitted on the matches played before it (an
+expanding window, or the last ``train_window_days``), and all fixtures up to
+the next boundary are scored in one batch. Features come from the raw
+results via ``build_training_matrix``, so each fixture only sees matches
+played before it. Independent groups (leagues by default) run in parallel
+worker processes.
+
+Each period reports accuracy, log-loss and Brier score. When bookmaker odds
+are present, it also reports a flat-stake value-betting P&L: one bet per
+fixture on the outcome with the highest positive expected value. The overall
+and per-group summaries add calibration and confidence-band metrics from
+``EvaluationReport``.
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+
+from evaluation_report import EvaluationReport
+from train_model import ModelTrainer
+from utils.dtypes import OUTCOME_LABELS
+from utils.feature_engineering import engineer_features, is_raw_matches
+from utils.preprocessing import FeaturePreprocessor
+
+ALL_MATCHES = "all"
+
+
+def _prepare_history(matches: pd.DataFrame, config: Dict[str, Any]) -> pd.DataFrame:
+    """Date-sorted feature matrix for a group, keeping odds columns aligned."""
+    matches = matches.assign(date=pd.to_datetime(matches["date"]))
+    matches = matches.sort_values("date", kind="stable").reset_index(drop=True)
+    if not is_raw_matches(matches):
+        return matches
+
+    # build_training_matrix keeps the (already stable-sorted) row order
+    history = engineer_features(matches, config)
+    for col in config.get("backtest", {}).get("odds_columns", []):
+        if col in matches.columns:
+            history[col] = matches[col].to_numpy()
+    return history
+
+
+def _score_period(
+    y: np.ndarray,
+    proba: np.ndarray,
+    odds: Optional[np.ndarray],
+    stake: float,
+    min_edge: float,
+) -> Dict[str, Any]:
+    """Accuracy, log-loss, Brier score and value-betting P&L for one batch of fixtures."""
+    n = len(y)
+    rows = np.arange(n)
+    p_actual = np.clip(proba[rows, y], 1e-15, 1.0)
+    onehot = np.zeros_like(proba)
+    onehot[rows, y] = 1.0
+    metrics = {
+        "n_matches": int(n),
+        "accuracy": float(np.mean(proba.argmax(axis=1) == y)),
+        "log_loss": float(-np.mean(np.log(p_actual))),
+        "brier": float(np.mean(np.sum((proba - onehot) ** 2, axis=1))),
+    }
+
+    if odds is not None:
+        edge = np.where(np.isfinite(odds), proba * odds - 1.0, -np.inf)
+        pick = edge.argmax(axis=1)
+        bet = edge[rows, pick] > min_edge
+        returns = np.where(pick == y, stake * (odds[rows, pick] - 1.0), -stake)
+        staked = float(stake * bet.sum())
+        profit = float(returns[bet].sum())
+        metrics.update({
+            "n_bets": int(bet.sum()),
+            "staked": staked,
+            "profit": profit,
+            "roi": profit / staked if staked else None,
+        })
+    return metrics
+
+
+def walk_forward(
+    trainer: ModelTrainer,
+    history: pd.DataFrame,
+    algorithm: str,
+    retrain_frequency: str = "30D",
+    min_train_matches: int = 200,
+    train_window_days: Optional[int] = None,
+) -> Tuple[List[Dict[str, Any]], pd.DataFrame]:
+    """Replay a date-sorted feature matrix with periodic retraining.
+
+    Returns per-period metrics and a frame of out-of-sample class
+    probabilities for every scored fixture.
+    """
+    config = trainer.config
+    input_features = config["inference"]["input_features"]
+    target = config["inference"]["prediction_target"]
+    backtest = config.get("backtest", {})
+    odds_columns = backtest.get("odds_columns", [])
+    has_odds = bool(odds_columns) and all(col in history.columns for col in odds_columns)
+    stake = backtest.get("stake", 1.0)
+    min_edge = backtest.get("min_edge", 0.0)
+
+    dates = history["date"].to_numpy(dtype="datetime64[ns]")
+    X_all = history[input_features].to_numpy(dtype=np.float32)
+    y_all = history[target].to_numpy(dtype=np.int64)
+    odds_all = history[odds_columns].to_numpy(dtype=np.float64) if has_odds else None
+    n_classes = len(OUTCOME_LABELS)
+
+    periods: List[Dict[str, Any]] = []
+    proba_all = np.full((len(history), n_classes), np.nan)
+    if len(history) <= min_train_matches:
+        return periods, pd.DataFrame()
+
+    first = pd.Timestamp(dates[min_train_matches]).normalize()
+    boundaries = pd.date_range(first, pd.Timestamp(dates[-1]) + pd.Timedelta(retrain_frequency), freq=retrain_frequency)
+    window = np.timedelta64(train_window_days, "D") if train_window_days else None
+
+    for start, end in zip(boundaries[:-1], boundaries[1:]):
+        start64, end64 = np.datetime64(start, "ns"), np.datetime64(end, "ns")
+        test_lo, test_hi = np.searchsorted(dates, [start64, end64], side="left")
+        train_lo = np.searchsorted(dates, start64 - window, side="left") if window is not None else 0
+        if test_hi == test_lo or test_lo - train_lo < min_train_matches:
+            continue
+
+        period_start = time.perf_counter()
+        preprocessor = FeaturePreprocessor.from_config(config)
+        X_train = preprocessor.fit_transform(X_all[train_lo:test_lo].copy())
+        y_train = y_all[train_lo:test_lo]
+        model = trainer.build_model(algorithm, n_samples=len(y_train))
+        model.fit(X_train, y_train)
+
+        # Score the whole period in one batch; columns follow the model's classes
+        X_test = preprocessor.transform(X_all[test_lo:test_hi])
+        proba = np.zeros((test_hi - test_lo, n_classes))
+        proba[:, model.classes_.astype(np.int64)] = model.predict_proba(X_test)
+        proba_all[test_lo:test_hi] = proba
+
+        metrics = _score_period(
+            y_all[test_lo:test_hi],
+            proba,
+            odds_all[test_lo:test_hi] if has_odds else None,
+            stake,
+            min_edge,
+        )
+        periods.append({
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "n_train": int(test_lo - train_lo),
+            **metrics,
+            "seconds": time.perf_counter() - period_start,
+        })
+
+    scored = ~np.isnan(proba_all[:, 0])
+    predictions = pd.DataFrame(proba_all[scored], columns=[f"proba_{label}" for label in OUTCOME_LABELS])
+    predictions.insert(0, "date", history["date"].to_numpy()[scored])
+    predictions.insert(1, target, y_all[scored])
+    if "match_id" in history.columns:
+        predictions.insert(0, "match_id", history["match_id"].to_numpy()[scored])
+    if has_odds:
+        predictions[odds_columns] = odds_all[scored]
+    return periods, predictions
+
+
+def _calibration_summary(report: EvaluationReport, model_id: str) -> Dict[str, Any]:
+    """Calibration and per-confidence-band metrics of the scored fixtures in a report."""
+    model_report = report.result()["models"][model_id]
+    return {
+        "calibration": model_report["overall"]["calibration"],
+        "by_confidence_band": {
+            band: {key: value for key, value in band_report.items() if key != "calibration"}
+            for band, band_report in model_report["by_confidence_band"].items()
+        },
+    }
+
+
+def _backtest_group(
+    config_path: str,
+    group: str,
+    matches: pd.DataFrame,
+    algorithm: str,
+) -> Tuple[str, List[Dict[str, Any]], pd.DataFrame]:
+    """Run one independent walk-forward backtest (in a worker process)."""
+    trainer = ModelTrainer(config_path)
+    backtest = trainer.config.get("backtest", {})
+    history = _prepare_history(matches, trainer.config)
+    periods, predictions = walk_forward(
+        trainer,
+        history,
+        algorithm,
+        retrain_frequency=backtest.get("retrain_frequency", "30D"),
+        min_train_matches=backtest.get("min_train_matches", 200),
+        train_window_days=backtest.get("train_window_days"),
+    )
+    trainer.logger.info(f"Backtest {group}: {len(periods)} periods, {len(predictions)} fixtures scored")
+    return group, periods, predictions
+
+
+def run_backtest(
+    matches: pd.DataFrame,
+    config_path: str = "ml_pipeline/model_config.yaml",
+    algorithm: Optional[str] = None,
+    n_jobs: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Backtest every group of a match history in parallel and summarise the results."""
+    trainer = ModelTrainer(config_path)
+    config = trainer.config
+    backtest = config.get("backtest", {})
+    algorithm = algorithm or backtest.get("algorithm") or config["training"]["algorithm"]
+    target = config["inference"]["prediction_target"]
+    group_by = backtest.get("group_by")
+
+    if group_by and group_by in matches.columns:
+        groups = [(str(name), group) for name, group in matches.groupby(group_by, sort=True)]
+    else:
+        groups = [(ALL_MATCHES, matches)]
+
+    start = time.perf_counter()
+    results = Parallel(n_jobs=n_jobs if n_jobs is not None else backtest.get("n_jobs", -1))(
+        delayed(_backtest_group)(config_path, name, group, algorithm) for name, group in groups
+    )
+
+    calibration = EvaluationReport.from_config(config)
+    summary_frames = []
+    report_groups: Dict[str, Any] = {}
+    odds_columns = backtest.get("odds_columns", [])
+    for name, periods, predictions in results:
+        report_groups[name] = {"periods": periods}
+        if predictions.empty:
+            report_groups[name]["summary"] = {"n_matches": 0}
+            continue
+
+        proba = predictions[[f"proba_{label}" for label in OUTCOME_LABELS]].to_numpy()
+        y = predictions[target].to_numpy(dtype=np.int64)
+        odds = predictions[odds_columns].to_numpy() if odds_columns and all(c in predictions for c in odds_columns) else None
+        report_groups[name]["summary"] = _score_period(
+            y, proba, odds, backtest.get("stake", 1.0), backtest.get("min_edge", 0.0)
+        )
+        summary_frames.append((y, proba, odds))
+
+        labels = np.array(OUTCOME_LABELS)
+        scored = pd.DataFrame({
+            "model_id": algorithm,
+            "league": name,
+            "prediction": labels[proba.argmax(axis=1)],
+            "actual_result": labels[y],
+            "confidence": proba.max(axis=1),
+        })
+        calibration.update(scored)
+        group_calibration = EvaluationReport.from_config(config)
+        group_calibration.update(scored)
+        report_groups[name]["summary"].update(_calibration_summary(group_calibration, algorithm))
+
+    summary: Dict[str, Any] = {"n_matches": 0}
+    if summary_frames:
+        y = np.concatenate([f[0] for f in summary_frames])
+        proba = np.concatenate([f[1] for f in summary_frames])
+        odds = None
+        if all(f[2] is not None for f in summary_frames):
+            odds = np.concatenate([f[2] for f in summary_frames])
+        summary = _score_period(y, proba, odds, backtest.get("stake", 1.0), backtest.get("min_edge", 0.0))
+        summary.update(_calibration_summary(calibration, algorithm))
+
+    return {
+        "algorithm": algorithm,
+        "retrain_frequency": backtest.get("retrain_frequency", "30D"),
+        "train_window_days": backtest.get("train_window_days"),
+        "groups": report_groups,
+        "summary": summary,
+        "duration_seconds": time.perf_counter() - start,
+    }
+
+
+def main():
+    """CLI interface for backtesting."""
+    parser = argparse.ArgumentParser(description="Walk-forward Backtest")
+    parser.add_argument(
+        "--config",
+        default="ml_pipeline/model_config.yaml",
+        help="Path to model config",
+    )
+    parser.add_argument(
+        "--data",
+        required=True,
+        help="Raw match history CSV (date, home_team, away_team, home_goals, away_goals; league and odds optional)",
+    )
+    parser.add_argument(
+        "--algorithm",
+        help="Algorithm to backtest (defaults to backtest.algorithm)",
+    )
+    parser.add_argument(
+        "--n-jobs",
+        type=int,
+        help="Parallel worker processes (defaults to backtest.n_jobs)",
+    )
+    parser.add_argument(
+        "--output",
+        default="ml_pipeline/logs/backtests/backtest.json",
+        help="Path of the JSON report",
+    )
+
+    args = parser.parse_args()
+
+    report = run_backtest(pd.read_csv(args.data), args.config, args.algorithm, args.n_jobs)
+
+    output_path = Path(args.output)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, "w") as f:
+        json.dump(report, f, indent=2)
+    print(
+        f"Backtest of {report['summary']['n_matches']} fixtures in {report['duration_seconds']:.1f}s "
+        f"saved to {output_path}"
+    )
+
+
+if __name__ == "__main__":
+    main()
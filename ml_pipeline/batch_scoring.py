@@ -0,0 +1,200 @@
+"""Checkpointed, resumable batch scoring jobs.
+
+A job scores its input CSV in fixed-size chunks. Before a chunk is logged,
+its event ids are reserved in a durable sidecar file. Once scored, the chunk
+output is committed atomically as a part file and recorded in the job
+manifest. After a crash, rerunning the same job id skips committed chunks.
+For the chunk that was in flight it reuses the reserved ids and does not log
+rows that already reached the evaluation log, so no work is repeated and
+nothing is logged twice. When every chunk is committed, the parts are
+concatenated into the output CSV.
+"""
+
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+import pandas as pd
+
+from utils.ids import new_event_ids
+
+MANIFEST_VERSION = 1
+
+
+def _fsync_write(path: Path, data: bytes) -> None:
+    """Write a file durably and atomically (temp file, fsync, rename)."""
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class BatchScoringJob:
+    """One resumable batch scoring run, identified by its job id."""
+
+    def __init__(
+        self,
+        engine: Any,
+        input_path: str,
+        job_id: str,
+        output_path: Optional[str] = None,
+        chunk_size: Optional[int] = None,
+        checkpoint_dir: Optional[str] = None,
+    ):
+        self.engine = engine
+        self.input_path = Path(input_path)
+        self.job_id = job_id
+        self.output_path = Path(output_path or str(input_path).replace(".csv", "_predictions.csv"))
+
+        scoring_config = engine.config.get("batch_scoring", {})
+        self.chunk_size = chunk_size or scoring_config.get("chunk_size", 50_000)
+        self.job_dir = Path(checkpoint_dir or scoring_config.get("checkpoint_dir", "ml_pipeline/logs/batch_jobs")) / job_id
+        self.manifest_path = self.job_dir / "manifest.json"
+        self.manifest = self._load_manifest()
+
+    def _input_fingerprint(self) -> Dict[str, int]:
+        """Size and modification time of the input, to detect a changed file on resume."""
+        stat = self.input_path.stat()
+        return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    def _load_manifest(self) -> Dict[str, Any]:
+        """Load the job's manifest, or start a new one."""
+        if not self.manifest_path.exists():
+            return {
+                "version": MANIFEST_VERSION,
+                "job_id": self.job_id,
+                "input": str(self.input_path),
+                "input_fingerprint": self._input_fingerprint(),
+                "output": str(self.output_path),
+                "chunk_size": self.chunk_size,
+                "model_id": self.engine.active_model_id,
+                "status": "running",
+                "rows_committed": 0,
+                "chunks": [],
+                "pending": None,
+                "created_at": datetime.utcnow().isoformat(),
+            }
+
+        with open(self.manifest_path, "r") as f:
+            manifest = json.load(f)
+        if manifest["status"] == "completed":
+            return manifest
+        # Resuming must reproduce the same chunk boundaries, inputs and model
+        if manifest["input_fingerprint"] != self._input_fingerprint():
+            raise ValueError(f"Input {self.input_path} changed since job {self.job_id} started")
+        if manifest["model_id"] != self.engine.active_model_id:
+            raise ValueError(
+                f"Job {self.job_id} was started with model {manifest['model_id']}, "
+                f"active model is {self.engine.active_model_id}"
+            )
+        self.chunk_size = manifest["chunk_size"]
+        self.output_path = Path(manifest["output"])
+        return manifest
+
+    def _save_manifest(self) -> None:
+        """Durably replace the manifest."""
+        self.manifest["updated_at"] = datetime.utcnow().isoformat()
+        _fsync_write(self.manifest_path, json.dumps(self.manifest, indent=2).encode())
+
+    def _reserve_event_ids(self, index: int, n_rows: int) -> List[str]:
+        """Event ids for a chunk: reused from an interrupted attempt, else newly reserved."""
+        pending = self.manifest.get("pending")
+        ids_path = self.job_dir / f"chunk-{index:05d}.ids"
+        if pending and pending["index"] == index and ids_path.exists():
+            event_ids = ids_path.read_text().split()
+            if len(event_ids) == n_rows:
+                return event_ids
+
+        event_ids = new_event_ids(n_rows)
+        _fsync_write(ids_path, "\n".join(event_ids).encode())
+        self.manifest["pending"] = {"index": index, "rows": n_rows, "ids_file": ids_path.name}
+        self._save_manifest()
+        return event_ids
+
+    def _already_logged(self, event_ids: List[str]) -> Set[str]:
+        """Ids of a chunk that an interrupted attempt already wrote to the evaluation log."""
+        log_path = self.engine.ml_logger.eval_log_path
+        if not Path(log_path).exists():
+            return set()
+        wanted = set(event_ids)
+        logged: Set[str] = set()
+        for chunk in pd.read_csv(log_path, usecols=["event_id"], dtype="string", chunksize=500_000):
+            logged.update(chunk["event_id"][chunk["event_id"].isin(wanted)].tolist())
+        return logged
+
+    def _score_chunk(self, index: int, chunk: pd.DataFrame) -> None:
+        """Score, log and commit one chunk."""
+        resuming = bool(self.manifest.get("pending")) and self.manifest["pending"]["index"] == index
+        event_ids = self._reserve_event_ids(index, len(chunk))
+        skip = self._already_logged(event_ids) if resuming else set()
+
+        results = self.engine.batch_predict(chunk, event_ids=event_ids, skip_logging=skip)
+
+        part_name = f"part-{index:05d}.csv"
+        _fsync_write(self.job_dir / part_name, results.to_csv(index=False).encode())
+        self.manifest["chunks"].append({
+            "index": index,
+            "rows": len(chunk),
+            "part": part_name,
+            # Rows an interrupted attempt had already logged
+            "previously_logged": len(skip),
+            "committed_at": datetime.utcnow().isoformat(),
+        })
+        self.manifest["rows_committed"] += len(chunk)
+        self.manifest["pending"] = None
+        self._save_manifest()
+        (self.job_dir / f"chunk-{index:05d}.ids").unlink(missing_ok=True)
+
+    def _assemble_output(self) -> None:
+        """Concatenate committed parts into the output CSV, keeping one header."""
+        tmp_path = self.output_path.with_name(f".{self.output_path.name}.tmp")
+        self.output_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, "wb") as out:
+            for i, chunk in enumerate(sorted(self.manifest["chunks"], key=lambda c: c["index"])):
+                with open(self.job_dir / chunk["part"], "rb") as part:
+                    if i > 0:
+                        part.readline()
+                    while True:
+                        block = part.read(1 << 20)
+                        if not block:
+                            break
+                        out.write(block)
+            out.flush()
+            os.fsync(out.fileno())
+        os.replace(tmp_path, self.output_path)
+
+    def run(self) -> Dict[str, Any]:
+        """Score every uncommitted chunk and write the output; safe to call again after a crash."""
+        if self.manifest["status"] == "completed":
+            return self.manifest
+
+        self.job_dir.mkdir(parents=True, exist_ok=True)
+        self._save_manifest()
+
+        committed = {chunk["index"] for chunk in self.manifest["chunks"]}
+        start_row = self.manifest["rows_committed"]
+        first_index = len(committed)
+        if committed:
+            self.engine.logger.info(f"Resuming batch job {self.job_id} at chunk {first_index} (row {start_row})")
+
+        reader = pd.read_csv(
+            self.input_path,
+            chunksize=self.chunk_size,
+            skiprows=range(1, start_row + 1) if start_row else None,
+        )
+        for index, chunk in enumerate(reader, start=first_index):
+            chunk = chunk.reset_index(drop=True)
+            self._score_chunk(index, chunk)
+
+        self._assemble_output()
+        self.manifest["status"] = "completed"
+        self.manifest["completed_at"] = datetime.utcnow().isoformat()
+        self._save_manifest()
+        self.engine.logger.info(
+            f"Batch job {self.job_id} completed: {self.manifest['rows_committed']} rows to {self.output_path}"
+        )
+        return self.manifest
@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+"""Serving-path micro-benchmarks with regression gates.
+
+Cases cover the hot paths of live serving:
+
+- ``predict``: single-match latency through ``PredictionEngine.predict``
+- ``batch_predict``: rows/sec through ``PredictionEngine.batch_predict``
+- ``log_prediction``: ``MLLogger.log_prediction`` throughput
+- ``log_evaluation``: cost of settling one prediction as the log grows
+
+The engine serves a freshly fitted model from a temporary registry, and
+Supabase writes go to an in-memory stand-in, so timings reflect local work
+only. Results carry p50/p99 latencies and throughput. When compared against
+a stored baseline, any case whose latency or throughput regresses beyond
+the configured thresholds fails the run.
+"""
+
+import argparse
+import copy
+import json
+import pickle
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import sklearn
+import yaml
+from sklearn.linear_model import LogisticRegression
+
+from ml_logging import MLLogger
+from prediction_engine import PredictionEngine
+from utils.ids import new_event_ids
+from utils.memory_store import InMemorySupabaseClient
+from utils.preprocessing import FeaturePreprocessor
+
+DEFAULT_BATCH_SIZES = [1, 100, 10_000, 1_000_000]
+DEFAULT_LOG_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+DEFAULT_ITERATIONS = {"predict": 200, "log_prediction": 1000, "log_evaluation": 20, "batch_predict": 3}
+
+BENCH_MODEL_ID = "bench_logistic_regression"
+
+
+def latency_summary(samples_ns: List[int]) -> Dict[str, float]:
+    """p50/p99/mean/max latency in milliseconds."""
+    ms = np.asarray(samples_ns, dtype=np.float64) / 1e6
+    return {
+        "p50_ms": float(np.percentile(ms, 50)),
+        "p99_ms": float(np.percentile(ms, 99)),
+        "mean_ms": float(ms.mean()),
+        "max_ms": float(ms.max()),
+    }
+
+
+def _time_calls(fn: Callable[[int], Any], iterations: int, warmup: int = 1) -> List[int]:
+    """Per-call wall times in nanoseconds after warm-up calls."""
+    for i in range(warmup):
+        fn(i)
+    samples = []
+    for i in range(iterations):
+        start = time.perf_counter_ns()
+        fn(i)
+        samples.append(time.perf_counter_ns() - start)
+    return samples
+
+
+def _feature_frame(input_features: List[str], n_rows: int, random_state: int = 42) -> pd.DataFrame:
+    """Random feature rows on the 0-10 rating scale with match ids."""
+    rng = np.random.default_rng(random_state)
+    df = pd.DataFrame(
+        rng.uniform(0.0, 10.0, size=(n_rows, len(input_features))).astype(np.float32),
+        columns=input_features,
+    )
+    df["match_id"] = np.char.add("bench_", np.arange(n_rows).astype(str))
+    return df
+
+
+def build_engine(config_path: str, workdir: Path) -> PredictionEngine:
+    """PredictionEngine serving a fitted model from a temporary registry, logging in memory."""
+    engine = PredictionEngine(config_path)
+    # Benchmark the champion path only
+    engine.config = copy.deepcopy(engine.config)
+    engine.config.setdefault("champion_challenger", {})["shadow_scoring"] = False
+    input_features = engine.config["inference"]["input_features"]
+
+    train = _feature_frame(input_features, 2000)
+    X = train[input_features].to_numpy(dtype=np.float32, copy=True)
+    y = np.arange(len(X)) % 3
+    preprocessor = FeaturePreprocessor.from_config(engine.config)
+    model = LogisticRegression(max_iter=1000).fit(preprocessor.fit_transform(X), y)
+
+    models_dir = workdir / "models"
+    models_dir.mkdir(parents=True, exist_ok=True)
+    with open(models_dir / f"{BENCH_MODEL_ID}.pkl", "wb") as f:
+        pickle.dump(model, f)
+    with open(models_dir / f"{BENCH_MODEL_ID}_preprocessor.pkl", "wb") as f:
+        pickle.dump(preprocessor, f)
+
+    engine.model_registry = {
+        "models": [{
+            "model_id": BENCH_MODEL_ID,
+            "algorithm": "LogisticRegression",
+            "features": input_features,
+            "artifact_path": str(models_dir / f"{BENCH_MODEL_ID}.pkl"),
+        }],
+    }
+    engine.ml_logger = build_logger(workdir / "logs")
+    if not engine.load_model(BENCH_MODEL_ID):
+        raise RuntimeError("Failed to load benchmark model")
+    return engine
+
+
+def build_logger(log_dir: Path) -> MLLogger:
+    """MLLogger writing CSV to a temporary directory and Supabase rows to memory."""
+    ml_logger = MLLogger(log_dir=str(log_dir))
+    ml_logger.supabase = InMemorySupabaseClient()
+    return ml_logger
+
+
+def bench_predict(engine: PredictionEngine, iterations: int) -> Dict[str, Any]:
+    """Single-match predict latency."""
+    features = _feature_frame(engine.config["inference"]["input_features"], iterations + 1)
+    rows = features[engine.config["inference"]["input_features"]].to_numpy().tolist()
+    samples = _time_calls(lambda i: engine.predict(rows[i], match_id=f"bench_{i}"), iterations)
+    return {
+        "case": "predict",
+        "n_rows": 1,
+        "iterations": iterations,
+        "latency": latency_summary(samples),
+        "throughput_per_sec": iterations / (sum(samples) / 1e9),
+    }
+
+
+def bench_batch_predict(engine: PredictionEngine, n_rows: int, iterations: int) -> Dict[str, Any]:
+    """batch_predict latency and rows/sec at one batch size."""
+    data = _feature_frame(engine.config["inference"]["input_features"], n_rows)
+    samples = _time_calls(lambda i: engine.batch_predict(data), iterations, warmup=1 if n_rows <= 10_000 else 0)
+    return {
+        "case": "batch_predict",
+        "n_rows": n_rows,
+        "iterations": iterations,
+        "latency": latency_summary(samples),
+        "throughput_per_sec": n_rows * iterations / (sum(samples) / 1e9),
+    }
+
+
+def bench_log_prediction(workdir: Path, iterations: int) -> Dict[str, Any]:
+    """MLLogger.log_prediction throughput."""
+    ml_logger = build_logger(workdir / "log_prediction")
+    samples = _time_calls(
+        lambda i: ml_logger.log_prediction(
+            model_id=BENCH_MODEL_ID, match_id=f"bench_{i}", prediction="H", confidence=0.7
+        ),
+        iterations,
+    )
+    return {
+        "case": "log_prediction",
+        "n_rows": 1,
+        "iterations": iterations,
+        "latency": latency_summary(samples),
+        "throughput_per_sec": iterations / (sum(samples) / 1e9),
+    }
+
+
+def _write_evaluation_log(path: Path, n_rows: int) -> List[str]:
+    """Write an evaluation log of pending predictions and return their event ids."""
+    event_ids = new_event_ids(n_rows)
+    now = datetime.utcnow().isoformat()
+    pd.DataFrame({
+        "timestamp": now,
+        "event_id": event_ids,
+        "event_type": "prediction",
+        "model_id": BENCH_MODEL_ID,
+        "match_id": np.char.add("bench_", np.arange(n_rows).astype(str)),
+        "prediction": "H",
+        "actual_result": None,
+        "confidence": 0.7,
+        "accuracy": None,
+        "metadata": "{}",
+        "status": "pending",
+        "league": None,
+    }).to_csv(path, index=False)
+    return event_ids
+
+
+def bench_log_evaluation(workdir: Path, log_size: int, iterations: int) -> Dict[str, Any]:
+    """Cost of settling one prediction in a log of ``log_size`` rows."""
+    log_dir = workdir / f"log_evaluation_{log_size}"
+    log_dir.mkdir(parents=True, exist_ok=True)
+    event_ids = _write_evaluation_log(log_dir / "evaluation_log.csv", log_size)
+    ml_logger = build_logger(log_dir)
+
+    rng = np.random.default_rng(0)
+    targets = [event_ids[i] for i in rng.integers(0, log_size, iterations + 1)]
+    samples = _time_calls(
+        lambda i: ml_logger.log_evaluation(targets[i], actual_result="H", accuracy=1.0),
+        iterations,
+    )
+    return {
+        "case": "log_evaluation",
+        "n_rows": log_size,
+        "iterations": iterations,
+        "latency": latency_summary(samples),
+        "throughput_per_sec": iterations / (sum(samples) / 1e9),
+    }
+
+
+def run_benchmark(
+    batch_sizes: List[int],
+    log_sizes: List[int],
+    config_path: str = "ml_pipeline/model_config.yaml",
+    iterations: Optional[Dict[str, int]] = None,
+) -> Dict[str, Any]:
+    """Run every serving case and return the report."""
+    iterations = {**DEFAULT_ITERATIONS, **(iterations or {})}
+    results = []
+    with tempfile.TemporaryDirectory() as tmpdir:
+        workdir = Path(tmpdir)
+        engine = build_engine(config_path, workdir)
+
+        results.append(bench_predict(engine, iterations["predict"]))
+        for n_rows in batch_sizes:
+            results.append(bench_batch_predict(engine, n_rows, iterations["batch_predict"]))
+        results.append(bench_log_prediction(workdir, iterations["log_prediction"]))
+        for log_size in log_sizes:
+            results.append(bench_log_evaluation(workdir, log_size, iterations["log_evaluation"]))
+
+    return {
+        "benchmark": "serving",
+        "created_at": datetime.utcnow().isoformat(),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "scikit-learn": sklearn.__version__,
+        },
+        "parameters": {
+            "batch_sizes": batch_sizes,
+            "log_sizes": log_sizes,
+            "iterations": iterations,
+        },
+        "results": results,
+    }
+
+
+def compare_to_baseline(
+    report: Dict[str, Any],
+    baseline: Dict[str, Any],
+    max_latency_regression: float = 0.25,
+    max_throughput_regression: float = 0.20,
+) -> List[Dict[str, Any]]:
+    """Cases whose p50/p99 latency grew or throughput fell beyond the thresholds.
+
+    Thresholds are relative: 0.25 fails a case whose latency is more than
+    25% above the baseline. Cases missing from the baseline are not gated.
+    """
+    baseline_cases = {(r["case"], r["n_rows"]): r for r in baseline.get("results", [])}
+    regressions = []
+    for result in report["results"]:
+        base = baseline_cases.get((result["case"], result["n_rows"]))
+        if base is None:
+            continue
+
+        checks = [
+            (metric, result["latency"][metric], base["latency"][metric], max_latency_regression, 1.0)
+            for metric in ("p50_ms", "p99_ms")
+        ]
+        checks.append((
+            "throughput_per_sec", result["throughput_per_sec"], base["throughput_per_sec"],
+            max_throughput_regression, -1.0,
+        ))
+        for metric, current, previous, threshold, direction in checks:
+            if not previous:
+                continue
+            change = direction * (current - previous) / previous
+            if change > threshold:
+                regressions.append({
+                    "case": result["case"],
+                    "n_rows": result["n_rows"],
+                    "metric": metric,
+                    "baseline": previous,
+                    "current": current,
+                    "regression": change,
+                    "threshold": threshold,
+                })
+    return regressions
+
+
+def main():
+    """CLI interface for the serving benchmark."""
+    parser = argparse.ArgumentParser(description="Serving Path Benchmark")
+    parser.add_argument(
+        "--config",
+        default="ml_pipeline/model_config.yaml",
+        help="Path to model config",
+    )
+    parser.add_argument(
+        "--batch-sizes",
+        nargs="+",
+        type=int,
+        default=DEFAULT_BATCH_SIZES,
+        help="batch_predict sizes (rows)",
+    )
+    parser.add_argument(
+        "--log-sizes",
+        nargs="+",
+        type=int,
+        default=DEFAULT_LOG_SIZES,
+        help="Evaluation log sizes (rows) for log_evaluation",
+    )
+    parser.add_argument(
+        "--output",
+        default="ml_pipeline/logs/benchmarks/serving.json",
+        help="Path of the JSON report",
+    )
+    parser.add_argument(
+        "--baseline",
+        help="Baseline report to gate against (defaults to benchmarks.serving.baseline)",
+    )
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Write this run as the new baseline instead of gating",
+    )
+
+    args = parser.parse_args()
+
+    report = run_benchmark(args.batch_sizes, args.log_sizes, args.config)
+
+    output_path = Path(args.output)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, "w") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+    print(f"Benchmark report saved to {output_path}")
+
+    with open(args.config, "r") as f:
+        gate_config = (yaml.safe_load(f).get("benchmarks") or {}).get("serving", {})
+    baseline_path = Path(args.baseline or gate_config.get("baseline", "ml_pipeline/logs/benchmarks/serving_baseline.json"))
+
+    if args.update_baseline:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(baseline_path, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+        print(f"Baseline updated: {baseline_path}")
+        return
+
+    if not baseline_path.exists():
+        print(f"No baseline at {baseline_path}; run with --update-baseline to create one")
+        return
+
+    with open(baseline_path, "r") as f:
+        baseline = json.load(f)
+    regressions = compare_to_baseline(
+        report,
+        baseline,
+        max_latency_regression=gate_config.get("max_latency_regression", 0.25),
+        max_throughput_regression=gate_config.get("max_throughput_regression", 0.20),
+    )
+    for r in regressions:
+        print(
+            f"REGRESSION {r['case']}[{r['n_rows']}] {r['metric']}: "
+            f"{r['baseline']:.4g} -> {r['current']:.4g} ({r['regression']:+.1%} > {r['threshold']:.0%})"
+        )
+    if regressions:
+        sys.exit(1)
+    print("No regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""Training pipeline benchmark over synthetic datasets of increasing size.
+
+Each (algorithm, size) case generates a dataset with
+``ModelTrainer._generate_synthetic_data``, writes it to a temporary CSV and
+times the stages of ``run_training_pipeline`` one by one: load, prepare,
+fit, cross-validation and save. The JSON report is written with sorted keys
+so two runs can be diffed directly.
+"""
+
+import argparse
+import copy
+import json
+import platform
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import sklearn
+
+from train_model import ModelTrainer
+from utils.profiling import StageProfiler, max_rss_bytes
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000, 10_000_000]
+DEFAULT_ALGORITHMS = ["LogisticRegression", "RandomForest", "SGDClassifier"]
+
+# Largest dataset each algorithm is run on by default; bigger cases are recorded as skipped
+DEFAULT_MAX_ROWS = {"RandomForest": 1_000_000}
+
+
+def run_case(
+    trainer: ModelTrainer,
+    algorithm: str,
+    n_rows: int,
+    workdir: Path,
+    random_state: int = 42,
+) -> Dict[str, Any]:
+    """Benchmark every training stage for one algorithm and dataset size."""
+    setup = StageProfiler()
+    with setup.span("generate"):
+        data_path = workdir / f"synthetic_{n_rows}.csv"
+        if not data_path.exists():
+            trainer._generate_synthetic_data(n_samples=n_rows, random_state=random_state).to_csv(
+                data_path, index=False
+            )
+
+    trainer.config["training"]["data_source"] = str(data_path)
+    trainer.models_dir = workdir / "models"
+
+    profiler = StageProfiler(trace_memory=True)
+    try:
+        with profiler.span("load"):
+            df, _ = trainer.load_data()
+        with profiler.span("prepare"):
+            X, y, scaler = trainer.prepare_data(df)
+        with profiler.span("fit"):
+            model = trainer.build_model(algorithm, n_samples=len(y))
+            model.fit(X, y)
+        with profiler.span("cv"):
+            metrics = trainer._evaluate_model(model, X, y)
+        with profiler.span("save"):
+            trainer.save_model(model, scaler, f"bench_{algorithm.lower()}_{n_rows}", metrics)
+    finally:
+        profiler.close()
+
+    return {
+        "algorithm": algorithm,
+        "n_rows": n_rows,
+        "status": "completed",
+        "setup": setup.summary(),
+        "stages": profiler.summary(),
+        "total_seconds": profiler.total_seconds(),
+        "max_rss_bytes": max_rss_bytes(),
+        "metrics": {k: v for k, v in metrics.items() if isinstance(v, float)},
+    }
+
+
+def run_benchmark(
+    sizes: List[int],
+    algorithms: List[str],
+    config_path: str = "ml_pipeline/model_config.yaml",
+    max_rows: Optional[Dict[str, int]] = None,
+    random_state: int = 42,
+) -> Dict[str, Any]:
+    """Run the training benchmark matrix and return the report."""
+    max_rows = DEFAULT_MAX_ROWS if max_rows is None else max_rows
+    trainer = ModelTrainer(config_path)
+    base_config = copy.deepcopy(trainer.config)
+    # Measure parsing and imputation rather than dataset cache hits
+    base_config["training"].setdefault("cache", {})["enabled"] = False
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmpdir:
+        workdir = Path(tmpdir)
+        for n_rows in sizes:
+            for algorithm in algorithms:
+                if n_rows > max_rows.get(algorithm, n_rows):
+                    results.append({"algorithm": algorithm, "n_rows": n_rows, "status": "skipped"})
+                    continue
+
+                trainer.config = copy.deepcopy(base_config)
+                result = run_case(trainer, algorithm, n_rows, workdir, random_state)
+                trainer.logger.info(f"Benchmark {algorithm} @ {n_rows} rows: {result['total_seconds']}s")
+                results.append(result)
+
+    return {
+        "benchmark": "training",
+        "created_at": datetime.utcnow().isoformat(),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "scikit-learn": sklearn.__version__,
+        },
+        "parameters": {
+            "sizes": sizes,
+            "algorithms": algorithms,
+            "max_rows": max_rows,
+            "random_state": random_state,
+        },
+        "results": results,
+    }
+
+
+def main():
+    """CLI interface for the training benchmark."""
+    parser = argparse.ArgumentParser(description="Training Pipeline Benchmark")
+    parser.add_argument(
+        "--config",
+        default="ml_pipeline/model_config.yaml",
+        help="Path to model config",
+    )
+    parser.add_argument(
+        "--sizes",
+        nargs="+",
+        type=int,
+        default=DEFAULT_SIZES,
+        help="Dataset sizes (rows) to benchmark",
+    )
+    parser.add_argument(
+        "--algorithms",
+        nargs="+",
+        default=DEFAULT_ALGORITHMS,
+        help="Algorithms to benchmark",
+    )
+    parser.add_argument(
+        "--max-rows",
+        nargs="*",
+        default=None,
+        metavar="ALGORITHM=ROWS",
+        help="Per-algorithm row limit (pass with no values to remove the defaults)",
+    )
+    parser.add_argument(
+        "--output",
+        default="ml_pipeline/logs/benchmarks/training.json",
+        help="Path of the JSON report",
+    )
+
+    args = parser.parse_args()
+
+    max_rows = None
+    if args.max_rows is not None:
+        max_rows = {alg: int(rows) for alg, rows in (item.split("=", 1) for item in args.max_rows)}
+
+    report = run_benchmark(args.sizes, args.algorithms, args.config, max_rows)
+
+    output_path = Path(args.output)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, "w") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+    print(f"Benchmark report saved to {output_path}")
+
+
+if __name__ == "__main__":
+    main()
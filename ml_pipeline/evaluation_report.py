@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""Offline evaluation report over settled predictions in the evaluation log.
+
+The log is streamed in chunks. Each chunk only adds to integer confusion
+matrices and calibration histograms at the finest grain (model, league,
+confidence band); per-model, per-league and per-band metrics are derived
+from those counters once at the end, so memory is bounded by the number of
+groups rather than the number of log rows.
+"""
+
+import argparse
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import yaml
+
+from utils.dtypes import EVALUATION_LOG_DTYPES, OUTCOME_LABELS
+from utils.evaluation import metrics_from_confusion
+
+UNKNOWN_LEAGUE = "unknown"
+UNKNOWN_BAND = "unknown"
+
+GroupKey = Tuple[str, str, str]
+
+
+class EvaluationReport:
+    """Incremental confusion-matrix and calibration counters over the evaluation log."""
+
+    def __init__(
+        self,
+        confidence_levels: Optional[Dict[str, float]] = None,
+        calibration_bins: int = 10,
+        labels: Optional[List[str]] = None,
+    ):
+        levels = confidence_levels or {"low": 0.50, "medium": 0.65, "high": 0.80}
+        ordered = sorted(levels.items(), key=lambda item: item[1])
+        self.band_names = [f"below_{ordered[0][0]}"] + [name for name, _ in ordered]
+        self.band_edges = np.array([threshold for _, threshold in ordered])
+        self.calibration_bins = calibration_bins
+        self.labels = list(labels or OUTCOME_LABELS)
+
+        n_labels = len(self.labels)
+        self.confusion: Dict[GroupKey, np.ndarray] = {}
+        # Per calibration bin: [count, confidence sum, correct count]
+        self.calibration: Dict[GroupKey, np.ndarray] = {}
+        self._cells = n_labels * n_labels
+        self.n_rows = 0
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "EvaluationReport":
+        """Create a report from the inference and ``evaluation.report`` config."""
+        report_config = config.get("evaluation", {}).get("report", {})
+        return cls(
+            confidence_levels=config.get("inference", {}).get("confidence_levels"),
+            calibration_bins=report_config.get("calibration_bins", 10),
+        )
+
+    @staticmethod
+    def _leagues(chunk: pd.DataFrame) -> pd.Series:
+        """League per row from the ``league`` column, else the metadata JSON (older logs)."""
+        leagues = (
+            chunk["league"].astype("string")
+            if "league" in chunk.columns
+            else pd.Series(pd.NA, index=chunk.index, dtype="string")
+        )
+        missing = leagues.isna().to_numpy()
+        if "metadata" in chunk.columns and missing.any():
+            # Parse each distinct metadata string once
+            codes, uniques = pd.factorize(chunk["metadata"][missing].astype("string"))
+            from_metadata = pd.Series(uniques, dtype="string").str.extract(r'"league":\s*"([^"]*)"', expand=False)
+            labels = np.append(from_metadata.to_numpy(dtype=object, na_value=UNKNOWN_LEAGUE), UNKNOWN_LEAGUE)
+            leagues = leagues.astype(object)
+            leagues[missing] = labels[codes]
+        return leagues.astype(object).where(leagues.notna(), UNKNOWN_LEAGUE)
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        """Add the settled predictions in a chunk to the counters."""
+        if "status" in chunk.columns:
+            chunk = chunk[chunk["status"].astype("string") == "evaluated"]
+
+        pred = pd.Categorical(chunk["prediction"].astype("string"), categories=self.labels).codes
+        actual = pd.Categorical(chunk["actual_result"].astype("string"), categories=self.labels).codes
+        valid = (pred >= 0) & (actual >= 0)
+        chunk = chunk[valid]
+        if chunk.empty:
+            return
+        pred, actual = pred[valid].astype(np.int64), actual[valid].astype(np.int64)
+
+        confidence = chunk["confidence"].to_numpy(dtype=np.float64, na_value=np.nan)
+        has_confidence = ~np.isnan(confidence)
+        band_idx = np.searchsorted(self.band_edges, np.nan_to_num(confidence), side="right")
+        bands = np.where(has_confidence, np.array(self.band_names, dtype=object)[band_idx], UNKNOWN_BAND)
+
+        group_codes, groups = pd.MultiIndex.from_arrays([
+            chunk["model_id"].astype("string").fillna("unknown").to_numpy(dtype=object),
+            self._leagues(chunk).to_numpy(dtype=object),
+            bands,
+        ]).factorize()
+        n_groups = len(groups)
+        n_labels = len(self.labels)
+
+        confusion = np.bincount(
+            group_codes * self._cells + actual * n_labels + pred,
+            minlength=n_groups * self._cells,
+        ).reshape(n_groups, n_labels, n_labels)
+
+        bins = np.minimum((np.clip(confidence, 0.0, 1.0) * self.calibration_bins).astype(np.int64), self.calibration_bins - 1)
+        cal_idx = (group_codes * self.calibration_bins + bins)[has_confidence]
+        size = n_groups * self.calibration_bins
+        calibration = np.stack([
+            np.bincount(cal_idx, minlength=size),
+            np.bincount(cal_idx, weights=confidence[has_confidence], minlength=size),
+            np.bincount(cal_idx, weights=(pred == actual)[has_confidence], minlength=size),
+        ], axis=1).reshape(n_groups, self.calibration_bins, 3)
+
+        for i, key in enumerate(groups):
+            if key in self.confusion:
+                self.confusion[key] += confusion[i]
+                self.calibration[key] += calibration[i]
+            else:
+                self.confusion[key] = confusion[i].astype(np.int64)
+                self.calibration[key] = calibration[i].astype(np.float64)
+        self.n_rows += len(chunk)
+
+    def _calibration_summary(self, calibration: np.ndarray) -> Dict[str, Any]:
+        """Reliability histogram, expected calibration error and confidence AUC."""
+        count, confidence_sum, correct = calibration[:, 0], calibration[:, 1], calibration[:, 2]
+        total = count.sum()
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean_confidence = np.where(count > 0, confidence_sum / count, 0.0)
+            accuracy = np.where(count > 0, correct / count, 0.0)
+        ece = float(np.sum(count * np.abs(accuracy - mean_confidence)) / total) if total else None
+
+        # AUC of confidence as a score for "prediction was correct", ties within a bin count half
+        wrong = count - correct
+        n_correct, n_wrong = correct.sum(), wrong.sum()
+        auc = None
+        if n_correct and n_wrong:
+            wrong_below = np.concatenate(([0.0], np.cumsum(wrong)[:-1]))
+            auc = float(np.sum(correct * (wrong_below + 0.5 * wrong)) / (n_correct * n_wrong))
+
+        edges = np.linspace(0.0, 1.0, self.calibration_bins + 1)
+        return {
+            "expected_calibration_error": ece,
+            "confidence_auc": auc,
+            "bins": [
+                {
+                    "lower": float(edges[i]),
+                    "upper": float(edges[i + 1]),
+                    "count": int(count[i]),
+                    "mean_confidence": float(mean_confidence[i]),
+                    "accuracy": float(accuracy[i]),
+                }
+                for i in range(self.calibration_bins)
+                if count[i]
+            ],
+        }
+
+    def _summarize(self, keys: List[GroupKey]) -> Dict[str, Any]:
+        """Metrics for the union of finest-grain groups."""
+        confusion = sum(self.confusion[key] for key in keys)
+        calibration = sum(self.calibration[key] for key in keys)
+        return {
+            "n_evaluated": int(confusion.sum()),
+            **metrics_from_confusion(confusion),
+            "confusion_matrix": confusion.tolist(),
+            "calibration": self._calibration_summary(calibration),
+        }
+
+    def result(self) -> Dict[str, Any]:
+        """Derive per-model, per-league and per-confidence-band metrics."""
+        models: Dict[str, Any] = {}
+        for model_id in sorted({key[0] for key in self.confusion}):
+            keys = [key for key in self.confusion if key[0] == model_id]
+            leagues = sorted({key[1] for key in keys})
+            bands = [band for band in self.band_names + [UNKNOWN_BAND] if any(key[2] == band for key in keys)]
+            models[model_id] = {
+                "overall": self._summarize(keys),
+                "by_league": {
+                    league: self._summarize([key for key in keys if key[1] == league]) for league in leagues
+                },
+                "by_confidence_band": {
+                    band: self._summarize([key for key in keys if key[2] == band]) for band in bands
+                },
+            }
+        return {"labels": self.labels, "n_evaluated": self.n_rows, "models": models}
+
+
+def build_report(
+    config: Dict[str, Any],
+    log_path: str = "ml_pipeline/logs/evaluation_log.csv",
+    chunk_size: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Stream an evaluation log in chunks and build its report."""
+    report = EvaluationReport.from_config(config)
+    chunk_size = chunk_size or config.get("evaluation", {}).get("report", {}).get("chunk_size", 200_000)
+
+    columns = pd.read_csv(log_path, nrows=0).columns
+    usecols = [
+        col for col in ("model_id", "prediction", "actual_result", "confidence", "status", "league", "metadata")
+        if col in columns
+    ]
+    dtypes = {col: dtype for col, dtype in EVALUATION_LOG_DTYPES.items() if col in usecols}
+    if "league" in usecols:
+        dtypes["league"] = "category"
+
+    for chunk in pd.read_csv(log_path, usecols=usecols, dtype=dtypes, chunksize=chunk_size):
+        report.update(chunk)
+    return report.result()
+
+
+def main():
+    """CLI interface for the evaluation report."""
+    parser = argparse.ArgumentParser(description="Offline Evaluation Report")
+    parser.add_argument(
+        "--config",
+        default="ml_pipeline/model_config.yaml",
+        help="Path to model config",
+    )
+    parser.add_argument(
+        "--log",
+        default="ml_pipeline/logs/evaluation_log.csv",
+        help="Path to the evaluation log CSV",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        help="Rows per chunk (defaults to evaluation.report.chunk_size)",
+    )
+    parser.add_argument(
+        "--output",
+        default="ml_pipeline/logs/reports/evaluation_report.json",
+        help="Path of the JSON report",
+    )
+
+    args = parser.parse_args()
+
+    with open(args.config, "r") as f:
+        config = yaml.safe_load(f)
+    report = build_report(config, args.log, args.chunk_size)
+
+    output_path = Path(args.output)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Evaluation report for {report['n_evaluated']} settled predictions saved to {output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""Incremental team feature store for prediction-time lookups.
+
+Raw results are ingested once; each new match updates both teams' rolling
+state in O(1). Features for a fixture are resolved as of a date from a
+per-team snapshot index, so callers only pass (home_team, away_team, date).
+
+Feature definitions (all computed from matches strictly before the date):
+
+- ``*_team_form``: mean points over the team's last ``form_window`` matches,
+  scaled to 0-10
+- ``*_team_strength``: EWMA of goal difference (``strength_alpha``), mapped
+  to 0-10 around a neutral 5
+- ``home_advantage``: EWMA of the home team's points share in home matches
+  (``home_alpha``)
+- ``recent_goals_for`` / ``recent_goals_against``: the home team's mean goals
+  scored/conceded over its last ``form_window`` matches
+
+Neutral values, scales and default parameters are shared with the
+vectorized ``utils.feature_engineering`` through ``utils.feature_definitions``.
+"""
+
+import argparse
+import json
+import pickle
+from bisect import bisect_left
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+import yaml
+
+from utils.feature_definitions import (
+    DEFAULT_FORM_WINDOW,
+    DEFAULT_HOME_ALPHA,
+    DEFAULT_STRENGTH_ALPHA,
+    FORM_SCALE,
+    MAX_POINTS,
+    NEUTRAL_FORM,
+    NEUTRAL_GOALS,
+    NEUTRAL_HOME_ADVANTAGE,
+    NEUTRAL_STRENGTH,
+    feature_params,
+    match_points,
+    strength_from_goal_diff,
+)
+
+SNAPSHOT_FIELDS = ("form", "strength", "goals_for", "goals_against", "home_advantage")
+
+
+class TeamState:
+    """Rolling state of one team, updated in O(1) per match."""
+
+    __slots__ = (
+        "points",
+        "goals_for",
+        "goals_against",
+        "points_sum",
+        "goals_for_sum",
+        "goals_against_sum",
+        "goal_diff_ewm",
+        "home_ewm",
+        "last_date",
+    )
+
+    def __init__(self, form_window: int):
+        self.points: deque = deque(maxlen=form_window)
+        self.goals_for: deque = deque(maxlen=form_window)
+        self.goals_against: deque = deque(maxlen=form_window)
+        self.points_sum = 0.0
+        self.goals_for_sum = 0.0
+        self.goals_against_sum = 0.0
+        self.goal_diff_ewm: Optional[float] = None
+        self.home_ewm: Optional[float] = None
+        self.last_date: Optional[pd.Timestamp] = None
+
+    @staticmethod
+    def _push(window: deque, value: float, total: float) -> float:
+        """Append to a bounded window and return the updated running sum."""
+        if len(window) == window.maxlen:
+            total -= window[0]
+        window.append(value)
+        return total + value
+
+    def update(
+        self,
+        goals_for: float,
+        goals_against: float,
+        is_home: bool,
+        strength_alpha: float,
+        home_alpha: float,
+    ) -> None:
+        """Fold one result into the rolling state."""
+        points = match_points(goals_for, goals_against)
+        self.points_sum = self._push(self.points, points, self.points_sum)
+        self.goals_for_sum = self._push(self.goals_for, goals_for, self.goals_for_sum)
+        self.goals_against_sum = self._push(self.goals_against, goals_against, self.goals_against_sum)
+
+        goal_diff = goals_for - goals_against
+        if self.goal_diff_ewm is None:
+            self.goal_diff_ewm = float(goal_diff)
+        else:
+            self.goal_diff_ewm += strength_alpha * (goal_diff - self.goal_diff_ewm)
+
+        if is_home:
+            share = points / MAX_POINTS
+            if self.home_ewm is None:
+                self.home_ewm = share
+            else:
+                self.home_ewm += home_alpha * (share - self.home_ewm)
+
+    def snapshot(self) -> Tuple[float, ...]:
+        """Current feature values in SNAPSHOT_FIELDS order."""
+        n = len(self.points)
+        return (
+            self.points_sum / n * FORM_SCALE if n else NEUTRAL_FORM,
+            strength_from_goal_diff(self.goal_diff_ewm) if self.goal_diff_ewm is not None else NEUTRAL_STRENGTH,
+            self.goals_for_sum / n if n else NEUTRAL_GOALS,
+            self.goals_against_sum / n if n else NEUTRAL_GOALS,
+            self.home_ewm if self.home_ewm is not None else NEUTRAL_HOME_ADVANTAGE,
+        )
+
+
+NEUTRAL_SNAPSHOT = (NEUTRAL_FORM, NEUTRAL_STRENGTH, NEUTRAL_GOALS, NEUTRAL_GOALS, NEUTRAL_HOME_ADVANTAGE)
+
+
+class TeamFeatureStore:
+    """In-memory index of per-team rolling features."""
+
+    def __init__(
+        self,
+        form_window: int = DEFAULT_FORM_WINDOW,
+        strength_alpha: float = DEFAULT_STRENGTH_ALPHA,
+        home_alpha: float = DEFAULT_HOME_ALPHA,
+    ):
+        self.form_window = form_window
+        self.strength_alpha = strength_alpha
+        self.home_alpha = home_alpha
+        self.teams: Dict[str, TeamState] = {}
+        # Per team: match dates and the feature snapshot after each match
+        self.history: Dict[str, Tuple[List[pd.Timestamp], List[Tuple[float, ...]]]] = {}
+        self.n_matches = 0
+
+    @property
+    def version(self) -> int:
+        """Changes whenever a match is applied, so derived caches can detect stale features."""
+        return self.n_matches
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "TeamFeatureStore":
+        """Create a store from the ``feature_store`` config section, ingesting its source."""
+        store_config = config.get("feature_store", {})
+        store = cls(*feature_params(config))
+        source = store_config.get("source")
+        if source and Path(source).exists():
+            store.ingest(pd.read_csv(source, parse_dates=["date"]))
+        return store
+
+    def update(
+        self,
+        home_team: str,
+        away_team: str,
+        home_goals: float,
+        away_goals: float,
+        date: Any,
+    ) -> None:
+        """Apply one settled match to both teams in O(1)."""
+        date = pd.Timestamp(date)
+        for team in (home_team, away_team):
+            state = self.teams.get(team)
+            if state is not None and date < state.last_date:
+                raise ValueError(f"Match for {team} on {date.date()} is older than {state.last_date.date()}")
+
+        for team, goals_for, goals_against, is_home in (
+            (home_team, home_goals, away_goals, True),
+            (away_team, away_goals, home_goals, False),
+        ):
+            state = self.teams.get(team)
+            if state is None:
+                state = self.teams[team] = TeamState(self.form_window)
+                self.history[team] = ([], [])
+
+            state.update(goals_for, goals_against, is_home, self.strength_alpha, self.home_alpha)
+            state.last_date = date
+            dates, snapshots = self.history[team]
+            dates.append(date)
+            snapshots.append(state.snapshot())
+        self.n_matches += 1
+
+    def ingest(self, matches: pd.DataFrame) -> None:
+        """Ingest raw results in date order."""
+        matches = matches.sort_values("date", kind="stable")
+        for home_team, away_team, home_goals, away_goals, date in zip(
+            matches["home_team"],
+            matches["away_team"],
+            matches["home_goals"],
+            matches["away_goals"],
+            matches["date"],
+        ):
+            self.update(home_team, away_team, home_goals, away_goals, date)
+
+    def team_snapshot(self, team: str, date: Optional[Any] = None) -> Dict[str, float]:
+        """Feature values of a team from matches strictly before ``date`` (latest if None)."""
+        if team not in self.history:
+            return dict(zip(SNAPSHOT_FIELDS, NEUTRAL_SNAPSHOT))
+
+        dates, snapshots = self.history[team]
+        idx = len(dates) if date is None else bisect_left(dates, pd.Timestamp(date))
+        return dict(zip(SNAPSHOT_FIELDS, snapshots[idx - 1] if idx else NEUTRAL_SNAPSHOT))
+
+    def get_features(
+        self,
+        home_team: str,
+        away_team: str,
+        date: Optional[Any] = None,
+        input_features: Optional[List[str]] = None,
+    ) -> List[float]:
+        """Resolve model input features for a fixture."""
+        home = self.team_snapshot(home_team, date)
+        away = self.team_snapshot(away_team, date)
+        resolved = {
+            "home_team_form": home["form"],
+            "away_team_form": away["form"],
+            "home_team_strength": home["strength"],
+            "away_team_strength": away["strength"],
+            "home_advantage": home["home_advantage"],
+            "recent_goals_for": home["goals_for"],
+            "recent_goals_against": home["goals_against"],
+        }
+        if input_features is None:
+            return list(resolved.values())
+
+        missing = [feat for feat in input_features if feat not in resolved]
+        if missing:
+            raise ValueError(f"Feature store cannot resolve features: {missing}")
+        return [resolved[feat] for feat in input_features]
+
+    def save(self, path: str) -> None:
+        """Persist the store to disk."""
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "wb") as f:
+            pickle.dump(self, f)
+
+    @staticmethod
+    def load(path: str) -> "TeamFeatureStore":
+        """Load a persisted store."""
+        with open(path, "rb") as f:
+            return pickle.load(f)
+
+
+def main():
+    """CLI interface for the feature store."""
+    parser = argparse.ArgumentParser(description="Team Feature Store")
+    parser.add_argument(
+        "--config",
+        default="ml_pipeline/model_config.yaml",
+        help="Path to model config",
+    )
+    parser.add_argument("--home", required=True, help="Home team")
+    parser.add_argument("--away", required=True, help="Away team")
+    parser.add_argument("--date", help="Match date (defaults to latest state)")
+
+    args = parser.parse_args()
+
+    with open(args.config, "r") as f:
+        config = yaml.safe_load(f)
+    store = TeamFeatureStore.from_config(config)
+    input_features = config["inference"]["input_features"]
+    features = store.get_features(args.home, args.away, args.date, input_features)
+    print(json.dumps(dict(zip(input_features, features)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+"""Precomputed predictions for upcoming fixtures.
+
+A refresh resolves every upcoming fixture's features from the team feature
+store and hashes them together with the fingerprints (id, artifact size and
+mtime) of the champion and optional challenger models. Only fixtures whose hash changed are re-scored, in one batch per
+model; all other rows are kept as they are. The result is a compact table
+keyed by match_id, written atomically to a local file and bulk-upserted to
+Supabase, so serving a fixture prediction is a dictionary lookup instead of
+a pass through the model.
+
+Re-scored champion predictions are logged once to the evaluation log, and
+their event ids are kept in the table so lookups can still be settled.
+"""
+
+import os
+import pickle
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from feature_store import TeamFeatureStore
+from utils.dtypes import OUTCOME_LABELS
+from utils.ids import new_event_ids
+
+PROBA_COLUMNS = [f"proba_{label}" for label in OUTCOME_LABELS]
+
+
+def fixture_match_id(home_team: str, away_team: str, match_date: Optional[Any]) -> str:
+    """Match id used by ``PredictionEngine.predict_match`` for a fixture."""
+    return f"{home_team}_{away_team}_{match_date or 'latest'}"
+
+
+class FixturePredictionTable:
+    """Compact table of fixture predictions with O(1) lookups by match_id."""
+
+    def __init__(self, frame: Optional[pd.DataFrame] = None):
+        self.frame = frame if frame is not None else pd.DataFrame(index=pd.Index([], name="match_id", dtype=object))
+        self._index()
+
+    def _index(self) -> None:
+        """Rebuild the match_id position map and per-column arrays used by lookups."""
+        self._positions = {match_id: i for i, match_id in enumerate(self.frame.index)}
+        self._columns = {col: self.frame[col].to_numpy() for col in self.frame.columns}
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    def __contains__(self, match_id: str) -> bool:
+        return match_id in self._positions
+
+    @property
+    def feature_version(self) -> Optional[int]:
+        """Feature store version the table was last refreshed against."""
+        return self.frame.attrs.get("feature_version")
+
+    def lookup(self, match_id: str) -> Optional[Dict[str, Any]]:
+        """Stored prediction for a fixture, or None."""
+        pos = self._positions.get(match_id)
+        if pos is None:
+            return None
+        row = {"match_id": match_id}
+        for col, values in self._columns.items():
+            value = values[pos]
+            row[col] = value.item() if isinstance(value, np.generic) else value
+        return row
+
+    def save(self, path: str) -> None:
+        """Persist the table atomically."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        with open(tmp_path, "wb") as f:
+            pickle.dump(self.frame, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "FixturePredictionTable":
+        """Load a persisted table (empty if the file does not exist)."""
+        if not Path(path).exists():
+            return cls()
+        with open(path, "rb") as f:
+            return cls(pickle.load(f))
+
+    @staticmethod
+    def input_hashes(X: np.ndarray, model_fingerprints: List[Optional[str]]) -> np.ndarray:
+        """Per-fixture hash of the raw features and the models that score them."""
+        hashes = pd.util.hash_pandas_object(pd.DataFrame(X), index=False).to_numpy()
+        models_hash = pd.util.hash_pandas_object(pd.Series(["|".join(m or "" for m in model_fingerprints)]), index=False)
+        return hashes ^ models_hash.to_numpy()[0]
+
+    def refresh(
+        self,
+        engine: Any,
+        fixtures: pd.DataFrame,
+        feature_store: TeamFeatureStore,
+        include_challenger: bool = False,
+    ) -> Dict[str, Any]:
+        """Re-score fixtures whose inputs or models changed and drop fixtures no longer listed.
+
+        Returns the refresh summary and the match_ids that were re-scored.
+        """
+        if not engine.model and not engine.load_model():
+            raise ValueError("Failed to load model")
+        input_features = engine.config["inference"]["input_features"]
+
+        fixtures = fixtures.copy()
+        dates = fixtures["date"] if "date" in fixtures.columns else pd.Series(None, index=fixtures.index)
+        fixtures["match_date"] = [None if pd.isna(d) else str(d) for d in dates]
+        if "match_id" not in fixtures.columns:
+            fixtures["match_id"] = [
+                fixture_match_id(home, away, date)
+                for home, away, date in zip(fixtures["home_team"], fixtures["away_team"], fixtures["match_date"])
+            ]
+        fixtures = fixtures.drop_duplicates("match_id", keep="last").reset_index(drop=True)
+
+        X = np.array([
+            feature_store.get_features(home, away, date, input_features)
+            for home, away, date in zip(fixtures["home_team"], fixtures["away_team"], fixtures["match_date"])
+        ], dtype=np.float32).reshape(len(fixtures), len(input_features))
+
+        challenger_id = engine.model_registry.get("challenger_model_id") if include_challenger else None
+        if challenger_id == engine.active_model_id:
+            challenger_id = None
+        challenger = None
+        if challenger_id:
+            model_info = engine._find_model_info(challenger_id)
+            if model_info is None:
+                raise ValueError(f"Challenger {challenger_id} not found in registry")
+            challenger = engine._get_artifacts(challenger_id, model_info)
+        model_fingerprint = engine.model_fingerprint()
+        hashes = self.input_hashes(X, [model_fingerprint, engine.model_fingerprint(challenger_id) if challenger_id else None])
+
+        match_ids = fixtures["match_id"].to_numpy(dtype=object)
+        previous = self._columns.get("input_hash")
+        old_pos = np.array([self._positions.get(m, -1) for m in match_ids], dtype=np.int64)
+        changed = old_pos < 0
+        if previous is not None:
+            changed |= previous[np.maximum(old_pos, 0)] != hashes
+        changed_idx = np.flatnonzero(changed)
+
+        scored_at = datetime.utcnow().isoformat()
+        new = pd.DataFrame({
+            "home_team": fixtures["home_team"].to_numpy(dtype=object)[changed_idx],
+            "away_team": fixtures["away_team"].to_numpy(dtype=object)[changed_idx],
+            "match_date": fixtures["match_date"].to_numpy(dtype=object)[changed_idx],
+        }, index=pd.Index(match_ids[changed_idx], name="match_id"))
+        if "league" in fixtures.columns:
+            new["league"] = fixtures["league"].to_numpy(dtype=object)[changed_idx]
+        if len(changed_idx):
+            self._score_into(new, engine, X[changed_idx], engine.model, engine.preprocessor, "", engine.active_model_id)
+            if challenger is not None:
+                self._score_into(new, engine, X[changed_idx], *challenger, "challenger_", challenger_id)
+            new["event_id"] = self._log_predictions(engine, new)
+        new["model_fingerprint"] = model_fingerprint
+        new["input_hash"] = hashes[changed_idx]
+        new["scored_at"] = scored_at
+
+        # Keep unchanged rows as stored, in fixture order
+        kept = match_ids[~changed]
+        frame = pd.concat([self.frame.loc[kept], new]) if len(kept) else new
+        n_removed = int((~self.frame.index.isin(match_ids)).sum())
+        self.frame = frame.reindex(match_ids)
+        self.frame.attrs["feature_version"] = feature_store.version
+        self._index()
+
+        engine.logger.info(
+            f"Fixture table refreshed: {len(changed_idx)} re-scored, {len(kept)} unchanged, {n_removed} removed"
+        )
+        return {
+            "n_fixtures": len(self.frame),
+            "n_rescored": int(len(changed_idx)),
+            "n_unchanged": int(len(kept)),
+            "n_removed": int(n_removed),
+            "model_id": engine.active_model_id,
+            "challenger_model_id": challenger_id,
+            "rescored": match_ids[changed_idx].tolist(),
+        }
+
+    @staticmethod
+    def _score_into(
+        frame: pd.DataFrame,
+        engine: Any,
+        X: np.ndarray,
+        model: Any,
+        preprocessor: Any,
+        prefix: str,
+        model_id: str,
+    ) -> None:
+        """Score raw features with one model and add its columns to the frame."""
+        predictions, probas = engine.score_features(X.copy(), model, preprocessor)
+        frame[f"{prefix}model_id"] = model_id
+        frame[f"{prefix}prediction"] = engine._decode_predictions(predictions)
+        if probas is not None:
+            proba = np.zeros((len(X), len(OUTCOME_LABELS)), dtype=np.float32)
+            proba[:, model.classes_.astype(np.int64)] = probas
+            frame[f"{prefix}confidence"] = proba.max(axis=1)
+            for i, col in enumerate(PROBA_COLUMNS):
+                frame[f"{prefix}{col}"] = proba[:, i]
+        else:
+            frame[f"{prefix}confidence"] = np.float32(0.5)
+
+    @staticmethod
+    def _log_predictions(engine: Any, frame: pd.DataFrame) -> List[str]:
+        """Log re-scored champion predictions once, returning their event ids."""
+        event_ids = new_event_ids(len(frame))
+        has_proba = all(col in frame.columns for col in PROBA_COLUMNS)
+        probas = frame[PROBA_COLUMNS].to_numpy().tolist() if has_proba else None
+        leagues = frame["league"].where(frame["league"].notna(), None).tolist() if "league" in frame.columns else None
+        for i, (match_id, prediction, confidence) in enumerate(
+            zip(frame.index, np.asarray(frame["prediction"]).tolist(), frame["confidence"].tolist())
+        ):
+            engine.ml_logger.log_prediction(
+                model_id=engine.active_model_id,
+                match_id=match_id,
+                prediction=prediction,
+                confidence=confidence,
+                metadata={"source": "fixture_table", "proba": probas[i] if probas else None},
+                event_id=event_ids[i],
+                league=leagues[i] if leagues is not None else None,
+            )
+        return event_ids
+
+    def records(self, match_ids: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Rows as JSON-friendly dicts, for Supabase upserts."""
+        frame = self.frame if match_ids is None else self.frame.loc[match_ids]
+        frame = frame.assign(input_hash=[f"{h:016x}" for h in frame["input_hash"].to_numpy(dtype=np.uint64)])
+        frame = frame.astype({col: object for col in frame.columns if isinstance(frame[col].dtype, pd.CategoricalDtype)})
+        return frame.reset_index().to_dict("records")
+
+    def upsert(self, client: Any, table: str, match_ids: Optional[List[str]] = None, batch_size: int = 500) -> int:
+        """Bulk-upsert rows to a Supabase table keyed by match_id."""
+        rows = self.records(match_ids)
+        for start in range(0, len(rows), batch_size):
+            client.table(table).upsert(rows[start:start + batch_size], on_conflict="match_id").execute()
+        return len(rows)
+
+
+def refresh_fixture_table(
+    engine: Any,
+    fixtures: pd.DataFrame,
+    feature_store: Optional[TeamFeatureStore] = None,
+) -> Dict[str, Any]:
+    """Refresh the configured fixture table, save it and upsert the re-scored rows."""
+    table_config = engine.config.get("fixture_table", {})
+    path = table_config.get("path", "ml_pipeline/models/fixture_predictions.pkl")
+    table = FixturePredictionTable.load(path)
+    feature_store = feature_store or engine.feature_store or TeamFeatureStore.from_config(engine.config)
+
+    summary = table.refresh(
+        engine,
+        fixtures,
+        feature_store,
+        include_challenger=table_config.get("include_challenger", False),
+    )
+    table.save(path)
+
+    client = engine.ml_logger.supabase
+    summary["n_upserted"] = 0
+    if client is not None and summary["rescored"]:
+        try:
+            summary["n_upserted"] = table.upsert(
+                client,
+                table_config.get("supabase_table", "fixture_predictions"),
+                summary["rescored"],
+                table_config.get("upsert_batch_size", 500),
+            )
+        except Exception as e:
+            engine.logger.error(f"Failed to upsert fixture predictions: {e}")
+    summary["path"] = path
+    return summary
+
@@ -0,0 +1,480 @@
+#!/usr/bin/env python3
+"""Persistent job worker for n8n- and Supabase-triggered ML jobs.
+
+One long-running process keeps the config, model registry and active model
+loaded, so a job costs only the work it asks for instead of interpreter
+start-up, imports and unpickling on every CLI call. Jobs arrive in two ways:
+
+- rows inserted into the ``job_worker.table`` jobs table with status
+  ``queued`` (the worker polls and claims them), and
+- JSON-lines requests on a local TCP socket (``submit``, ``status``,
+  ``cancel``, ``list``).
+
+Prediction jobs run on a bounded thread pool against the warm engine.
+Training jobs run in separate processes, at most ``max_training_jobs`` at a
+time, so the GIL and memory of a training run never stall serving; running
+training jobs can be cancelled by terminating their process. Finished jobs
+are kept in memory for ``finished_job_ttl_seconds`` (and at most
+``max_finished_jobs`` of them); after that their status is read back from
+the jobs table.
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import socketserver
+import threading
+import traceback
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from batch_scoring import BatchScoringJob
+from prediction_engine import PredictionEngine
+from train_model import ModelTrainer
+from utils.ids import new_event_id
+from utils.memory_store import InMemorySupabaseClient
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED = (COMPLETED, FAILED, CANCELLED)
+
+PREDICTION_JOBS = ("predict", "predict_match", "batch_predict")
+TRAINING_JOBS = ("train",)
+
+
+def _training_process(config_path: str, params: Dict[str, Any], conn) -> None:
+    """Run a training job in a child process and send back its result."""
+    try:
+        trainer = ModelTrainer(config_path)
+        if params.get("models_dir"):
+            trainer.models_dir = Path(params["models_dir"])
+        if params.get("streaming"):
+            result = trainer.run_streaming_pipeline(data_path=params.get("data"), model_id=params.get("model_id"))
+        else:
+            result = trainer.run_training_pipeline(
+                algorithm=params.get("algorithm"),
+                model_id=params.get("model_id"),
+            )
+        conn.send(("ok", json.loads(json.dumps(result, default=str))))
+    except Exception as e:
+        conn.send(("error", f"{e}\n{traceback.format_exc()}"))
+    finally:
+        conn.close()
+
+
+class JobWorker:
+    """Warm prediction engine plus a job queue with status, cancellation and concurrency limits."""
+
+    def __init__(
+        self,
+        config_path: str = "ml_pipeline/model_config.yaml",
+        engine: Optional[PredictionEngine] = None,
+        client: Any = None,
+    ):
+        self.config_path = config_path
+        self.engine = engine or PredictionEngine(config_path)
+        self.config = self.engine.config
+        self.logger = self._init_logger()
+
+        worker_config = self.config.get("job_worker", {})
+        self.table = worker_config.get("table", "ml_jobs")
+        self.poll_interval = worker_config.get("poll_interval_seconds", 2.0)
+        self.max_prediction_jobs = worker_config.get("max_prediction_jobs", 4)
+        self.max_training_jobs = worker_config.get("max_training_jobs", 1)
+        self.finished_job_ttl = worker_config.get("finished_job_ttl_seconds", 3600)
+        self.max_finished_jobs = worker_config.get("max_finished_jobs", 1000)
+
+        # Jobs table: Supabase when the logger has a client, else an in-process stand-in
+        self.client = client or self.engine.ml_logger.supabase or InMemorySupabaseClient()
+
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+        self._futures: Dict[str, Future] = {}
+        self._processes: Dict[str, multiprocessing.Process] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._prediction_pool = ThreadPoolExecutor(self.max_prediction_jobs, thread_name_prefix="predict-job")
+        # Each training job waits on its own thread for a process slot
+        self._training_pool = ThreadPoolExecutor(
+            max(self.max_training_jobs * 4, 4), thread_name_prefix="train-job"
+        )
+        self._training_slots = threading.BoundedSemaphore(self.max_training_jobs)
+        self._mp = multiprocessing.get_context("spawn")
+        self._server: Optional[socketserver.ThreadingTCPServer] = None
+
+        if self.engine.model is None:
+            self.engine.load_model()
+        self.logger.info(f"JobWorker ready with model {self.engine.active_model_id}")
+
+    def _init_logger(self) -> logging.Logger:
+        """Initialize logger."""
+        logger = logging.getLogger("job_worker")
+        if not logger.handlers:
+            log_dir = Path(self.config.get("logging", {}).get("log_dir", "ml_pipeline/logs"))
+            log_dir.mkdir(parents=True, exist_ok=True)
+            handler = logging.FileHandler(log_dir / "job_worker.log")
+            formatter = logging.Formatter(
+                "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+            )
+            handler.setFormatter(formatter)
+            logger.addHandler(handler)
+            logger.setLevel(logging.INFO)
+        return logger
+
+    def _update(self, job_id: str, **fields: Any) -> Dict[str, Any]:
+        """Update a job locally and in the jobs table."""
+        with self._lock:
+            job = self.jobs[job_id]
+            job.update(fields)
+            snapshot = dict(job)
+        try:
+            row = {key: json.dumps(value) if key in ("params", "result") else value for key, value in fields.items()}
+            self.client.table(self.table).update(row).eq("id", job_id).execute()
+        except Exception as e:
+            self.logger.error(f"Failed to update job {job_id}: {e}")
+        return snapshot
+
+    def submit(self, job_type: str, params: Optional[Dict[str, Any]] = None, job_id: Optional[str] = None) -> str:
+        """Queue a job and return its id."""
+        if job_type not in PREDICTION_JOBS + TRAINING_JOBS:
+            raise ValueError(f"Unknown job type: {job_type}")
+        job_id = job_id or new_event_id()
+        job = {
+            "id": job_id,
+            "job_type": job_type,
+            "params": params or {},
+            "status": QUEUED,
+            "result": None,
+            "error": None,
+            "created_at": datetime.utcnow().isoformat(),
+            "started_at": None,
+            "finished_at": None,
+        }
+        with self._lock:
+            self.jobs[job_id] = job
+        row = {**job, "params": json.dumps(job["params"]), "result": None}
+        self.client.table(self.table).upsert(row, on_conflict="id").execute()
+        self._dispatch(job_id)
+        return job_id
+
+    def _dispatch(self, job_id: str) -> None:
+        """Hand a queued job to the prediction pool or a training process slot."""
+        job = self.jobs[job_id]
+        if job["job_type"] in TRAINING_JOBS:
+            future = self._training_pool.submit(self._run_training, job_id)
+        else:
+            future = self._prediction_pool.submit(self._run_prediction, job_id)
+        with self._lock:
+            self._futures[job_id] = future
+        self.logger.info(f"Queued {job['job_type']} job {job_id}")
+
+    def _claim(self, job_id: str) -> bool:
+        """Move a queued job to running unless it was cancelled or another worker took it."""
+        started_at = datetime.utcnow().isoformat()
+        with self._lock:
+            if self.jobs[job_id]["status"] != QUEUED:
+                return False
+            self.jobs[job_id].update(status=RUNNING, started_at=started_at)
+        # Conditional update so only one worker polling the table wins the job
+        claimed = (
+            self.client.table(self.table)
+            .update({"status": RUNNING, "started_at": started_at})
+            .eq("id", job_id)
+            .eq("status", QUEUED)
+            .execute()
+            .data
+        )
+        if not claimed:
+            with self._lock:
+                self.jobs.pop(job_id, None)
+            self.logger.info(f"Job {job_id} was claimed by another worker")
+            return False
+        return True
+
+    def _finish(self, job_id: str, result: Any = None, error: Optional[str] = None) -> None:
+        """Record a job's outcome unless it was cancelled."""
+        if self.jobs[job_id]["status"] == CANCELLED:
+            return
+        status = FAILED if error else COMPLETED
+        self._update(job_id, status=status, result=result, error=error, finished_at=datetime.utcnow().isoformat())
+        self.logger.info(f"Job {job_id} {status}")
+        self._prune_finished()
+
+    def _prune_finished(self) -> None:
+        """Forget finished jobs past the TTL or the cap; the jobs table keeps their record."""
+        cutoff = (datetime.utcnow() - timedelta(seconds=self.finished_job_ttl)).isoformat()
+        with self._lock:
+            # A cancelled training job stays until its thread has returned
+            finished = sorted(
+                (job["finished_at"] or "", job_id)
+                for job_id, job in self.jobs.items()
+                if job["status"] in FINISHED
+                and (job_id not in self._futures or self._futures[job_id].done())
+            )
+            n_over_cap = max(len(finished) - self.max_finished_jobs, 0)
+            expired = [job_id for i, (finished_at, job_id) in enumerate(finished) if i < n_over_cap or finished_at < cutoff]
+            for job_id in expired:
+                self.jobs.pop(job_id, None)
+                self._futures.pop(job_id, None)
+        if expired:
+            self.logger.info(f"Pruned {len(expired)} finished jobs")
+
+    def _run_prediction(self, job_id: str) -> None:
+        """Run a prediction job against the warm engine (in a pool thread)."""
+        if not self._claim(job_id):
+            return
+        job = self.jobs[job_id]
+        params = job["params"]
+        try:
+            if job["job_type"] == "predict":
+                result = self.engine.predict(params["features"], params.get("match_id", job_id))
+            elif job["job_type"] == "predict_match":
+                result = self.engine.predict_match(
+                    params["home_team"], params["away_team"], params.get("match_date"), params.get("match_id")
+                )
+            else:
+                # Checkpointed under the job id, so resubmitting a failed job resumes it
+                manifest = BatchScoringJob(
+                    self.engine,
+                    params["input"],
+                    job_id,
+                    output_path=params.get("output"),
+                    chunk_size=params.get("chunk_size"),
+                ).run()
+                result = {"output": manifest["output"], "n_predictions": manifest["rows_committed"]}
+            self._finish(job_id, result=result)
+        except Exception as e:
+            self.logger.error(f"Prediction job {job_id} failed: {e}")
+            self._finish(job_id, error=str(e))
+
+    def _run_training(self, job_id: str) -> None:
+        """Run a training job in a child process once a slot is free (in a pool thread)."""
+        with self._training_slots:
+            if not self._claim(job_id):
+                return
+            parent_conn, child_conn = self._mp.Pipe(duplex=False)
+            process = self._mp.Process(
+                target=_training_process,
+                args=(self.config_path, self.jobs[job_id]["params"], child_conn),
+                name=f"train-{job_id}",
+                # Not a daemon, so joblib inside training may start its own workers
+                daemon=False,
+            )
+            with self._lock:
+                self._processes[job_id] = process
+            process.start()
+            child_conn.close()
+            if self.jobs[job_id]["status"] == CANCELLED:
+                # Cancelled between claiming the slot and starting the process
+                process.terminate()
+            try:
+                try:
+                    outcome, payload = parent_conn.recv()
+                except EOFError:
+                    process.join()
+                    outcome, payload = "error", f"Training process exited with code {process.exitcode}"
+                process.join()
+            finally:
+                with self._lock:
+                    self._processes.pop(job_id, None)
+                parent_conn.close()
+
+        if outcome == "ok":
+            self._finish(job_id, result=payload)
+            self._refresh_models(payload)
+        else:
+            self._finish(job_id, error=payload)
+
+    def _refresh_models(self, result: Dict[str, Any]) -> None:
+        """Pick up registry changes, reloading the active model if it was retrained."""
+        self.engine.model_registry = self.engine._load_model_registry()
+        if result.get("model_id") == self.engine.active_model_id:
+            # A preloaded copy of the retrained model is stale
+            self.engine.warm_models.pop(result["model_id"], None)
+            self.engine.load_model()
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a queued job, or a running training job by terminating its process."""
+        with self._lock:
+            job = self.jobs.get(job_id)
+            if job is None or job["status"] in FINISHED:
+                return False
+            if job["status"] == RUNNING and job["job_type"] not in TRAINING_JOBS:
+                # Prediction jobs run in-process and finish quickly; they are not interrupted
+                return False
+            job["status"] = CANCELLED
+            process = self._processes.get(job_id)
+            future = self._futures.get(job_id)
+        if process is not None:
+            process.terminate()
+        elif future is not None:
+            future.cancel()
+        self._update(job_id, status=CANCELLED, finished_at=datetime.utcnow().isoformat())
+        self.logger.info(f"Cancelled job {job_id}")
+        self._prune_finished()
+        return True
+
+    def status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Current state of a job, from the jobs table once it has been pruned."""
+        with self._lock:
+            job = self.jobs.get(job_id)
+            if job:
+                return dict(job)
+        try:
+            rows = self.client.table(self.table).select("*").eq("id", job_id).execute().data
+        except Exception as e:
+            self.logger.error(f"Failed to read job {job_id}: {e}")
+            return None
+        if not rows:
+            return None
+        return {
+            key: json.loads(value) if key in ("params", "result") and isinstance(value, str) else value
+            for key, value in rows[0].items()
+        }
+
+    def list_jobs(self, status: Optional[str] = None) -> List[Dict[str, Any]]:
+        """All known jobs, optionally filtered by status."""
+        with self._lock:
+            return [dict(job) for job in self.jobs.values() if status is None or job["status"] == status]
+
+    def wait(self, job_id: str, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Block until a job finishes and return its state."""
+        future = self._futures.get(job_id)
+        if future is not None:
+            wait([future], timeout=timeout)
+        return self.status(job_id)
+
+    def poll_queue(self) -> List[str]:
+        """Claim jobs queued in the jobs table by other producers (e.g. n8n)."""
+        rows = self.client.table(self.table).select("*").eq("status", QUEUED).execute().data
+        claimed = []
+        for row in rows:
+            if row["id"] in self.jobs:
+                continue
+            params = row.get("params") or {}
+            if isinstance(params, str):
+                params = json.loads(params)
+            job = {**row, "params": params}
+            if job.get("job_type") not in PREDICTION_JOBS + TRAINING_JOBS:
+                with self._lock:
+                    self.jobs[row["id"]] = job
+                self._finish(row["id"], error=f"Unknown job type: {job.get('job_type')}")
+                continue
+            with self._lock:
+                self.jobs[row["id"]] = job
+            self._dispatch(row["id"])
+            claimed.append(row["id"])
+        return claimed
+
+    def handle_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Answer one socket request."""
+        op = request.get("op")
+        try:
+            if op == "submit":
+                return {"ok": True, "job_id": self.submit(request["job_type"], request.get("params"), request.get("job_id"))}
+            if op == "status":
+                job = self.status(request["job_id"])
+                return {"ok": job is not None, "job": job}
+            if op == "cancel":
+                return {"ok": self.cancel(request["job_id"])}
+            if op == "list":
+                return {"ok": True, "jobs": self.list_jobs(request.get("status"))}
+            return {"ok": False, "error": f"Unknown op: {op}"}
+        except Exception as e:
+            return {"ok": False, "error": str(e)}
+
+    def serve(self, host: Optional[str] = None, port: Optional[int] = None) -> socketserver.ThreadingTCPServer:
+        """Accept JSON-lines requests on a local socket from a daemon thread."""
+        worker_config = self.config.get("job_worker", {})
+        worker = self
+
+        class JobRequestHandler(socketserver.StreamRequestHandler):
+            def handle(self):
+                for line in self.rfile:
+                    if not line.strip():
+                        continue
+                    try:
+                        response = worker.handle_request(json.loads(line))
+                    except json.JSONDecodeError as e:
+                        response = {"ok": False, "error": f"Invalid JSON: {e}"}
+                    self.wfile.write((json.dumps(response, default=str) + "\n").encode())
+
+        socketserver.ThreadingTCPServer.allow_reuse_address = True
+        self._server = socketserver.ThreadingTCPServer(
+            (host or worker_config.get("host", "127.0.0.1"), port if port is not None else worker_config.get("port", 9109)),
+            JobRequestHandler,
+        )
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name="job-socket", daemon=True).start()
+        self.logger.info(f"Listening for jobs on {self._server.server_address}")
+        return self._server
+
+    def run_forever(self, on_poll: Optional[Callable[[List[str]], None]] = None) -> None:
+        """Poll the jobs table until ``stop`` is called."""
+        while not self._stop.is_set():
+            try:
+                claimed = self.poll_queue()
+                if on_poll:
+                    on_poll(claimed)
+            except Exception as e:
+                self.logger.error(f"Failed to poll jobs table: {e}")
+            self._stop.wait(self.poll_interval)
+
+    def stop(self) -> None:
+        """Stop polling and serving, cancel queued jobs and wait for running ones."""
+        self._stop.set()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        for job in self.list_jobs(QUEUED):
+            self.cancel(job["id"])
+        self._prediction_pool.shutdown(wait=True)
+        self._training_pool.shutdown(wait=True)
+        self.engine.wait_for_shadow()
+
+
+def main():
+    """CLI interface for the job worker."""
+    parser = argparse.ArgumentParser(description="ML Job Worker")
+    parser.add_argument(
+        "--config",
+        default="ml_pipeline/model_config.yaml",
+        help="Path to model config",
+    )
+    parser.add_argument(
+        "--host",
+        help="Socket host (defaults to job_worker.host)",
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        help="Socket port (defaults to job_worker.port)",
+    )
+    parser.add_argument(
+        "--no-socket",
+        action="store_true",
+        help="Only poll the jobs table",
+    )
+
+    args = parser.parse_args()
+
+    worker = JobWorker(args.config)
+    if not args.no_socket:
+        server = worker.serve(args.host, args.port)
+        print(f"Job worker listening on {server.server_address[0]}:{server.server_address[1]}")
+    try:
+        worker.run_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        worker.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,8 @@
 import csv
 import json
 import logging
-import uuid
+import threading
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, Optional, List
@@ -9,6 +10,31 @@ import os
 
 from supabase import create_client, Client
 
+try:
+    import fcntl
+except ImportError:  # Windows: only in-process writers are serialized
+    fcntl = None
+
+from utils.evaluation import EvaluationManager
+from utils.ids import new_event_id
+from utils.metrics import MetricsRegistry, get_metrics_registry
+
+# Evaluation log columns; new columns are appended so older logs can be migrated in place
+EVAL_LOG_COLUMNS = [
+    "timestamp",
+    "event_id",
+    "event_type",
+    "model_id",
+    "match_id",
+    "prediction",
+    "actual_result",
+    "confidence",
+    "accuracy",
+    "metadata",
+    "status",
+    "league",
+]
+
 
 class MLLogger:
     """Centralized logging for ML predictions and events with CSV + Supabase persistence."""
@@ -18,11 +44,16 @@ class MLLogger:
         supabase_url: Optional[str] = None,
         supabase_key: Optional[str] = None,
         log_dir: str = "ml_pipeline/logs",
+        metrics: Optional[MetricsRegistry] = None,
+        evaluation_manager: Optional[EvaluationManager] = None,
     ):
         self.supabase_url = supabase_url or os.getenv("SUPABASE_URL")
         self.supabase_key = supabase_key or os.getenv("SUPABASE_SERVICE_KEY")
         self.log_dir = Path(log_dir)
         self.log_dir.mkdir(parents=True, exist_ok=True)
+        self.metrics = metrics or get_metrics_registry()
+        # Fed every settled prediction, keeping its rolling accuracy monitor live
+        self.evaluation_manager = evaluation_manager
 
         # Initialize logger
         self.logger = logging.getLogger("ml_pipeline")
@@ -37,35 +68,69 @@ class MLLogger:
 
         # Supabase client
         self.supabase: Optional[Client] = None
+        self._init_supabase()
+
+        # CSV file for evaluation logs; writes may come from shadow-scoring threads
+        # and, behind a file lock, from other processes such as pre-forked workers
+        self.eval_log_path = self.log_dir / "evaluation_log.csv"
+        self._csv_lock_path = self.log_dir / "evaluation_log.csv.lock"
+        self._csv_lock = threading.Lock()
+        with self._locked_csv():
+            self._init_eval_log_csv()
+
+    def _init_supabase(self) -> None:
+        """Create the Supabase client when credentials are configured."""
         if self.supabase_url and self.supabase_key:
             try:
                 self.supabase = create_client(self.supabase_url, self.supabase_key)
             except Exception as e:
                 self.logger.warning(f"Failed to initialize Supabase: {e}")
 
-        # CSV file for evaluation logs
-        self.eval_log_path = self.log_dir / "evaluation_log.csv"
-        self._init_eval_log_csv()
+    def after_fork(self) -> None:
+        """Give a forked process its own Supabase connection and CSV lock."""
+        # The parent's HTTP connection pool must not be shared across processes,
+        # and its thread lock may have been held by a thread that no longer exists
+        self._csv_lock = threading.Lock()
+        if self.supabase is not None:
+            self.supabase = None
+            self._init_supabase()
+
+    @contextmanager
+    def _locked_csv(self):
+        """Hold the in-process lock and an exclusive lock on the CSV's lock file."""
+        with self._csv_lock:
+            if fcntl is None:
+                yield
+                return
+            with open(self._csv_lock_path, "a") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
 
     def _init_eval_log_csv(self) -> None:
-        """Initialize evaluation log CSV with headers if it doesn't exist."""
+        """Initialize evaluation log CSV with headers, adding columns missing from an older log."""
         if not self.eval_log_path.exists():
-            headers = [
-                "timestamp",
-                "event_id",
-                "event_type",
-                "model_id",
-                "match_id",
-                "prediction",
-                "actual_result",
-                "confidence",
-                "accuracy",
-                "metadata",
-                "status",
-            ]
             with open(self.eval_log_path, "w", newline="") as f:
-                writer = csv.DictWriter(f, fieldnames=headers)
+                writer = csv.DictWriter(f, fieldnames=EVAL_LOG_COLUMNS)
+                writer.writeheader()
+            return
+
+        # Rows stream into a temp file that replaces the log, so a crash mid-migration leaves the old log intact
+        tmp_path = self.eval_log_path.with_name(f".{self.eval_log_path.name}.tmp")
+        with open(self.eval_log_path, "r", newline="") as f:
+            reader = csv.DictReader(f)
+            if reader.fieldnames is None or reader.fieldnames == EVAL_LOG_COLUMNS:
+                return
+            with open(tmp_path, "w", newline="") as out:
+                writer = csv.DictWriter(out, fieldnames=EVAL_LOG_COLUMNS, extrasaction="ignore")
                 writer.writeheader()
+                writer.writerows(reader)
+                out.flush()
+                os.fsync(out.fileno())
+        os.replace(tmp_path, self.eval_log_path)
+        self.logger.info(f"Migrated {self.eval_log_path} to columns {EVAL_LOG_COLUMNS}")
 
     def log_prediction(
         self,
@@ -74,9 +139,11 @@ class MLLogger:
         prediction: str,
         confidence: float,
         metadata: Optional[Dict[str, Any]] = None,
+        event_id: Optional[str] = None,
+        league: Optional[str] = None,
     ) -> str:
-        """Log a prediction event with UUID tracking."""
-        event_id = str(uuid.uuid4())
+        """Log a prediction event under a time-ordered event ID (generated unless given)."""
+        event_id = event_id or new_event_id()
         timestamp = datetime.utcnow().isoformat()
 
         log_entry = {
@@ -91,6 +158,7 @@ class MLLogger:
             "accuracy": None,
             "metadata": json.dumps(metadata or {}),
             "status": "pending",
+            "league": league,
         }
 
         # Write to CSV
@@ -112,7 +180,13 @@ class MLLogger:
         accuracy: float,
         metadata: Optional[Dict[str, Any]] = None,
     ) -> None:
-        """Update prediction with evaluation result."""
+        """Update prediction with evaluation result.
+
+        ``metadata`` is merged into the metadata logged with the prediction,
+        so keys such as ``proba`` and ``champion_event_id`` survive settling.
+        With an ``evaluation_manager`` the settled outcome is also recorded in
+        its rolling accuracy monitor.
+        """
         timestamp = datetime.utcnow().isoformat()
 
         update_entry = {
@@ -120,12 +194,22 @@ class MLLogger:
             "event_id": event_id,
             "actual_result": actual_result,
             "accuracy": accuracy,
-            "metadata": json.dumps(metadata or {}),
             "status": "evaluated",
         }
 
         # Read current CSV, update entry, write back
-        self._update_csv_entry(event_id, update_entry)
+        logged = self._update_csv_entry(event_id, update_entry, merge_metadata=metadata or {})
+        if logged is not None:
+            logged_metadata = json.loads(logged.get("metadata") or "{}")
+            update_entry["metadata"] = json.dumps({**logged_metadata, **(metadata or {})})
+            if self.evaluation_manager is not None:
+                self.evaluation_manager.record_evaluation(
+                    logged["model_id"],
+                    logged["prediction"],
+                    actual_result,
+                    league=logged.get("league") or None,
+                    timestamp=timestamp,
+                )
 
         # Update in Supabase
         if self.supabase:
@@ -140,8 +224,9 @@ class MLLogger:
         metrics: Dict[str, Any],
         dataset_size: int,
         source: str = "manual",
+        stages: Optional[Dict[str, Any]] = None,
     ) -> None:
-        """Log model training run."""
+        """Log model training run, with per-stage timings when available."""
         timestamp = datetime.utcnow().isoformat()
 
         training_entry = {
@@ -151,6 +236,7 @@ class MLLogger:
             "dataset_size": dataset_size,
             "source": source,
             "metrics": json.dumps(metrics),
+            "stages": json.dumps(stages or {}),
             "status": "completed",
         }
 
@@ -163,38 +249,59 @@ class MLLogger:
     def _write_to_csv(self, entry: Dict[str, Any]) -> None:
         """Append entry to CSV file."""
         try:
-            with open(self.eval_log_path, "a", newline="") as f:
-                writer = csv.DictWriter(f, fieldnames=entry.keys())
-                writer.writerow(entry)
+            with self.metrics.timer("stage_latency_seconds", {"stage": "csv_log"}):
+                with self._locked_csv(), open(self.eval_log_path, "a", newline="") as f:
+                    writer = csv.DictWriter(f, fieldnames=EVAL_LOG_COLUMNS)
+                    writer.writerow(entry)
         except Exception as e:
+            self.metrics.inc("log_errors_total", labels={"sink": "csv"})
             self.logger.error(f"Failed to write to CSV: {e}")
 
-    def _update_csv_entry(self, event_id: str, updates: Dict[str, Any]) -> None:
-        """Update an existing entry in the CSV file."""
+    def _update_csv_entry(
+        self,
+        event_id: str,
+        updates: Dict[str, Any],
+        merge_metadata: Optional[Dict[str, Any]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Update an existing entry in the CSV file, returning the row as it was logged.
+
+        With ``merge_metadata`` the entry's metadata is updated with those
+        keys instead of being replaced.
+        """
+        logged_row = None
         try:
-            rows = []
-            with open(self.eval_log_path, "r", newline="") as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    if row["event_id"] == event_id:
-                        row.update(updates)
-                    rows.append(row)
-
-            with open(self.eval_log_path, "w", newline="") as f:
-                if rows:
-                    writer = csv.DictWriter(f, fieldnames=rows[0].keys())
-                    writer.writeheader()
-                    writer.writerows(rows)
+            with self.metrics.timer("stage_latency_seconds", {"stage": "csv_update"}), self._locked_csv():
+                rows = []
+                with open(self.eval_log_path, "r", newline="") as f:
+                    reader = csv.DictReader(f)
+                    for row in reader:
+                        if row["event_id"] == event_id:
+                            logged_row = dict(row)
+                            if merge_metadata is not None:
+                                logged_metadata = json.loads(row.get("metadata") or "{}")
+                                row["metadata"] = json.dumps({**logged_metadata, **merge_metadata})
+                            row.update(updates)
+                        rows.append(row)
+
+                with open(self.eval_log_path, "w", newline="") as f:
+                    if rows:
+                        writer = csv.DictWriter(f, fieldnames=rows[0].keys())
+                        writer.writeheader()
+                        writer.writerows(rows)
         except Exception as e:
+            self.metrics.inc("log_errors_total", labels={"sink": "csv"})
             self.logger.error(f"Failed to update CSV entry: {e}")
+        return logged_row
 
     def _write_to_supabase(self, table: str, entry: Dict[str, Any]) -> None:
         """Write entry to Supabase table."""
         try:
             if not self.supabase:
                 return
-            self.supabase.table(table).insert(entry).execute()
+            with self.metrics.timer("stage_latency_seconds", {"stage": "supabase_log"}):
+                self.supabase.table(table).insert(entry).execute()
         except Exception as e:
+            self.metrics.inc("log_errors_total", labels={"sink": "supabase"})
             self.logger.error(f"Failed to write to Supabase table {table}: {e}")
 
     def _update_supabase_entry(
@@ -204,8 +311,10 @@ class MLLogger:
         try:
             if not self.supabase:
                 return
-            self.supabase.table(table).update(updates).eq("event_id", event_id).execute()
+            with self.metrics.timer("stage_latency_seconds", {"stage": "supabase_update"}):
+                self.supabase.table(table).update(updates).eq("event_id", event_id).execute()
         except Exception as e:
+            self.metrics.inc("log_errors_total", labels={"sink": "supabase"})
             self.logger.error(f"Failed to update Supabase table {table}: {e}")
 
     def reconcile_logs(self) -> Dict[str, Any]:
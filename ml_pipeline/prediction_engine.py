@@ -4,19 +4,28 @@ import json
 import logging
 import os
 import pickle
-import uuid
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
 
 import numpy as np
 import pandas as pd
 import yaml
 from sklearn.linear_model import LogisticRegression
 from sklearn.ensemble import RandomForestClassifier
-from sklearn.preprocessing import StandardScaler
 
+from batch_scoring import BatchScoringJob
+from feature_store import TeamFeatureStore
+from fixture_table import FixturePredictionTable, refresh_fixture_table
 from ml_logging import MLLogger
+from utils.dtypes import OUTCOME_LABELS, compact_enabled, constant_categorical, outcome_categorical
+from utils.evaluation import get_evaluation_manager
+from utils.ids import new_event_ids
+from utils.metrics import get_metrics_registry, serve_metrics
+from utils.preprocessing import FeaturePreprocessor
 
 
 class PredictionEngine:
@@ -26,14 +35,42 @@ class PredictionEngine:
         self.config_path = Path(config_path)
         self.config = self._load_config()
         self.logger = self._init_logger()
-        self.ml_logger = MLLogger()
-
-        self.model = None
-        self.scaler = None
+        self.metrics = get_metrics_registry(self.config)
+        # Settled predictions feed the live accuracy monitor through the logger
+        self.evaluation_manager = get_evaluation_manager(self.config)
+        monitoring = self.config.get("decay_monitoring", {}).get("enabled", False)
+        self.ml_logger = MLLogger(
+            metrics=self.metrics,
+            evaluation_manager=self.evaluation_manager if monitoring else None,
+        )
+        self._metrics_server = None
+
+        # Model and its preprocessor, published together so a reload never pairs one with the other's stale half
+        self._serving: Tuple[Any, Optional[FeaturePreprocessor]] = (None, None)
+        self.feature_store: Optional[TeamFeatureStore] = None
+        # Precomputed fixture predictions, reloaded when the refresh job rewrites the file
+        self.fixture_table: Optional[FixturePredictionTable] = None
+        self._fixture_table_mtime: Optional[int] = None
         self.model_registry = self._load_model_registry()
         self.active_model_id = self.config["inference"]["active_model_id"]
+        self.compact_dtypes = compact_enabled(self.config)
+
+        # Shadow scoring of the registry challenger, off the request path
+        self.shadow_model = None
+        self.shadow_preprocessor: Optional[FeaturePreprocessor] = None
+        self.shadow_model_id: Optional[str] = None
+        self._shadow_executor: Optional[ThreadPoolExecutor] = None
+        self._shadow_futures: Set[Future] = set()
+
+        # Artifact identity (size and mtime) of each model as it was loaded, by model id
+        self.artifact_fingerprints: Dict[str, str] = {}
+        # Models loaded and warmed by preload_models, reused instead of unpickling again
+        self.warm_models: Dict[str, Tuple[Any, Optional[FeaturePreprocessor]]] = {}
+        self.ready = threading.Event()
 
         self.logger.info(f"PredictionEngine initialized with config: {config_path}")
+        if self.config["inference"].get("preload_models", False):
+            self.preload_models()
 
     def _load_config(self) -> Dict[str, Any]:
         """Load model configuration from YAML."""
@@ -45,6 +82,24 @@ class PredictionEngine:
             print(f"Error loading config: {e}")
             raise
 
+    @property
+    def model(self) -> Any:
+        """The active model."""
+        return self._serving[0]
+
+    @model.setter
+    def model(self, model: Any) -> None:
+        self._serving = (model, self._serving[1])
+
+    @property
+    def preprocessor(self) -> Optional[FeaturePreprocessor]:
+        """The active model's fitted preprocessor."""
+        return self._serving[1]
+
+    @preprocessor.setter
+    def preprocessor(self, preprocessor: Optional[FeaturePreprocessor]) -> None:
+        self._serving = (self._serving[0], preprocessor)
+
     def _init_logger(self) -> logging.Logger:
         """Initialize logger."""
         logger = logging.getLogger("prediction_engine")
@@ -60,6 +115,22 @@ class PredictionEngine:
             logger.setLevel(logging.INFO)
         return logger
 
+    def _stage(self, stage: str):
+        """Time a prediction-path stage into the latency histogram."""
+        return self.metrics.timer("stage_latency_seconds", {"stage": stage})
+
+    def start_metrics_server(self, port: Optional[int] = None):
+        """Expose this process's metrics over HTTP (``/metrics`` and ``/metrics.json``)."""
+        if self._metrics_server is None:
+            metrics_config = self.config.get("metrics", {})
+            self._metrics_server = serve_metrics(
+                self.metrics,
+                port=port or metrics_config.get("port", 9108),
+                host=metrics_config.get("host", "127.0.0.1"),
+            )
+            self.logger.info(f"Serving metrics on port {self._metrics_server.server_port}")
+        return self._metrics_server
+
     def _load_model_registry(self) -> Dict[str, Any]:
         """Load model registry."""
         registry_path = Path("ml_pipeline/models/model_registry.json")
@@ -70,50 +141,347 @@ class PredictionEngine:
             self.logger.error(f"Error loading model registry: {e}")
             return {}
 
+    def _load_artifacts(self, model_info: Dict[str, Any]) -> Tuple[Any, Optional[FeaturePreprocessor]]:
+        """Load a registry model and its fitted preprocessor from disk."""
+        artifact_path = Path(model_info["artifact_path"])
+        self.artifact_fingerprints[model_info["model_id"]] = self._artifact_fingerprint(model_info)
+        model = None
+        if not artifact_path.exists():
+            self.logger.warning(f"Model artifact not found: {artifact_path}, using in-memory model")
+            # For development, create a dummy model
+            if model_info["algorithm"] == "LogisticRegression":
+                model = LogisticRegression(random_state=42, max_iter=1000)
+            elif model_info["algorithm"] == "RandomForest":
+                model = RandomForestClassifier(n_estimators=100, random_state=42)
+        else:
+            with open(artifact_path, "rb") as f:
+                model = pickle.load(f)
+
+        # The preprocessor fitted at train time is stored next to the model
+        preprocessor_path = artifact_path.with_name(f"{artifact_path.stem}_preprocessor.pkl")
+        legacy_scaler_path = artifact_path.with_name(f"{artifact_path.stem}_scaler.pkl")
+        preprocessor = None
+        if preprocessor_path.exists():
+            with open(preprocessor_path, "rb") as f:
+                preprocessor = pickle.load(f)
+        elif legacy_scaler_path.exists():
+            # Models saved by the earlier trainer carry a bare StandardScaler
+            with open(legacy_scaler_path, "rb") as f:
+                preprocessor = FeaturePreprocessor.from_scaler(pickle.load(f))
+            self.logger.info(f"Loaded legacy scaler: {legacy_scaler_path}")
+        elif not artifact_path.exists():
+            # The untrained development stand-in has nothing to scale for
+            self.logger.warning(f"Preprocessor not found: {preprocessor_path}, using raw features")
+        else:
+            # A trained model fed unscaled inputs would give wrong probabilities without an error
+            raise FileNotFoundError(f"Preprocessor not found for {model_info['model_id']}: {preprocessor_path}")
+        return model, preprocessor
+
+    @staticmethod
+    def _artifact_fingerprint(model_info: Dict[str, Any]) -> str:
+        """Model id plus size and mtime of its artifacts, so a model replaced under the same id is detected."""
+        artifact_path = Path(model_info["artifact_path"])
+        parts = [model_info["model_id"]]
+        for suffix in ("", "_preprocessor", "_scaler"):
+            path = artifact_path.with_name(f"{artifact_path.stem}{suffix}.pkl")
+            try:
+                stat = path.stat()
+                parts.append(f"{stat.st_size}-{stat.st_mtime_ns}")
+            except FileNotFoundError:
+                parts.append("missing")
+        return ":".join(parts)
+
+    def model_fingerprint(self, model_id: Optional[str] = None) -> str:
+        """Fingerprint of a model as loaded in this engine (its id when not loaded from the registry)."""
+        model_id = model_id or self.active_model_id
+        return self.artifact_fingerprints.get(model_id, model_id)
+
+    def _get_artifacts(self, model_id: str, model_info: Dict[str, Any]) -> Tuple[Any, Optional[FeaturePreprocessor]]:
+        """Warm artifacts for a model if preloaded, otherwise load them from disk."""
+        warm = self.warm_models.get(model_id)
+        return warm if warm is not None else self._load_artifacts(model_info)
+
+    def _find_model_info(self, model_id: str) -> Optional[Dict[str, Any]]:
+        """Look up a model in the registry."""
+        return next(
+            (m for m in self.model_registry.get("models", []) if m["model_id"] == model_id),
+            None,
+        )
+
     def load_model(self, model_id: Optional[str] = None) -> bool:
         """Load ML model from disk."""
         model_id = model_id or self.active_model_id
         try:
-            model_info = next(
-                (m for m in self.model_registry.get("models", []) if m["model_id"] == model_id),
-                None,
-            )
+            model_info = self._find_model_info(model_id)
             if not model_info:
                 self.logger.error(f"Model {model_id} not found in registry")
                 return False
 
-            artifact_path = Path(model_info["artifact_path"])
-            if not artifact_path.exists():
-                self.logger.warning(f"Model artifact not found: {artifact_path}, using in-memory model")
-                # For development, create a dummy model
-                if model_info["algorithm"] == "LogisticRegression":
-                    self.model = LogisticRegression(random_state=42, max_iter=1000)
-                elif model_info["algorithm"] == "RandomForest":
-                    self.model = RandomForestClassifier(n_estimators=100, random_state=42)
-            else:
-                with open(artifact_path, "rb") as f:
-                    self.model = pickle.load(f)
-
+            with self._stage("model_load"):
+                self._serving = self._get_artifacts(model_id, model_info)
             self.active_model_id = model_id
             self.logger.info(f"Loaded model: {model_id}")
+
+            if self.config.get("champion_challenger", {}).get("shadow_scoring", False):
+                self.enable_shadow()
+            self._refresh_fixtures_on_load()
             return True
         except Exception as e:
+            self.metrics.inc("model_load_errors_total")
             self.logger.error(f"Error loading model: {e}")
             return False
 
+    def preload_model_ids(self) -> List[str]:
+        """Registry models to keep warm: active, champion, challenger and ensemble members."""
+        registry = self.model_registry
+        model_ids = [
+            self.active_model_id,
+            registry.get("champion_model_id"),
+            registry.get("challenger_model_id"),
+        ]
+        ensemble_config = self.config.get("ensemble", {})
+        if ensemble_config.get("enabled", False):
+            model_ids += ensemble_config.get("member_models", [])
+        for info in registry.get("models", []):
+            if info.get("status") == "active" or any(info.get(flag) for flag in ("champion", "challenger", "ensemble_member")):
+                model_ids.append(info["model_id"])
+        return [model_id for model_id in dict.fromkeys(model_ids) if model_id and self._find_model_info(model_id)]
+
+    def _warm_up(self, model: Any, preprocessor: Optional[FeaturePreprocessor], model_info: Dict[str, Any], rows: int) -> None:
+        """Run a synthetic batch and a single row through a model to initialise it."""
+        n_features = getattr(model, "n_features_in_", None) or len(
+            model_info.get("features") or self.config["inference"]["input_features"]
+        )
+        X = np.random.default_rng(0).normal(size=(rows, n_features)).astype(np.float32)
+        for batch in (X, X[:1].copy()):
+            if preprocessor is not None:
+                batch = preprocessor.transform(batch, copy=False)
+            if hasattr(model, "predict_proba"):
+                model.predict_proba(batch)
+            model.predict(batch)
+
+    def preload_models(self, max_workers: Optional[int] = None, warmup_rows: Optional[int] = None) -> Dict[str, Any]:
+        """Load and warm every serving model in parallel; the engine is ready once all are hot.
+
+        Returns per-model status. ``self.ready`` is set only if every model
+        loaded and completed its warm-up batch.
+        """
+        inference_config = self.config["inference"]
+        warmup_rows = warmup_rows or inference_config.get("warmup_rows", 256)
+        model_ids = self.preload_model_ids()
+        self.ready.clear()
+
+        def load(model_id: str) -> Tuple[Any, Optional[FeaturePreprocessor]]:
+            model_info = self._find_model_info(model_id)
+            with self._stage("model_load"):
+                model, preprocessor = self._load_artifacts(model_info)
+            with self._stage("warmup"):
+                self._warm_up(model, preprocessor, model_info, warmup_rows)
+            return model, preprocessor
+
+        start = time.perf_counter()
+        status: Dict[str, str] = {}
+        workers = max_workers or inference_config.get("preload_workers", 4)
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(model_ids) or 1)), thread_name_prefix="preload") as pool:
+            futures = {model_id: pool.submit(load, model_id) for model_id in model_ids}
+            for model_id, future in futures.items():
+                try:
+                    self.warm_models[model_id] = future.result()
+                    status[model_id] = "ready"
+                except Exception as e:
+                    self.metrics.inc("model_load_errors_total")
+                    self.logger.error(f"Failed to preload model {model_id}: {e}")
+                    status[model_id] = f"failed: {e}"
+
+        ready = bool(model_ids) and all(state == "ready" for state in status.values())
+        # Serve from the warm copies of the active model and its challenger
+        if self.active_model_id in self.warm_models:
+            self.load_model()
+        self.metrics.set_gauge("warm_models", len(self.warm_models))
+        self.metrics.set_gauge("engine_ready", int(ready))
+        if ready:
+            self.ready.set()
+        elapsed = time.perf_counter() - start
+        self.logger.info(f"Preloaded {len(self.warm_models)}/{len(model_ids)} models in {elapsed:.2f}s, ready={ready}")
+        return {"ready": ready, "models": status, "seconds": round(elapsed, 3)}
+
+    def _refresh_fixtures_on_load(self) -> None:
+        """Re-score the fixture table for a newly loaded model when configured to."""
+        table_config = self.config.get("fixture_table", {})
+        source = table_config.get("fixtures_source")
+        if not table_config.get("refresh_on_load", False) or not source or not Path(source).exists():
+            return
+        try:
+            summary = refresh_fixture_table(self, pd.read_csv(source))
+            self.logger.info(f"Refreshed fixture table for {self.active_model_id}: {summary['n_rescored']} re-scored")
+        except Exception as e:
+            self.logger.error(f"Failed to refresh fixture table: {e}")
+
+    def enable_shadow(self, model_id: Optional[str] = None) -> bool:
+        """Load a challenger to be scored in the background alongside the active model.
+
+        Defaults to the registry's ``challenger_model_id``. The challenger must
+        take the same input features as the active model.
+        """
+        model_id = model_id or self.model_registry.get("challenger_model_id")
+        if not model_id or model_id == self.active_model_id:
+            self.disable_shadow()
+            return False
+        try:
+            model_info = self._find_model_info(model_id)
+            if not model_info:
+                self.logger.error(f"Shadow model {model_id} not found in registry")
+                return False
+
+            input_features = self.config["inference"]["input_features"]
+            if model_info.get("features", input_features) != input_features:
+                self.logger.warning(f"Shadow model {model_id} uses different features, shadow scoring disabled")
+                self.disable_shadow()
+                return False
+
+            with self._stage("model_load"):
+                self.shadow_model, self.shadow_preprocessor = self._get_artifacts(model_id, model_info)
+            self.shadow_model_id = model_id
+            if self._shadow_executor is None:
+                workers = self.config.get("champion_challenger", {}).get("shadow_workers", 2)
+                self._shadow_executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="shadow")
+            self.logger.info(f"Shadow scoring enabled for {model_id}")
+            return True
+        except Exception as e:
+            self.logger.error(f"Error loading shadow model: {e}")
+            return False
+
+    def disable_shadow(self) -> None:
+        """Stop shadow scoring after outstanding work completes."""
+        self.wait_for_shadow()
+        self.shadow_model = None
+        self.shadow_preprocessor = None
+        self.shadow_model_id = None
+        if self._shadow_executor is not None:
+            self._shadow_executor.shutdown(wait=True)
+            self._shadow_executor = None
+
+    def after_fork(self) -> None:
+        """Reset per-process state in a forked worker; loaded models stay shared with the parent."""
+        self._shadow_futures = set()
+        self._metrics_server = None
+        self.metrics.reset()
+        self.ml_logger.after_fork()
+        if self._shadow_executor is not None:
+            # The parent's pool threads do not exist in the child
+            workers = self.config.get("champion_challenger", {}).get("shadow_workers", 2)
+            self._shadow_executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="shadow")
+
+    def wait_for_shadow(self, timeout: Optional[float] = None) -> None:
+        """Block until outstanding shadow predictions have been scored and logged."""
+        wait(list(self._shadow_futures), timeout=timeout)
+
+    def _track_shadow(self, future: Future) -> None:
+        """Keep a reference to a shadow task until it completes."""
+        self._shadow_futures.add(future)
+        self.metrics.set_gauge("shadow_queue_depth", len(self._shadow_futures))
+        future.add_done_callback(self._untrack_shadow)
+
+    def _untrack_shadow(self, future: Future) -> None:
+        """Forget a completed shadow task."""
+        self._shadow_futures.discard(future)
+        self.metrics.set_gauge("shadow_queue_depth", len(self._shadow_futures))
+
+    def _submit_shadow(self, raw: Union[List[float], pd.DataFrame]) -> Optional[Future]:
+        """Start scoring raw inputs with the shadow model in the background."""
+        if self.shadow_model is None or self._shadow_executor is None:
+            return None
+        future = self._shadow_executor.submit(
+            self._score_shadow, raw, self.shadow_model, self.shadow_preprocessor
+        )
+        self._track_shadow(future)
+        return future
+
+    def _link_shadow(
+        self,
+        scored: Optional[Future],
+        event_ids: List[Optional[str]],
+        match_ids: List[str],
+        leagues: Optional[List[Optional[str]]] = None,
+    ) -> None:
+        """Log shadow predictions against the active model's events once both are available."""
+        if scored is None or self._shadow_executor is None:
+            return
+        self._track_shadow(
+            self._shadow_executor.submit(self._log_shadow, scored, self.shadow_model_id, event_ids, match_ids, leagues)
+        )
+
+    def _score_shadow(
+        self,
+        raw: Union[List[float], pd.DataFrame],
+        model: Any,
+        preprocessor: Optional[FeaturePreprocessor],
+    ) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """Preprocess and score raw inputs with the shadow model (runs in a worker thread)."""
+        if isinstance(raw, pd.DataFrame):
+            X = raw[self.config["inference"]["input_features"]].to_numpy(dtype=np.float32, copy=True)
+        else:
+            X = np.array(raw, dtype=np.float32).reshape(1, -1)
+        return self.score_features(X, model, preprocessor)
+
+    def score_features(
+        self,
+        X: np.ndarray,
+        model: Any,
+        preprocessor: Optional[FeaturePreprocessor],
+    ) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """Score a raw float32 feature matrix (transformed in place) without logging."""
+        if preprocessor is not None:
+            X = preprocessor.transform(X, copy=False)
+        proba = model.predict_proba(X) if hasattr(model, "predict_proba") else None
+        return model.predict(X), proba
+
+    def _log_shadow(
+        self,
+        scored: Future,
+        model_id: str,
+        event_ids: List[Optional[str]],
+        match_ids: List[str],
+        leagues: Optional[List[Optional[str]]] = None,
+    ) -> None:
+        """Log shadow predictions linked to the active model's events (runs in a worker thread)."""
+        try:
+            predictions, probas = scored.result()
+            n_linked = sum(event_id is not None for event_id in event_ids)
+            self.metrics.inc("shadow_predictions_total", n_linked, {"model_id": model_id})
+            for i, (event_id, match_id) in enumerate(zip(event_ids, match_ids)):
+                if event_id is None:
+                    continue
+                proba = probas[i] if probas is not None else None
+                self.ml_logger.log_prediction(
+                    model_id=model_id,
+                    match_id=match_id,
+                    prediction=self._decode_prediction(predictions[i]),
+                    confidence=float(np.max(proba)) if proba is not None else 0.5,
+                    metadata={
+                        "shadow": True,
+                        "champion_event_id": event_id,
+                        "proba": proba.tolist() if proba is not None else None,
+                    },
+                    league=leagues[i] if leagues is not None else None,
+                )
+        except Exception as e:
+            self.metrics.inc("shadow_errors_total", labels={"model_id": model_id})
+            self.logger.error(f"Shadow scoring failed for {model_id}: {e}")
+
     def preprocess_features(self, features: List[float]) -> np.ndarray:
         """Preprocess features for prediction."""
+        return self._preprocess(features, self.preprocessor)
+
+    def _preprocess(self, features: List[float], preprocessor: Optional[FeaturePreprocessor]) -> np.ndarray:
+        """Preprocess features with a given fitted preprocessor."""
         try:
-            # Convert to numpy array
-            X = np.array(features).reshape(1, -1)
-
-            # Apply scaling if configured
-            if self.config["training"]["preprocessing"]["scaling"] == "StandardScaler":
-                if self.scaler is None:
-                    self.scaler = StandardScaler()
-                    X = self.scaler.fit_transform(X)
-                else:
-                    X = self.scaler.transform(X)
+            with self._stage("preprocess"):
+                X = np.array(features, dtype=np.float32).reshape(1, -1)
+
+                # Apply the model's fitted preprocessing in place
+                if preprocessor is not None:
+                    X = preprocessor.transform(X, copy=False)
 
             return X
         except Exception as e:
@@ -125,6 +493,7 @@ class PredictionEngine:
         features: List[float],
         match_id: str,
         return_confidence: bool = True,
+        league: Optional[str] = None,
     ) -> Dict[str, Any]:
         """Make a prediction for a single match."""
         try:
@@ -132,18 +501,24 @@ class PredictionEngine:
                 if not self.load_model():
                     raise ValueError("Failed to load model")
 
+            # One read, so a concurrent reload cannot mix models and preprocessors
+            model, preprocessor = self._serving
+
+            # The challenger scores the same raw features concurrently
+            shadow = self._submit_shadow(features)
+
             # Preprocess features
-            X = self.preprocess_features(features)
+            X = self._preprocess(features, preprocessor)
 
             # Make prediction
-            prediction = self.model.predict(X)[0]
-            prediction_str = self._decode_prediction(prediction)
+            with self._stage("inference"):
+                prediction = model.predict(X)[0]
+                proba = model.predict_proba(X)[0] if hasattr(model, "predict_proba") else None
 
-            # Get confidence
-            confidence = 0.5
-            if hasattr(self.model, "predict_proba"):
-                proba = self.model.predict_proba(X)[0]
-                confidence = float(np.max(proba))
+            # Decode outcome and confidence
+            with self._stage("decode"):
+                prediction_str = self._decode_prediction(prediction)
+                confidence = float(np.max(proba)) if proba is not None else 0.5
 
             # Create prediction log
             event_id = self.ml_logger.log_prediction(
@@ -154,9 +529,12 @@ class PredictionEngine:
                 metadata={
                     "features": features,
                     "raw_prediction": float(prediction),
+                    "proba": proba.tolist() if proba is not None else None,
                     "timestamp": datetime.utcnow().isoformat(),
                 },
+                league=league,
             )
+            self._link_shadow(shadow, [event_id], [match_id], [league])
 
             result = {
                 "event_id": event_id,
@@ -167,55 +545,180 @@ class PredictionEngine:
                 "timestamp": datetime.utcnow().isoformat(),
             }
 
+            self.metrics.inc("predictions_total", labels={"model_id": self.active_model_id, "mode": "single"})
             self.logger.info(f"Prediction for match {match_id}: {prediction_str} ({confidence:.2%})")
             return result
         except Exception as e:
+            self.metrics.inc("prediction_errors_total", labels={"mode": "single"})
             self.logger.error(f"Error making prediction: {e}")
             raise
 
-    def batch_predict(self, data: pd.DataFrame) -> pd.DataFrame:
-        """Make predictions for multiple matches."""
+    def predict_match(
+        self,
+        home_team: str,
+        away_team: str,
+        match_date: Optional[str] = None,
+        match_id: Optional[str] = None,
+        league: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Predict a fixture, served from the precomputed fixture table when it is current.
+
+        Otherwise features are resolved from the team feature store and the
+        fixture is scored live.
+        """
+        if self.feature_store is None:
+            self.feature_store = TeamFeatureStore.from_config(self.config)
+
+        match_id = match_id or f"{home_team}_{away_team}_{match_date or 'latest'}"
+        table = self._current_fixture_table()
+        if table is not None:
+            cached = table.lookup(match_id)
+            if cached is not None and self._fixture_row_current(table, cached):
+                self.metrics.inc("cache_hits_total", labels={"cache": "fixture_table"})
+                return {
+                    "event_id": cached.get("event_id"),
+                    "match_id": match_id,
+                    "prediction": cached["prediction"],
+                    "confidence": cached["confidence"],
+                    "model_id": cached["model_id"],
+                    "timestamp": cached["scored_at"],
+                    "source": "fixture_table",
+                }
+            self.metrics.inc("cache_misses_total", labels={"cache": "fixture_table"})
+
+        with self._stage("feature_lookup"):
+            features = self.feature_store.get_features(
+                home_team,
+                away_team,
+                match_date,
+                self.config["inference"]["input_features"],
+            )
+        return self.predict(features, match_id, league=league)
+
+    def _fixture_row_current(self, table: FixturePredictionTable, row: Dict[str, Any]) -> bool:
+        """Whether a stored fixture prediction came from the loaded model and the current features."""
+        return (
+            row["model_id"] == self.active_model_id
+            and row.get("model_fingerprint") == self.model_fingerprint()
+            and table.feature_version == self.feature_store.version
+        )
+
+    def _current_fixture_table(self) -> Optional[FixturePredictionTable]:
+        """The configured fixture table, reloaded if its file changed since the last lookup."""
+        table_config = self.config.get("fixture_table", {})
+        if not table_config.get("serve", False):
+            return self.fixture_table
+        path = Path(table_config.get("path", "ml_pipeline/models/fixture_predictions.pkl"))
+        try:
+            mtime = path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return self.fixture_table
+        if mtime != self._fixture_table_mtime:
+            self.fixture_table = FixturePredictionTable.load(str(path))
+            self._fixture_table_mtime = mtime
+        return self.fixture_table
+
+    def batch_predict(
+        self,
+        data: pd.DataFrame,
+        event_ids: Optional[List[str]] = None,
+        skip_logging: Optional[Set[str]] = None,
+    ) -> pd.DataFrame:
+        """Make predictions for multiple matches.
+
+        ``event_ids`` assigns pre-reserved ids to the rows (one per row), and
+        rows whose id is in ``skip_logging`` are scored but not logged again,
+        which lets a resumed batch job avoid duplicate log entries.
+        """
         try:
             if not self.model:
                 if not self.load_model():
                     raise ValueError("Failed to load model")
 
+            # One read, so a concurrent reload cannot mix models and preprocessors
+            model, preprocessor = self._serving
+
+            # The challenger scores the same raw features concurrently
+            shadow = self._submit_shadow(data)
+
             input_features = self.config["inference"]["input_features"]
-            X = data[input_features].values
-
-            # Preprocess all features
-            X = self.scaler.fit_transform(X) if self.scaler else X
-
-            # Make predictions
-            predictions = self.model.predict(X)
-            predictions = [self._decode_prediction(p) for p in predictions]
-
-            # Get confidences
-            confidences = [0.5] * len(predictions)
-            if hasattr(self.model, "predict_proba"):
-                probas = self.model.predict_proba(X)
-                confidences = [float(np.max(p)) for p in probas]
-
-            # Create results dataframe
-            results = data.copy()
-            results["prediction"] = predictions
-            results["confidence"] = confidences
-            results["model_id"] = self.active_model_id
-            results["event_id"] = [str(uuid.uuid4()) for _ in range(len(data))]
-            results["timestamp"] = datetime.utcnow().isoformat()
-
-            # Log each prediction
-            for _, row in results.iterrows():
+            with self._stage("preprocess"):
+                X = data[input_features].to_numpy(dtype=np.float32, copy=True)
+
+                # Preprocess all features in place with the model's fitted transform
+                if preprocessor is not None:
+                    X = preprocessor.transform(X, copy=False)
+
+            # Make predictions; with probabilities the predicted class is their argmax
+            with self._stage("inference"):
+                if hasattr(model, "predict_proba") and hasattr(model, "classes_"):
+                    probas = model.predict_proba(X)
+                    predictions = model.classes_.take(probas.argmax(axis=1))
+                else:
+                    probas = None
+                    predictions = model.predict(X)
+
+            # Decode outcomes and confidences into preallocated typed columns
+            n = len(data)
+            with self._stage("decode"):
+                prediction_col = self._decode_predictions(predictions)
+                confidence = np.empty(n, dtype=np.float32 if self.compact_dtypes else np.float64)
+                if probas is not None:
+                    probas.max(axis=1, out=confidence)
+                else:
+                    confidence.fill(0.5)
+
+            # New columns over the caller's data; input columns are shared, not copied
+            timestamp = datetime.utcnow().isoformat()
+            columns = {col: data[col] for col in data.columns}
+            columns["prediction"] = prediction_col
+            columns["confidence"] = confidence
+            if self.compact_dtypes:
+                columns["model_id"] = constant_categorical(self.active_model_id, n)
+                columns["timestamp"] = constant_categorical(timestamp, n)
+            else:
+                columns["model_id"] = self.active_model_id
+                columns["timestamp"] = timestamp
+            results = pd.DataFrame(columns, index=data.index, copy=False)
+
+            # Log each prediction under bulk-generated, time-ordered event ids
+            if event_ids is None:
+                event_ids = new_event_ids(n)
+            elif len(event_ids) != n:
+                raise ValueError(f"Expected {n} event ids, got {len(event_ids)}")
+            event_ids = list(event_ids)
+            match_ids = data["match_id"].tolist() if "match_id" in data.columns else event_ids
+            leagues = data["league"].astype(object).where(data["league"].notna(), None).tolist() if "league" in data.columns else None
+            labels = np.asarray(prediction_col).tolist()
+            confidences = confidence.tolist()
+            proba_rows = probas.tolist() if probas is not None else None
+            skip_logging = skip_logging or set()
+            for i in range(n):
+                if event_ids[i] in skip_logging:
+                    continue
                 self.ml_logger.log_prediction(
                     model_id=self.active_model_id,
-                    match_id=row.get("match_id", str(uuid.uuid4())),
-                    prediction=row["prediction"],
-                    confidence=row["confidence"],
+                    match_id=match_ids[i],
+                    prediction=labels[i],
+                    confidence=confidences[i],
+                    metadata={"proba": proba_rows[i]} if proba_rows is not None else None,
+                    event_id=event_ids[i],
+                    league=leagues[i] if leagues is not None else None,
                 )
+            results["event_id"] = event_ids
+            # Rows logged by an earlier attempt are not shadow-logged again
+            self._link_shadow(
+                shadow,
+                [None if event_id in skip_logging else event_id for event_id in event_ids] if skip_logging else event_ids,
+                match_ids,
+                leagues,
+            )
 
+            self.metrics.inc("predictions_total", len(results), {"model_id": self.active_model_id, "mode": "batch"})
             self.logger.info(f"Made predictions for {len(results)} matches")
             return results
         except Exception as e:
+            self.metrics.inc("prediction_errors_total", labels={"mode": "batch"})
             self.logger.error(f"Error in batch predictions: {e}")
             raise
 
@@ -245,13 +748,20 @@ class PredictionEngine:
             return mapping.get(int(prediction), "D")
         return str(prediction)
 
+    def _decode_predictions(self, predictions: np.ndarray) -> Union[pd.Categorical, np.ndarray]:
+        """Decode a batch of outcome codes by indexing the label table."""
+        if not np.issubdtype(predictions.dtype, np.integer):
+            return predictions.astype(str).astype(object)
+        # Unknown codes decode to a draw, as in _decode_prediction
+        in_range = (predictions >= 0) & (predictions < len(OUTCOME_LABELS))
+        codes = np.where(in_range, predictions, OUTCOME_LABELS.index("D"))
+        if self.compact_dtypes:
+            return outcome_categorical(codes)
+        return np.array(OUTCOME_LABELS, dtype=object).take(codes)
+
     def get_model_info(self) -> Dict[str, Any]:
         """Get information about the active model."""
-        model_info = next(
-            (m for m in self.model_registry.get("models", []) if m["model_id"] == self.active_model_id),
-            None,
-        )
-        return model_info or {}
+        return self._find_model_info(self.active_model_id) or {}
 
 
 def main():
@@ -277,6 +787,18 @@ def main():
         "--model-id",
         help="Specific model to use for prediction",
     )
+    parser.add_argument(
+        "--home",
+        help="Home team (features resolved from the feature store)",
+    )
+    parser.add_argument(
+        "--away",
+        help="Away team (features resolved from the feature store)",
+    )
+    parser.add_argument(
+        "--date",
+        help="Match date for feature store lookups",
+    )
     parser.add_argument(
         "--info",
         action="store_true",
@@ -286,10 +808,40 @@ def main():
         "--batch",
         help="Path to CSV file for batch predictions",
     )
+    parser.add_argument(
+        "--job-id",
+        help="Checkpoint a --batch run under this id; rerunning with it resumes after a crash",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        help="Rows per committed chunk of a checkpointed batch (defaults to batch_scoring.chunk_size)",
+    )
+    parser.add_argument(
+        "--refresh-fixtures",
+        nargs="?",
+        const="",
+        help="Re-score changed upcoming fixtures into the fixture table (CSV defaults to fixture_table.fixtures_source)",
+    )
+    parser.add_argument(
+        "--preload",
+        action="store_true",
+        help="Load and warm all serving models in parallel before running",
+    )
+    parser.add_argument(
+        "--metrics",
+        action="store_true",
+        help="Print latency histograms and counters (Prometheus text) after the run",
+    )
 
     args = parser.parse_args()
 
     engine = PredictionEngine(args.config)
+    if args.preload and not engine.ready.is_set():
+        preload = engine.preload_models()
+        print(json.dumps(preload, indent=2))
+        if not preload["ready"]:
+            raise SystemExit(1)
 
     if args.info:
         info = engine.get_model_info()
@@ -301,6 +853,26 @@ def main():
         result = engine.predict(args.predict, args.match_id)
         print(json.dumps(result, indent=2))
 
+    elif args.home and args.away:
+        if args.model_id:
+            engine.load_model(args.model_id)
+        result = engine.predict_match(args.home, args.away, args.date)
+        print(json.dumps(result, indent=2))
+
+    elif args.refresh_fixtures is not None:
+        if args.model_id:
+            engine.load_model(args.model_id)
+        source = args.refresh_fixtures or engine.config.get("fixture_table", {}).get("fixtures_source")
+        summary = refresh_fixture_table(engine, pd.read_csv(source))
+        summary.pop("rescored")
+        print(json.dumps(summary, indent=2))
+
+    elif args.batch and args.job_id:
+        if args.model_id:
+            engine.load_model(args.model_id)
+        manifest = BatchScoringJob(engine, args.batch, args.job_id, chunk_size=args.chunk_size).run()
+        print(f"Batch job {args.job_id}: {manifest['rows_committed']} predictions saved to {manifest['output']}")
+
     elif args.batch:
         df = pd.read_csv(args.batch)
         results = engine.batch_predict(df)
@@ -309,7 +881,13 @@ def main():
         print(f"Batch predictions saved to {output_path}")
 
     else:
-        print("Use --info, --predict, or --batch")
+        print("Use --info, --predict, --home/--away, --batch or --refresh-fixtures")
+
+    # Let background challenger predictions finish logging before exit
+    engine.wait_for_shadow()
+
+    if args.metrics:
+        print(engine.metrics.render_prometheus(), end="")
 
 
 if __name__ == "__main__":
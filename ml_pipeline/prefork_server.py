@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""Pre-forked prediction workers that share one copy of the models.
+
+The parent process loads and warms every serving model once, binds the
+listening socket and then forks ``prefork_server.workers`` children. Forked
+children see the parent's memory copy-on-write. Model arrays are only read
+while serving: the node arrays of RandomForest trees, coefficients and
+preprocessor statistics. So the children keep referencing the same physical
+pages, and adding a worker costs its own interpreter state rather than
+another copy of every model. Before forking the parent moves all loaded
+objects into the garbage collector's permanent generation (``gc.freeze``).
+This stops collections in the children from writing to the pages that hold
+them.
+
+Unpickling a model in each worker, or memory-mapping a joblib bundle, would
+not give this: scikit-learn trees copy their node arrays into private memory
+when they are unpickled.
+
+Workers accept connections on the shared socket and answer the same
+JSON-lines requests as the job worker socket (``predict``, ``predict_match``
+and ``stats``). The parent restarts workers that exit unexpectedly. Each
+worker opens its own Supabase connection, and workers append to the shared
+evaluation log under a file lock.
+"""
+
+import argparse
+import gc
+import json
+import logging
+import os
+import signal
+import socket
+import socketserver
+import traceback
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from prediction_engine import PredictionEngine
+
+
+def process_memory(pid: Optional[int] = None) -> Dict[str, int]:
+    """Resident, proportional, shared and private memory of a process in kB (Linux only)."""
+    path = Path(f"/proc/{pid or os.getpid()}/smaps_rollup")
+    if not path.exists():
+        return {}
+    fields: Dict[str, int] = {}
+    for line in path.read_text().splitlines():
+        parts = line.split()
+        if len(parts) == 3 and parts[2] == "kB":
+            fields[parts[0].rstrip(":")] = int(parts[1])
+    return {
+        "rss_kb": fields.get("Rss", 0),
+        "pss_kb": fields.get("Pss", 0),
+        "shared_kb": fields.get("Shared_Clean", 0) + fields.get("Shared_Dirty", 0),
+        "private_kb": fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0),
+    }
+
+
+class PreforkServer:
+    """Load models once in the parent, then fork prediction workers that share them."""
+
+    def __init__(
+        self,
+        config_path: str = "ml_pipeline/model_config.yaml",
+        engine: Optional[PredictionEngine] = None,
+        workers: Optional[int] = None,
+    ):
+        self.engine = engine or PredictionEngine(config_path)
+        self.config = self.engine.config
+        self.logger = self._init_logger()
+
+        server_config = self.config.get("prefork_server", {})
+        self.n_workers = workers or server_config.get("workers", 4)
+        # Worker pid -> slot number
+        self.workers: Dict[int, int] = {}
+        self._socket: Optional[socket.socket] = None
+        self._stopping = False
+
+    def _init_logger(self) -> logging.Logger:
+        """Initialize logger."""
+        logger = logging.getLogger("prefork_server")
+        if not logger.handlers:
+            log_dir = Path(self.config.get("logging", {}).get("log_dir", "ml_pipeline/logs"))
+            log_dir.mkdir(parents=True, exist_ok=True)
+            handler = logging.FileHandler(log_dir / "prefork_server.log")
+            formatter = logging.Formatter(
+                "%(asctime)s - %(process)d - %(name)s - %(levelname)s - %(message)s"
+            )
+            handler.setFormatter(formatter)
+            logger.addHandler(handler)
+            logger.setLevel(logging.INFO)
+        return logger
+
+    @property
+    def address(self) -> Optional[Tuple[str, int]]:
+        """Bound host and port of the shared socket."""
+        return self._socket.getsockname()[:2] if self._socket is not None else None
+
+    def start(self, host: Optional[str] = None, port: Optional[int] = None) -> Tuple[str, int]:
+        """Preload models, bind the shared socket and fork the workers."""
+        if not hasattr(os, "fork"):
+            raise RuntimeError("Pre-forked serving requires os.fork")
+        if not self.engine.ready.is_set():
+            preload = self.engine.preload_models()
+            if not preload["ready"]:
+                raise RuntimeError(f"Models failed to preload: {preload['models']}")
+
+        server_config = self.config.get("prefork_server", {})
+        self._socket = socket.create_server(
+            (host or server_config.get("host", "127.0.0.1"), port if port is not None else server_config.get("port", 9110)),
+            backlog=server_config.get("backlog", 128),
+        )
+
+        # Keep the collector from touching (and so copying) the shared model pages
+        gc.collect()
+        gc.freeze()
+        for slot in range(self.n_workers):
+            self._spawn(slot)
+        self.logger.info(f"Forked {self.n_workers} workers on {self.address}")
+        return self.address
+
+    def _spawn(self, slot: int) -> int:
+        """Fork one worker for a slot."""
+        pid = os.fork()
+        if pid == 0:
+            exit_code = 0
+            try:
+                self._worker_main()
+            except BaseException:
+                traceback.print_exc()
+                exit_code = 1
+            finally:
+                os._exit(exit_code)
+        self.workers[pid] = slot
+        return pid
+
+    def _worker_main(self) -> None:
+        """Serve requests on the inherited socket until terminated."""
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        # Ctrl-C is handled by the parent, which then terminates the workers
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        self.workers = {}
+        self.engine.after_fork()
+        server_ref = self
+
+        class PredictionRequestHandler(socketserver.StreamRequestHandler):
+            def handle(self):
+                for line in self.rfile:
+                    if not line.strip():
+                        continue
+                    try:
+                        response = server_ref.handle_request(json.loads(line))
+                    except json.JSONDecodeError as e:
+                        response = {"ok": False, "error": f"Invalid JSON: {e}"}
+                    self.wfile.write((json.dumps(response, default=str) + "\n").encode())
+
+        server = socketserver.ThreadingTCPServer(self.address, PredictionRequestHandler, bind_and_activate=False)
+        server.socket.close()
+        server.socket = self._socket
+        server.daemon_threads = True
+        server.serve_forever()
+
+    def handle_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Answer one socket request in a worker."""
+        op = request.get("op")
+        try:
+            if op == "predict":
+                return {"ok": True, "result": self.engine.predict(request["features"], request.get("match_id", "socket"))}
+            if op == "predict_match":
+                result = self.engine.predict_match(
+                    request["home_team"],
+                    request["away_team"],
+                    request.get("match_date"),
+                    request.get("match_id"),
+                )
+                return {"ok": True, "result": result}
+            if op == "stats":
+                return {
+                    "ok": True,
+                    "pid": os.getpid(),
+                    "model_id": self.engine.active_model_id,
+                    "memory": process_memory(),
+                    "metrics": self.engine.metrics.snapshot(),
+                }
+            return {"ok": False, "error": f"Unknown op: {op}"}
+        except Exception as e:
+            return {"ok": False, "error": str(e)}
+
+    def memory_report(self) -> Dict[str, Any]:
+        """Memory of the parent and each worker; total PSS counts shared pages once."""
+        processes = {"parent": process_memory()}
+        processes.update({f"worker-{slot}": process_memory(pid) for pid, slot in sorted(self.workers.items())})
+        return {
+            "processes": processes,
+            "total_pss_kb": sum(m.get("pss_kb", 0) for m in processes.values()),
+            "total_rss_kb": sum(m.get("rss_kb", 0) for m in processes.values()),
+        }
+
+    def run_forever(self) -> None:
+        """Wait on the workers, restarting any that exit until ``stop`` is called."""
+        while not self._stopping and self.workers:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            except InterruptedError:
+                continue
+            slot = self.workers.pop(pid, None)
+            if slot is None or self._stopping:
+                continue
+            self.logger.warning(f"Worker {pid} (slot {slot}) exited with status {status}, restarting")
+            self._spawn(slot)
+
+    def stop(self) -> None:
+        """Terminate the workers and close the shared socket."""
+        self._stopping = True
+        for pid in list(self.workers):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        for pid in list(self.workers):
+            try:
+                os.waitpid(pid, 0)
+            except ChildProcessError:
+                pass
+        self.workers = {}
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+        gc.unfreeze()
+        self.logger.info("Pre-fork server stopped")
+
+
+def main():
+    """CLI interface for the pre-fork prediction server."""
+    parser = argparse.ArgumentParser(description="Pre-forked ML Prediction Server")
+    parser.add_argument(
+        "--config",
+        default="ml_pipeline/model_config.yaml",
+        help="Path to model config",
+    )
+    parser.add_argument(
+        "--host",
+        help="Socket host (defaults to prefork_server.host)",
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        help="Socket port (defaults to prefork_server.port)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Number of worker processes (defaults to prefork_server.workers)",
+    )
+
+    args = parser.parse_args()
+
+    server = PreforkServer(args.config, workers=args.workers)
+    host, port = server.start(args.host, args.port)
+    print(f"Prediction server listening on {host}:{port} with {server.n_workers} workers")
+    try:
+        server.run_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
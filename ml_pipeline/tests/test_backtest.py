@@ -0,0 +1,110 @@
+"""Tests for walk-forward backtesting."""
+
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+import yaml
+
+from backtest import _prepare_history, run_backtest, walk_forward
+from train_model import ModelTrainer
+
+
+def make_matches(n_leagues=2, n_teams=8, n_seasons=2, seed=0):
+    """Weekly round-robin results with persistent team quality and bookmaker odds."""
+    rng = np.random.default_rng(seed)
+    rows = []
+    for league in range(n_leagues):
+        quality = rng.normal(0.0, 1.0, n_teams)
+        for season in range(n_seasons):
+            start = pd.Timestamp(f"{2022 + season}-08-01")
+            for week in range(2 * (n_teams - 1)):
+                order = rng.permutation(n_teams)
+                for home, away in zip(order[::2], order[1::2]):
+                    diff = quality[home] - quality[away]
+                    rows.append((
+                        f"L{league}",
+                        start + pd.Timedelta(days=7 * week),
+                        f"L{league}_T{home}",
+                        f"L{league}_T{away}",
+                        rng.poisson(np.exp(0.3 + 0.3 * diff)),
+                        rng.poisson(np.exp(0.05 - 0.3 * diff)),
+                    ))
+    matches = pd.DataFrame(rows, columns=["league", "date", "home_team", "away_team", "home_goals", "away_goals"])
+    implied = rng.dirichlet([4.0, 2.5, 3.0], len(matches))
+    matches[["odds_home", "odds_draw", "odds_away"]] = 0.95 / np.clip(implied, 0.05, 1.0)
+    return matches
+
+
+@pytest.fixture
+def config_path():
+    """Repository config with a small warm-up so short histories produce periods."""
+    with open("ml_pipeline/model_config.yaml", "r") as f:
+        config = yaml.safe_load(f)
+    config["backtest"].update({"min_train_matches": 40, "retrain_frequency": "28D", "n_jobs": 1})
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "model_config.yaml"
+        with open(path, "w") as f:
+            yaml.safe_dump(config, f)
+        yield str(path)
+
+
+class TestWalkForward:
+    """Test cases for walk_forward."""
+
+    def test_trains_only_on_past_matches(self, config_path):
+        """Test that each period is trained on matches before its start and scored after it."""
+        trainer = ModelTrainer(config_path)
+        history = _prepare_history(make_matches(n_leagues=1), trainer.config)
+        periods, predictions = walk_forward(trainer, history, "LogisticRegression", "28D", 40)
+
+        assert periods
+        for period in periods:
+            n_before = int((history["date"] < pd.Timestamp(period["start"])).sum())
+            assert period["n_train"] == n_before
+        assert predictions["date"].min() >= pd.Timestamp(periods[0]["start"])
+        assert sum(p["n_matches"] for p in periods) == len(predictions)
+        np.testing.assert_allclose(predictions[["proba_H", "proba_D", "proba_V"]].sum(axis=1), 1.0)
+
+    def test_rolling_window_limits_training(self, config_path):
+        """Test that a training window caps how far back each model looks."""
+        trainer = ModelTrainer(config_path)
+        history = _prepare_history(make_matches(n_leagues=1), trainer.config)
+        expanding, _ = walk_forward(trainer, history, "LogisticRegression", "28D", 40)
+        rolling, _ = walk_forward(trainer, history, "LogisticRegression", "28D", 40, train_window_days=84)
+
+        assert max(p["n_train"] for p in rolling) < max(p["n_train"] for p in expanding)
+
+
+class TestRunBacktest:
+    """Test cases for run_backtest."""
+
+    def test_report_per_league(self, config_path):
+        """Test per-group periods, P&L and the calibration summary."""
+        report = run_backtest(make_matches(), config_path)
+
+        assert set(report["groups"]) == {"L0", "L1"}
+        summary = report["summary"]
+        assert summary["n_matches"] == sum(g["summary"]["n_matches"] for g in report["groups"].values())
+        assert 0.0 <= summary["accuracy"] <= 1.0
+        assert summary["n_bets"] <= summary["n_matches"]
+        assert "expected_calibration_error" in summary["calibration"]
+        assert summary["by_confidence_band"]
+        for group in report["groups"].values():
+            assert "expected_calibration_error" in group["summary"]["calibration"]
+            band_matches = sum(band["n_evaluated"] for band in group["summary"]["by_confidence_band"].values())
+            assert band_matches == group["summary"]["n_matches"]
+
+    def test_parallel_matches_sequential(self, config_path):
+        """Test that running groups in worker processes does not change results."""
+        matches = make_matches()
+        sequential = run_backtest(matches, config_path, n_jobs=1)
+        parallel = run_backtest(matches, config_path, n_jobs=2)
+
+        for name in sequential["groups"]:
+            seq, par = sequential["groups"][name]["summary"], parallel["groups"][name]["summary"]
+            assert seq.pop("calibration") == par.pop("calibration")
+            assert seq.pop("by_confidence_band") == par.pop("by_confidence_band")
+            assert seq == pytest.approx(par)
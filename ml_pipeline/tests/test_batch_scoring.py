@@ -0,0 +1,112 @@
+"""Tests for checkpointed batch scoring jobs."""
+
+import json
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LogisticRegression
+
+from batch_scoring import BatchScoringJob
+from ml_logging import MLLogger
+from prediction_engine import PredictionEngine
+from utils.preprocessing import FeaturePreprocessor
+
+
+@pytest.fixture
+def scoring():
+    """Engine with a fitted model, a temporary log and a 25-row input CSV."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmp = Path(tmpdir)
+        engine = PredictionEngine(config_path="ml_pipeline/model_config.yaml")
+        engine.ml_logger = MLLogger(log_dir=str(tmp / "logs"))
+        engine.config["batch_scoring"] = {"checkpoint_dir": str(tmp / "jobs"), "chunk_size": 10}
+        features = engine.config["inference"]["input_features"]
+
+        rng = np.random.default_rng(0)
+        X = rng.normal(5.0, 1.5, size=(90, len(features))).astype(np.float32)
+        engine.preprocessor = FeaturePreprocessor()
+        engine.model = LogisticRegression().fit(engine.preprocessor.fit_transform(X.copy()), np.arange(90) % 3)
+        engine.active_model_id = "batch_v1"
+
+        input_path = tmp / "fixtures.csv"
+        pd.DataFrame(X[:25], columns=features).assign(match_id=[f"m{i}" for i in range(25)]).to_csv(input_path, index=False)
+        yield engine, input_path, tmp
+
+
+def logged_predictions(engine):
+    """Champion prediction rows in the evaluation log."""
+    log = pd.read_csv(engine.ml_logger.eval_log_path)
+    return log[log["model_id"] == "batch_v1"]
+
+
+class TestBatchScoringJob:
+    """Test cases for BatchScoringJob."""
+
+    def test_chunks_commit_and_assemble(self, scoring):
+        """Test a clean run commits every chunk and writes the full output."""
+        engine, input_path, tmp = scoring
+        manifest = BatchScoringJob(engine, str(input_path), "job-a").run()
+
+        assert manifest["status"] == "completed"
+        assert [c["rows"] for c in manifest["chunks"]] == [10, 10, 5]
+        output = pd.read_csv(manifest["output"])
+        assert output["match_id"].tolist() == [f"m{i}" for i in range(25)]
+        assert sorted(logged_predictions(engine)["event_id"]) == sorted(output["event_id"])
+
+    def test_resume_after_crash_does_not_double_log(self, scoring, monkeypatch):
+        """Test that a rerun resumes mid-chunk without re-scoring or re-logging."""
+        engine, input_path, tmp = scoring
+        log_prediction = engine.ml_logger.log_prediction
+        calls = {"n": 0}
+
+        def crash_on_fourteenth(**kwargs):
+            calls["n"] += 1
+            if calls["n"] == 14:
+                raise RuntimeError("worker killed")
+            return log_prediction(**kwargs)
+
+        monkeypatch.setattr(engine.ml_logger, "log_prediction", crash_on_fourteenth)
+        with pytest.raises(RuntimeError):
+            BatchScoringJob(engine, str(input_path), "job-b").run()
+
+        manifest = json.loads((tmp / "jobs" / "job-b" / "manifest.json").read_text())
+        assert manifest["rows_committed"] == 10
+        assert manifest["pending"]["index"] == 1
+        assert len(logged_predictions(engine)) == 13
+
+        monkeypatch.setattr(engine.ml_logger, "log_prediction", log_prediction)
+        scored = []
+        batch_predict = engine.batch_predict
+        monkeypatch.setattr(engine, "batch_predict", lambda data, **kw: scored.append(len(data)) or batch_predict(data, **kw))
+        manifest = BatchScoringJob(engine, str(input_path), "job-b").run()
+
+        assert scored == [10, 5]
+        assert manifest["chunks"][1]["previously_logged"] == 3
+        log = logged_predictions(engine)
+        assert len(log) == 25
+        assert log["event_id"].is_unique
+        output = pd.read_csv(manifest["output"])
+        assert len(output) == 25
+        assert set(output["event_id"]) == set(log["event_id"])
+
+    def test_completed_job_is_not_rerun(self, scoring):
+        """Test that rerunning a completed job is a no-op."""
+        engine, input_path, _ = scoring
+        BatchScoringJob(engine, str(input_path), "job-c").run()
+        BatchScoringJob(engine, str(input_path), "job-c").run()
+
+        assert len(logged_predictions(engine)) == 25
+
+    def test_resume_rejects_changed_model(self, scoring):
+        """Test that a job cannot resume under a different active model."""
+        engine, input_path, _ = scoring
+        job = BatchScoringJob(engine, str(input_path), "job-d")
+        job.job_dir.mkdir(parents=True)
+        job._save_manifest()
+
+        engine.active_model_id = "batch_v2"
+        with pytest.raises(ValueError):
+            BatchScoringJob(engine, str(input_path), "job-d")
@@ -0,0 +1,76 @@
+"""Tests for benchmark suites."""
+
+import json
+
+import pytest
+
+from benchmark_serving import compare_to_baseline
+from benchmark_serving import run_benchmark as run_serving_benchmark
+from benchmark_training import run_benchmark
+
+
+class TestTrainingBenchmark:
+    """Test cases for the training benchmark."""
+
+    def test_report_covers_every_stage(self):
+        """Test that each case reports timing and memory for every stage."""
+        report = run_benchmark(
+            sizes=[1000],
+            algorithms=["LogisticRegression", "RandomForest"],
+            max_rows={"RandomForest": 500},
+        )
+
+        completed, skipped = report["results"]
+        assert completed["status"] == "completed"
+        assert set(completed["setup"]) == {"generate"}
+        assert set(completed["stages"]) == {"load", "prepare", "fit", "cv", "save"}
+        for stage in completed["stages"].values():
+            assert stage["wall_seconds"] >= 0
+            assert "traced_peak_bytes" in stage
+        assert completed["max_rss_bytes"] > 0
+        assert skipped == {"algorithm": "RandomForest", "n_rows": 1000, "status": "skipped"}
+        json.dumps(report, sort_keys=True)
+
+
+class TestServingBenchmark:
+    """Test cases for the serving benchmark."""
+
+    def test_report_covers_every_case(self):
+        """Test that each serving case reports latency percentiles and throughput."""
+        report = run_serving_benchmark(
+            batch_sizes=[1, 50],
+            log_sizes=[200],
+            iterations={"predict": 5, "batch_predict": 1, "log_prediction": 10, "log_evaluation": 3},
+        )
+
+        cases = [(r["case"], r["n_rows"]) for r in report["results"]]
+        assert cases == [
+            ("predict", 1),
+            ("batch_predict", 1),
+            ("batch_predict", 50),
+            ("log_prediction", 1),
+            ("log_evaluation", 200),
+        ]
+        for result in report["results"]:
+            assert 0 < result["latency"]["p50_ms"] <= result["latency"]["p99_ms"]
+            assert result["throughput_per_sec"] > 0
+        json.dumps(report, sort_keys=True)
+
+    def test_regression_gate(self):
+        """Test that only regressions beyond the thresholds are reported."""
+        def report(p50, p99, throughput):
+            return {"results": [{
+                "case": "predict",
+                "n_rows": 1,
+                "latency": {"p50_ms": p50, "p99_ms": p99},
+                "throughput_per_sec": throughput,
+            }]}
+
+        baseline = report(1.0, 2.0, 1000.0)
+
+        assert compare_to_baseline(report(1.1, 2.2, 950.0), baseline) == []
+        regressions = compare_to_baseline(report(1.5, 2.1, 700.0), baseline)
+        assert {r["metric"] for r in regressions} == {"p50_ms", "throughput_per_sec"}
+        assert regressions[0]["regression"] == pytest.approx(0.5)
+        # Cases absent from the baseline are not gated
+        assert compare_to_baseline(report(9.0, 9.0, 1.0), {"results": []}) == []
@@ -0,0 +1,124 @@
+"""Tests for data loading utilities."""
+
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.data_loader import DataLoader
+
+AS_OF = datetime(2025, 3, 15, 12, 0)
+
+
+@pytest.fixture
+def log_path():
+    """Write an evaluation log whose timestamps are out of order."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "evaluation_log.csv"
+        days_ago = [1, 10, 2, 3, 20, 0.5, 5, 6]
+        pd.DataFrame({
+            "timestamp": [(AS_OF - timedelta(days=d)).isoformat() for d in days_ago],
+            "event_id": [f"e{i}" for i in range(8)],
+            "model_id": ["m1"] * 8,
+            "prediction": ["H", "H", "D", "V", "H", "H", "D", "H"],
+            "actual_result": ["D", "D", "D", "H", "V", None, "V", "V"],
+            "confidence": [0.9, 0.9, 0.8, 0.75, 0.9, 0.95, 0.6, 0.85],
+            "status": ["evaluated"] * 5 + ["pending"] + ["evaluated"] * 2,
+        }).to_csv(path, index=False)
+        yield path
+
+
+@pytest.fixture
+def loader():
+    """DataLoader with compact dtypes enabled."""
+    return DataLoader({"performance": {"compact_dtypes": True}})
+
+
+class TestEvaluationWindows:
+    """Test cases for timestamp-window queries over the evaluation log."""
+
+    def test_history_is_sorted_and_reused(self, loader, log_path):
+        """Test that the log is sorted once and cached until it changes."""
+        history = loader.load_evaluation_history(str(log_path))
+
+        assert history["timestamp"].is_monotonic_increasing
+        assert loader.load_evaluation_history(str(log_path)) is history
+
+    def test_appended_rows_are_parsed_alone(self, loader, log_path, monkeypatch):
+        """Test that an append parses only the new lines and a rewrite reloads the file."""
+        loader.load_evaluation_history(str(log_path))
+        parsed = []
+        read_csv = loader._read_evaluation_csv
+
+        def recording_read_csv(*args, **kwargs):
+            parsed.append(read_csv(*args, **kwargs))
+            return parsed[-1]
+
+        monkeypatch.setattr(loader, "_read_evaluation_csv", recording_read_csv)
+
+        with open(log_path, "a") as f:
+            f.write(f"{(AS_OF - timedelta(days=4)).isoformat()},e8,m1,H,H,0.7,evaluated\n")
+            f.write(f"{AS_OF.isoformat()},e9,m1,V")
+        history = loader.load_evaluation_history(str(log_path))
+
+        assert [len(df) for df in parsed] == [1]
+        assert history["timestamp"].is_monotonic_increasing
+        assert list(history["event_id"]).index("e8") == 4
+        assert isinstance(history["prediction"].dtype, pd.CategoricalDtype)
+
+        # The partial last line is picked up once it is complete
+        with open(log_path, "a") as f:
+            f.write(",,0.5,pending\n")
+        assert loader.load_evaluation_history(str(log_path))["event_id"].iloc[-1] == "e9"
+        assert [len(df) for df in parsed] == [1, 1]
+
+        frame = pd.read_csv(log_path)
+        frame.loc[frame["event_id"] == "e9", "status"] = "evaluated"
+        frame.to_csv(log_path, index=False)
+        history = loader.load_evaluation_history(str(log_path))
+        assert [len(df) for df in parsed] == [1, 1, 10]
+        assert history.loc[history["event_id"] == "e9", "status"].item() == "evaluated"
+
+    def test_query_window(self, loader, log_path):
+        """Test that a window is a contiguous slice of the sorted history."""
+        window = loader.query_window(AS_OF - timedelta(days=3), AS_OF, str(log_path))
+
+        assert sorted(window["event_id"]) == ["e0", "e2", "e3", "e5"]
+
+    def test_prepare_fine_tuning_data(self, loader, log_path):
+        """Test lookback, confidence and error filtering."""
+        errors, n_errors = loader.prepare_fine_tuning_data(
+            lookback_days=7, min_confidence=0.7, min_samples=1, as_of=AS_OF, log_path=str(log_path)
+        )
+
+        # e1 and e4 are too old, e2 is correct, e5 is unsettled, e6 is low confidence
+        assert n_errors == 3
+        assert sorted(errors["event_id"]) == ["e0", "e3", "e7"]
+
+    def test_insufficient_samples(self, loader, log_path):
+        """Test that too few errors return an empty frame and the count."""
+        errors, n_errors = loader.prepare_fine_tuning_data(
+            lookback_days=2, min_samples=5, as_of=AS_OF, log_path=str(log_path)
+        )
+
+        assert errors.empty
+        assert n_errors == 1
+
+    def test_missing_log(self, loader):
+        """Test that a missing log yields no samples."""
+        errors, n_errors = loader.prepare_fine_tuning_data(log_path="does/not/exist.csv")
+
+        assert errors.empty
+        assert n_errors == 0
+
+    def test_prediction_errors_with_categoricals(self, loader):
+        """Test error extraction when label columns are categoricals with different categories."""
+        df = pd.DataFrame({
+            "prediction": pd.Categorical(["H", "D", "V"]),
+            "actual_result": pd.Categorical(["H", "V", np.nan]),
+        })
+
+        assert loader.get_prediction_errors(df).index.tolist() == [1]
@@ -0,0 +1,102 @@
+"""Tests for the binary dataset cache."""
+
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.data_loader import DataLoader
+from utils.dataset_cache import DatasetCache
+
+FEATURES = ["home_team_form", "away_team_form"]
+TARGET = "fulltime_result"
+
+
+@pytest.fixture
+def temp_dir():
+    """Create temporary directory for cache entries and data files."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield Path(tmpdir)
+
+
+@pytest.fixture
+def data_path(temp_dir):
+    """Write a small training CSV with a missing value."""
+    path = temp_dir / "train.csv"
+    pd.DataFrame({
+        "home_team_form": [7.5, None, 8.2, 5.3],
+        "away_team_form": [6.2, 7.1, 5.5, 6.8],
+        "fulltime_result": [0, 1, 0, 2],
+        "match_id": ["m1", "m2", "m3", "m4"],
+    }).to_csv(path, index=False)
+    return path
+
+
+@pytest.fixture
+def config(temp_dir):
+    """Minimal config with the dataset cache enabled."""
+    return {
+        "inference": {"input_features": FEATURES, "prediction_target": TARGET},
+        "training": {
+            "preprocessing": {"handle_missing": "mean"},
+            "cache": {"enabled": True, "dir": str(temp_dir / "cache")},
+        },
+    }
+
+
+class TestDatasetCache:
+    """Test cases for DatasetCache."""
+
+    def test_store_and_load_memory_mapped(self, temp_dir):
+        """Test that stored arrays come back memory-mapped as float32."""
+        cache = DatasetCache(str(temp_dir / "cache"))
+        X = np.arange(12, dtype=np.float64).reshape(4, 3)
+        y = np.array([0, 1, 2, 0])
+
+        cache.store("abc", X, y)
+        X_cached, y_cached = cache.load("abc")
+
+        assert isinstance(X_cached, np.memmap)
+        assert X_cached.dtype == np.float32
+        np.testing.assert_array_equal(X_cached, X)
+        np.testing.assert_array_equal(y_cached, y)
+
+    def test_load_miss(self, temp_dir):
+        """Test that unknown keys miss."""
+        cache = DatasetCache(str(temp_dir / "cache"))
+        assert cache.load("missing") is None
+
+    def test_key_changes_with_source_and_config(self, temp_dir, data_path):
+        """Test that the key tracks file contents and preprocessing config."""
+        cache = DatasetCache(str(temp_dir / "cache"))
+        key = cache.cache_key(data_path, FEATURES, TARGET, {"handle_missing": "mean"})
+
+        assert key == cache.cache_key(data_path, FEATURES, TARGET, {"handle_missing": "mean"})
+        assert key != cache.cache_key(data_path, FEATURES, TARGET, {"handle_missing": "drop"})
+
+        with open(data_path, "a") as f:
+            f.write("6.0,6.0,1,m5\n")
+        assert key != cache.cache_key(data_path, FEATURES, TARGET, {"handle_missing": "mean"})
+
+
+class TestDataLoaderCache:
+    """Test cases for cached training data loading."""
+
+    def test_second_load_hits_cache(self, config, data_path):
+        """Test that a repeated load is served from the cache."""
+        loader = DataLoader(config)
+        first = loader.load_training_data(str(data_path))
+        # Imputation belongs to the fitted preprocessor, not the loader
+        assert first["home_team_form"].isna().sum() == 1
+
+        entries = list(Path(config["training"]["cache"]["dir"]).iterdir())
+        assert len(entries) == 1
+        assert DatasetCache(config["training"]["cache"]["dir"]).load(entries[0].name) is not None
+
+        second = loader.load_training_data(str(data_path))
+        assert list(first.columns) == list(second.columns) == FEATURES + [TARGET]
+        assert first[TARGET].dtype == second[TARGET].dtype
+        np.testing.assert_allclose(second[FEATURES].values, first[FEATURES].values, rtol=1e-6, equal_nan=True)
+        np.testing.assert_array_equal(second[TARGET].values, first[TARGET].values)
@@ -0,0 +1,118 @@
+"""Tests for compact dtype mode."""
+
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LogisticRegression
+
+from prediction_engine import PredictionEngine
+from utils.data_loader import DataLoader
+from utils.dtypes import compact_training_frame, constant_categorical, outcome_categorical
+from utils.preprocessing import FeaturePreprocessor
+
+FEATURES = ["home_team_form", "away_team_form"]
+TARGET = "fulltime_result"
+
+
+@pytest.fixture
+def temp_dir():
+    """Create temporary directory for data files."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield Path(tmpdir)
+
+
+@pytest.fixture
+def config():
+    """Minimal config with compact dtypes enabled and no cache."""
+    return {
+        "inference": {"input_features": FEATURES, "prediction_target": TARGET},
+        "training": {"preprocessing": {}},
+        "performance": {"compact_dtypes": True},
+    }
+
+
+class TestDtypeHelpers:
+    """Test cases for dtype helpers."""
+
+    def test_compact_training_frame(self):
+        """Test casting features to float32 and the target to int8."""
+        df = pd.DataFrame({"home_team_form": [1.0, 2.0], "away_team_form": [3.0, np.nan], TARGET: [0, 2]})
+        compact = compact_training_frame(df, FEATURES, TARGET)
+
+        assert (compact[FEATURES].dtypes == np.float32).all()
+        assert compact[TARGET].dtype == np.int8
+
+    def test_outcome_categorical(self):
+        """Test decoding outcome codes through the label table."""
+        decoded = outcome_categorical(np.array([0, 2, 1, 0]))
+
+        assert list(decoded) == ["H", "V", "D", "H"]
+        assert decoded.codes.dtype == np.int8
+
+    def test_constant_categorical(self):
+        """Test a repeated single-value categorical."""
+        column = constant_categorical("model_a", 3)
+
+        assert list(column) == ["model_a"] * 3
+        assert list(column.categories) == ["model_a"]
+
+
+class TestCompactLoading:
+    """Test cases for compact data and log loading."""
+
+    def test_training_data(self, config, temp_dir):
+        """Test that training data loads as float32 features and int8 outcomes."""
+        path = temp_dir / "train.csv"
+        pd.DataFrame({
+            "home_team_form": [7.5, None, 8.2],
+            "away_team_form": [6.2, 7.1, 5.5],
+            TARGET: [0, 1, 2],
+        }).to_csv(path, index=False)
+
+        df = DataLoader(config).load_training_data(str(path))
+
+        assert (df[FEATURES].dtypes == np.float32).all()
+        assert df[TARGET].dtype == np.int8
+
+    def test_evaluation_log(self, config, temp_dir):
+        """Test that repeated string columns load as categoricals."""
+        path = temp_dir / "evaluation_log.csv"
+        pd.DataFrame({
+            "event_id": ["e1", "e2"],
+            "model_id": ["m1", "m1"],
+            "prediction": ["H", "D"],
+            "actual_result": ["H", "V"],
+            "confidence": [0.7, 0.6],
+            "status": ["evaluated", "evaluated"],
+        }).to_csv(path, index=False)
+
+        df = DataLoader(config).load_evaluation_log(str(path))
+
+        assert isinstance(df["model_id"].dtype, pd.CategoricalDtype)
+        assert isinstance(df["prediction"].dtype, pd.CategoricalDtype)
+        assert df["confidence"].dtype == np.float32
+
+
+class TestCompactBatchPrediction:
+    """Test cases for compact batch inference output."""
+
+    def test_batch_predict_dtypes(self):
+        """Test categorical prediction and model_id columns and float32 confidence."""
+        engine = PredictionEngine(config_path="ml_pipeline/model_config.yaml")
+        features = engine.config["inference"]["input_features"]
+        rng = np.random.default_rng(0)
+        X = rng.normal(5.0, 1.0, size=(60, len(features))).astype(np.float32)
+        y = np.arange(60) % 3
+
+        engine.preprocessor = FeaturePreprocessor()
+        engine.model = LogisticRegression().fit(engine.preprocessor.fit_transform(X.copy()), y)
+
+        results = engine.batch_predict(pd.DataFrame(X[:5], columns=features))
+
+        assert isinstance(results["prediction"].dtype, pd.CategoricalDtype)
+        assert set(results["prediction"]) <= {"H", "D", "V"}
+        assert isinstance(results["model_id"].dtype, pd.CategoricalDtype)
+        assert results["confidence"].dtype == np.float32
@@ -0,0 +1,101 @@
+"""Tests for evaluation utilities."""
+
+import numpy as np
+import pytest
+
+from utils.evaluation import EvaluationManager, get_evaluation_manager, paired_bootstrap
+
+
+def one_hot_proba(predicted, confidence, n_classes=3):
+    """Probability rows putting ``confidence`` on the predicted class."""
+    proba = np.full((len(predicted), n_classes), (1 - confidence) / (n_classes - 1))
+    proba[np.arange(len(predicted)), predicted] = confidence
+    return proba
+
+
+class TestPairedBootstrap:
+    """Test cases for paired_bootstrap."""
+
+    def test_identical_models(self):
+        """Test that identical scores give a zero difference and p-value 1."""
+        scores = np.random.default_rng(0).random(200)
+        result = paired_bootstrap(scores, scores, n_resamples=500)
+
+        assert result["difference"][0] == 0.0
+        assert result["p_value"][0] == pytest.approx(1.0)
+
+    def test_blocking_does_not_change_result(self):
+        """Test that block size only bounds memory."""
+        rng = np.random.default_rng(1)
+        champion, challenger = rng.random((2, 3, 150))
+        small = paired_bootstrap(champion, challenger, n_resamples=300, max_block_elements=1000)
+        large = paired_bootstrap(champion, challenger, n_resamples=300)
+
+        assert small["difference"].shape == (3,)
+        np.testing.assert_allclose(small["difference"], large["difference"])
+        assert np.all(small["ci_lower"] <= small["difference"])
+        assert np.all(small["difference"] <= small["ci_upper"])
+
+    def test_empty(self):
+        """Test that empty inputs are rejected."""
+        with pytest.raises(ValueError):
+            paired_bootstrap(np.array([]), np.array([]))
+
+
+class TestBootstrapComparison:
+    """Test cases for EvaluationManager.bootstrap_comparison."""
+
+    def test_clearly_better_challenger_wins(self):
+        """Test that a clearly better challenger is significant and promotable."""
+        rng = np.random.default_rng(0)
+        y = rng.integers(0, 3, 1000)
+        champion_pred = np.where(rng.random(1000) < 0.45, y, (y + 1) % 3)
+        challenger_pred = np.where(rng.random(1000) < 0.65, y, (y + 1) % 3)
+
+        manager = EvaluationManager()
+        comparison = manager.bootstrap_comparison(
+            y, one_hot_proba(champion_pred, 0.6), one_hot_proba(challenger_pred, 0.6), n_resamples=2000
+        )
+
+        accuracy = comparison["metrics"]["accuracy"]
+        assert accuracy["difference"] > 0
+        assert accuracy["ci_lower"] > 0
+        assert accuracy["p_value"] < 0.01
+        assert comparison["metrics"]["log_loss"]["difference"] < 0
+        assert comparison["challenger_wins"]
+        assert manager.should_promote_challenger(comparison, min_evaluated=100, current_evaluated=1000)
+
+    def test_small_difference_is_not_significant(self):
+        """Test that a tiny sample cannot promote the challenger."""
+        y = np.array([0, 1, 2, 0, 1, 2, 0, 1])
+        champion = one_hot_proba(np.array([0, 1, 0, 0, 2, 2, 1, 1]), 0.5)
+        challenger = one_hot_proba(np.array([0, 1, 2, 0, 2, 2, 1, 1]), 0.5)
+
+        comparison = EvaluationManager().bootstrap_comparison(y, champion, challenger, n_resamples=1000)
+
+        assert not comparison["metrics"]["accuracy"]["significant"]
+        assert not comparison["challenger_wins"]
+
+    def test_config_defaults(self):
+        """Test that resamples and significance level come from config."""
+        manager = get_evaluation_manager({"champion_challenger": {"bootstrap_resamples": 250, "significance_level": 0.1}})
+        y = np.array([0, 1, 2, 0])
+        proba = one_hot_proba(y, 0.7)
+
+        assert manager.bootstrap_comparison(y, proba, proba)["n_resamples"] == 250
+
+    def test_explicit_zero_overrides_config(self):
+        """Test that an explicit zero is used rather than replaced by the configured default."""
+        manager = get_evaluation_manager({"champion_challenger": {"bootstrap_resamples": 250, "significance_level": 0.1}})
+        rng = np.random.default_rng(0)
+        y = rng.integers(0, 3, 1000)
+        champion = one_hot_proba(np.where(rng.random(1000) < 0.45, y, (y + 1) % 3), 0.6)
+        challenger = one_hot_proba(np.where(rng.random(1000) < 0.65, y, (y + 1) % 3), 0.6)
+
+        # Bootstrap p-values are at least 1 / (n_resamples + 1), so nothing is significant at level 0
+        comparison = manager.bootstrap_comparison(y, champion, challenger, significance_level=0.0)
+        assert not comparison["metrics"]["accuracy"]["significant"]
+        assert not comparison["challenger_wins"]
+
+        with pytest.raises(ValueError):
+            manager.bootstrap_comparison(y, champion, challenger, n_resamples=0)
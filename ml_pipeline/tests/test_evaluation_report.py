@@ -0,0 +1,149 @@
+"""Tests for the offline evaluation report."""
+
+import json
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from evaluation_report import EvaluationReport, build_report
+
+
+@pytest.fixture
+def log_path():
+    """Write a small evaluation log with settled and pending predictions."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "evaluation_log.csv"
+        pd.DataFrame({
+            "event_id": [f"e{i}" for i in range(7)],
+            "model_id": ["m1", "m1", "m1", "m1", "m2", "m2", "m1"],
+            "prediction": ["H", "H", "D", "V", "H", "D", "H"],
+            "actual_result": ["H", "D", "D", "H", "H", "V", None],
+            "confidence": [0.85, 0.70, 0.55, 0.40, 0.90, 0.60, 0.95],
+            "metadata": [
+                json.dumps({"league": "EPL"}),
+                json.dumps({"league": "EPL"}),
+                json.dumps({"league": "LaLiga"}),
+                json.dumps({}),
+                json.dumps({"league": "EPL"}),
+                json.dumps({"league": "EPL"}),
+                json.dumps({"league": "EPL"}),
+            ],
+            "status": ["evaluated"] * 6 + ["pending"],
+        }).to_csv(path, index=False)
+        yield path
+
+
+@pytest.fixture
+def config():
+    """Minimal config with confidence bands."""
+    return {
+        "inference": {"confidence_levels": {"high": 0.80, "medium": 0.65, "low": 0.50}},
+        "evaluation": {"report": {"calibration_bins": 10}},
+    }
+
+
+class TestEvaluationReport:
+    """Test cases for EvaluationReport."""
+
+    def test_chunking_matches_single_pass(self, config, log_path):
+        """Test that chunk size does not change the report."""
+        assert build_report(config, str(log_path), chunk_size=2) == build_report(config, str(log_path), chunk_size=100)
+
+    def test_model_metrics(self, config, log_path):
+        """Test per-model confusion matrix and accuracy over settled rows only."""
+        report = build_report(config, str(log_path), chunk_size=3)
+        m1 = report["models"]["m1"]["overall"]
+
+        assert report["n_evaluated"] == 6
+        assert m1["n_evaluated"] == 4
+        assert m1["accuracy"] == pytest.approx(0.5)
+        # Rows are actual outcomes, columns predictions (H, D, V)
+        assert m1["confusion_matrix"] == [[1, 0, 1], [1, 1, 0], [0, 0, 0]]
+
+    def test_league_and_band_breakdown(self, config, log_path):
+        """Test per-league and per-confidence-band groups."""
+        m1 = build_report(config, str(log_path), chunk_size=2)["models"]["m1"]
+
+        assert set(m1["by_league"]) == {"EPL", "LaLiga", "unknown"}
+        assert m1["by_league"]["EPL"]["n_evaluated"] == 2
+        assert set(m1["by_confidence_band"]) == {"below_low", "low", "medium", "high"}
+        assert m1["by_confidence_band"]["high"]["accuracy"] == pytest.approx(1.0)
+
+    def test_calibration(self):
+        """Test reliability bins, calibration error and confidence AUC."""
+        report = EvaluationReport(calibration_bins=2)
+        report.update(pd.DataFrame({
+            "model_id": ["m"] * 4,
+            "prediction": ["H"] * 4,
+            "actual_result": ["H", "D", "H", "H"],
+            "confidence": [0.2, 0.3, 0.8, 0.9],
+        }))
+        calibration = report.result()["models"]["m"]["overall"]["calibration"]
+
+        assert [b["count"] for b in calibration["bins"]] == [2, 2]
+        assert calibration["bins"][0]["accuracy"] == pytest.approx(0.5)
+        # |0.5 - 0.25| and |1.0 - 0.85|, each over half the rows
+        assert calibration["expected_calibration_error"] == pytest.approx(0.5 * 0.25 + 0.5 * 0.15)
+        assert calibration["confidence_auc"] == pytest.approx((0.5 + 1 + 1) / 3)
+
+    def test_counters_stay_bounded(self):
+        """Test that memory follows the number of groups, not rows."""
+        report = EvaluationReport()
+        rng = np.random.default_rng(0)
+        for _ in range(5):
+            report.update(pd.DataFrame({
+                "model_id": rng.choice(["m1", "m2"], 1000),
+                "prediction": rng.choice(["H", "D", "V"], 1000),
+                "actual_result": rng.choice(["H", "D", "V"], 1000),
+                "confidence": rng.uniform(0.3, 1.0, 1000),
+            }))
+
+        assert report.n_rows == 5000
+        assert len(report.confusion) <= 2 * len(report.band_names)
+
+    def test_leagues_logged_by_the_pipeline(self, config):
+        """Test that leagues logged with predictions survive settling into the report."""
+        from ml_logging import MLLogger
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            logger = MLLogger(log_dir=tmpdir)
+            for league, prediction, actual in (("EPL", "H", "H"), ("EPL", "D", "H"), ("Serie A", "V", "V"), (None, "H", "H")):
+                event_id = logger.log_prediction("m1", "match", prediction, 0.7, league=league)
+                logger.log_evaluation(event_id, actual_result=actual, accuracy=float(prediction == actual))
+
+            by_league = build_report(config, str(logger.eval_log_path))["models"]["m1"]["by_league"]
+
+        assert by_league["EPL"]["n_evaluated"] == 2
+        assert by_league["EPL"]["accuracy"] == pytest.approx(0.5)
+        assert by_league["Serie A"]["n_evaluated"] == 1
+        assert by_league["unknown"]["n_evaluated"] == 1
+
+    def test_older_log_is_migrated(self, config, log_path):
+        """Test that opening a log without a league column adds it and keeps metadata leagues."""
+        from ml_logging import EVAL_LOG_COLUMNS, MLLogger
+
+        before = build_report(config, str(log_path))
+        MLLogger(log_dir=str(log_path.parent))
+
+        assert list(pd.read_csv(log_path, nrows=0).columns) == EVAL_LOG_COLUMNS
+        assert build_report(config, str(log_path)) == before
+
+    def test_interrupted_migration_keeps_log(self, log_path, monkeypatch):
+        """Test that a migration failing part-way leaves the original log untouched."""
+        import csv
+
+        from ml_logging import MLLogger
+
+        original = log_path.read_bytes()
+
+        def fail(self, rows):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(csv.DictWriter, "writerows", fail)
+        with pytest.raises(OSError):
+            MLLogger(log_dir=str(log_path.parent))
+
+        assert log_path.read_bytes() == original
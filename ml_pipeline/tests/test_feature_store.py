@@ -0,0 +1,84 @@
+"""Tests for the team feature store."""
+
+import pandas as pd
+import pytest
+
+from feature_store import TeamFeatureStore
+
+
+@pytest.fixture
+def matches():
+    """Small raw results table."""
+    return pd.DataFrame({
+        "date": pd.to_datetime(["2025-01-04", "2025-01-11", "2025-01-18", "2025-01-25"]),
+        "home_team": ["Alpha", "Beta", "Alpha", "Gamma"],
+        "away_team": ["Beta", "Gamma", "Gamma", "Alpha"],
+        "home_goals": [2, 1, 0, 3],
+        "away_goals": [0, 1, 1, 3],
+    })
+
+
+@pytest.fixture
+def store(matches):
+    """Feature store with a two-match form window."""
+    store = TeamFeatureStore(form_window=2, strength_alpha=0.5, home_alpha=0.5)
+    store.ingest(matches)
+    return store
+
+
+class TestTeamFeatureStore:
+    """Test cases for TeamFeatureStore."""
+
+    def test_unknown_team_is_neutral(self, store):
+        """Test that teams without history get neutral features."""
+        snapshot = store.team_snapshot("Delta")
+
+        assert snapshot["form"] == 5.0
+        assert snapshot["strength"] == 5.0
+        assert snapshot["home_advantage"] == 0.5
+
+    def test_rolling_form_window(self, store):
+        """Test form over the last form_window matches."""
+        # Alpha: W 2-0, L 0-1, D 3-3 -> last two are L, D = 1 point
+        assert store.team_snapshot("Alpha")["form"] == pytest.approx(1 / 2 * 10 / 3)
+        assert store.team_snapshot("Alpha")["goals_for"] == pytest.approx(1.5)
+
+    def test_strength_and_home_ewm(self, store):
+        """Test exponentially weighted strength and home advantage."""
+        alpha = store.team_snapshot("Alpha")
+        # Goal difference EWMA: 2 -> 2 + 0.5 * (-1 - 2) = 0.5 -> 0.5 + 0.5 * (0 - 0.5) = 0.25
+        assert alpha["strength"] == pytest.approx(5.0 + 2.0 * 0.25)
+        # Home points share: 1.0 then 0.0 -> 0.5
+        assert alpha["home_advantage"] == pytest.approx(0.5)
+
+    def test_point_in_time_lookup(self, store):
+        """Test that features only use matches before the requested date."""
+        before_first = store.team_snapshot("Alpha", "2025-01-04")
+        after_first = store.team_snapshot("Alpha", "2025-01-05")
+
+        assert before_first["form"] == 5.0
+        assert after_first["form"] == pytest.approx(10.0)
+
+    def test_get_features_in_config_order(self, store):
+        """Test resolving model inputs for a fixture."""
+        features = store.get_features(
+            "Alpha",
+            "Beta",
+            "2025-01-05",
+            ["away_team_form", "home_team_form", "home_advantage"],
+        )
+
+        assert features == [pytest.approx(0.0), pytest.approx(10.0), pytest.approx(1.0)]
+
+    def test_unresolvable_feature(self, store):
+        """Test that unknown feature names are rejected."""
+        with pytest.raises(ValueError):
+            store.get_features("Alpha", "Beta", input_features=["weather"])
+
+    def test_out_of_order_update_rejected(self, store):
+        """Test that updates older than a team's last match are rejected without side effects."""
+        with pytest.raises(ValueError):
+            store.update("Delta", "Alpha", 1, 0, "2025-01-01")
+
+        assert "Delta" not in store.teams
+        assert store.n_matches == 4
@@ -0,0 +1,187 @@
+"""Tests for the precomputed fixture prediction table."""
+
+import os
+import pickle
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LogisticRegression
+
+from feature_store import TeamFeatureStore
+from fixture_table import FixturePredictionTable, refresh_fixture_table
+from ml_logging import MLLogger
+from prediction_engine import PredictionEngine
+from utils.memory_store import InMemorySupabaseClient
+from utils.preprocessing import FeaturePreprocessor
+
+TEAMS = ["Arsenal", "Chelsea", "Everton", "Fulham", "Leeds", "Wolves"]
+
+
+@pytest.fixture
+def setup():
+    """Engine with a fitted model, a populated feature store and six fixtures."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmp = Path(tmpdir)
+        engine = PredictionEngine(config_path="ml_pipeline/model_config.yaml")
+        engine.ml_logger = MLLogger(log_dir=str(tmp / "logs"))
+        engine.config["fixture_table"] = {"path": str(tmp / "fixtures.pkl"), "serve": True}
+        features = engine.config["inference"]["input_features"]
+
+        rng = np.random.default_rng(0)
+        X = rng.normal(5.0, 1.5, size=(90, len(features))).astype(np.float32)
+        engine.preprocessor = FeaturePreprocessor()
+        engine.model = LogisticRegression().fit(engine.preprocessor.fit_transform(X.copy()), np.arange(90) % 3)
+        engine.active_model_id = "fixtures_v1"
+
+        store = TeamFeatureStore()
+        for i, (home, away) in enumerate(zip(TEAMS, TEAMS[1:] + TEAMS[:1])):
+            store.update(home, away, i % 3, 1, f"2024-01-{i + 1:02d}")
+        engine.feature_store = store
+
+        fixtures = pd.DataFrame({
+            "home_team": TEAMS,
+            "away_team": TEAMS[3:] + TEAMS[:3],
+            "date": ["2024-03-01"] * 6,
+        })
+        yield engine, store, fixtures
+
+
+class TestFixturePredictionTable:
+    """Test cases for FixturePredictionTable."""
+
+    def test_refresh_scores_only_changed_fixtures(self, setup):
+        """Test that unchanged inputs are not re-scored and changed teams are."""
+        engine, store, fixtures = setup
+        table = FixturePredictionTable()
+
+        assert table.refresh(engine, fixtures, store)["n_rescored"] == 6
+        assert table.refresh(engine, fixtures, store)["n_rescored"] == 0
+
+        store.update("Arsenal", "Leeds", 4, 0, "2024-02-01")
+        summary = table.refresh(engine, fixtures, store)
+        involved = fixtures["home_team"].isin(["Arsenal", "Leeds"]) | fixtures["away_team"].isin(["Arsenal", "Leeds"])
+        assert summary["n_rescored"] == int(involved.sum())
+        assert all("Arsenal" in m or "Leeds" in m for m in summary["rescored"])
+
+    def test_lookup_matches_live_prediction(self, setup):
+        """Test that stored rows match scoring the same fixture directly."""
+        engine, store, fixtures = setup
+        table = FixturePredictionTable()
+        table.refresh(engine, fixtures, store)
+
+        row = table.lookup("Arsenal_Fulham_2024-03-01")
+        features = store.get_features("Arsenal", "Fulham", "2024-03-01", engine.config["inference"]["input_features"])
+        live = engine.predict(features, "Arsenal_Fulham_2024-03-01")
+        assert row["prediction"] == live["prediction"]
+        assert row["confidence"] == pytest.approx(live["confidence"], abs=1e-5)
+        assert row["model_id"] == "fixtures_v1"
+        assert table.lookup("unknown") is None
+
+    def test_model_change_and_removed_fixtures(self, setup):
+        """Test that a new model re-scores everything and dropped fixtures leave the table."""
+        engine, store, fixtures = setup
+        table = FixturePredictionTable()
+        table.refresh(engine, fixtures, store)
+
+        engine.active_model_id = "fixtures_v2"
+        summary = table.refresh(engine, fixtures.iloc[:4], store)
+        assert summary["n_rescored"] == 4
+        assert summary["n_removed"] == 2
+        assert len(table) == 4
+        assert set(table.frame["model_id"]) == {"fixtures_v2"}
+
+    def test_refresh_logs_and_upserts_rescored_rows(self, setup):
+        """Test that re-scored rows are logged once, saved and upserted."""
+        engine, store, fixtures = setup
+        engine.ml_logger.supabase = InMemorySupabaseClient()
+
+        summary = refresh_fixture_table(engine, fixtures, store)
+        assert summary["n_upserted"] == 6
+        rows = engine.ml_logger.supabase.tables["fixture_predictions"]
+        assert {row["match_id"] for row in rows} == set(FixturePredictionTable.load(summary["path"]).frame.index)
+
+        assert refresh_fixture_table(engine, fixtures, store)["n_upserted"] == 0
+        log = pd.read_csv(engine.ml_logger.eval_log_path)
+        assert len(log[log["model_id"] == "fixtures_v1"]) == 6
+
+    def test_predict_match_served_from_table(self, setup):
+        """Test that predict_match reads the table while it holds the active model."""
+        engine, store, fixtures = setup
+        refresh_fixture_table(engine, fixtures, store)
+        engine.metrics.reset()
+
+        result = engine.predict_match("Chelsea", "Leeds", "2024-03-01")
+        assert result["source"] == "fixture_table"
+        assert engine.metrics.counters[("cache_hits_total", (("cache", "fixture_table"),))] == 1
+
+        engine.active_model_id = "fixtures_v2"
+        result = engine.predict_match("Chelsea", "Leeds", "2024-03-01")
+        assert "source" not in result
+        assert engine.metrics.counters[("cache_misses_total", (("cache", "fixture_table"),))] == 1
+
+    def test_feature_update_makes_table_stale(self, setup):
+        """Test that predict_match scores live once the feature store moved past the table."""
+        engine, store, fixtures = setup
+        refresh_fixture_table(engine, fixtures, store)
+        assert engine.predict_match("Chelsea", "Leeds", "2024-03-01")["source"] == "fixture_table"
+
+        store.update("Everton", "Wolves", 2, 2, "2024-02-01")
+        assert "source" not in engine.predict_match("Chelsea", "Leeds", "2024-03-01")
+
+        refresh_fixture_table(engine, fixtures, store)
+        assert engine.predict_match("Chelsea", "Leeds", "2024-03-01")["source"] == "fixture_table"
+
+
+@pytest.fixture
+def registry_setup(setup):
+    """The same engine serving a registry model whose artifacts live on disk."""
+    engine, store, fixtures = setup
+    tmp = Path(engine.config["fixture_table"]["path"]).parent
+    artifact_path = tmp / "fixtures_v1.pkl"
+    with open(artifact_path, "wb") as f:
+        pickle.dump(engine.model, f)
+    with open(tmp / "fixtures_v1_preprocessor.pkl", "wb") as f:
+        pickle.dump(engine.preprocessor, f)
+    fixtures.to_csv(tmp / "upcoming.csv", index=False)
+
+    engine.model_registry = {"models": [{
+        "model_id": "fixtures_v1",
+        "algorithm": "LogisticRegression",
+        "artifact_path": str(artifact_path),
+    }]}
+    engine.config["fixture_table"].update({"fixtures_source": str(tmp / "upcoming.csv"), "refresh_on_load": True})
+    engine.config["champion_challenger"]["shadow_scoring"] = False
+    yield engine, store, fixtures, artifact_path
+
+
+class TestFixtureTableInvalidation:
+    """Test cases for keeping the fixture table in step with the loaded model."""
+
+    def test_model_load_refreshes_table(self, registry_setup):
+        """Test that loading a model re-scores the table for it."""
+        engine, _, _, _ = registry_setup
+        assert engine.load_model("fixtures_v1")
+
+        table = FixturePredictionTable.load(engine.config["fixture_table"]["path"])
+        assert len(table) == 6
+        assert set(table.frame["model_fingerprint"]) == {engine.model_fingerprint()}
+        assert engine.predict_match("Arsenal", "Fulham", "2024-03-01")["source"] == "fixture_table"
+
+    def test_replaced_artifact_invalidates_rows(self, registry_setup):
+        """Test that a model retrained under the same id is not served from old rows."""
+        engine, store, fixtures, artifact_path = registry_setup
+        engine.config["fixture_table"]["refresh_on_load"] = False
+        engine.load_model("fixtures_v1")
+        table = FixturePredictionTable()
+        table.refresh(engine, fixtures, store)
+        table.save(engine.config["fixture_table"]["path"])
+
+        stat = artifact_path.stat()
+        os.utime(artifact_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        engine.load_model("fixtures_v1")
+
+        assert "source" not in engine.predict_match("Arsenal", "Fulham", "2024-03-01")
+        assert table.refresh(engine, fixtures, store)["n_rescored"] == 6
@@ -0,0 +1,65 @@
+"""Tests for time-ordered event IDs."""
+
+import multiprocessing
+import os
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from utils.ids import RANDOM_BITS, EventIdGenerator, event_id_datetime, new_event_ids
+
+
+def _child_ids(n):
+    """Generate IDs in a worker process."""
+    return new_event_ids(n)
+
+
+class TestEventIdGenerator:
+    """Test cases for EventIdGenerator."""
+
+    def test_uuid7_format(self):
+        """Test that IDs are valid version 7, RFC variant UUIDs carrying their creation time."""
+        before = datetime.now(timezone.utc)
+        for event_id in EventIdGenerator().new_ids(3):
+            parsed = uuid.UUID(event_id)
+            assert str(parsed) == event_id
+            assert parsed.version == 7
+            assert parsed.variant == uuid.RFC_4122
+            assert abs(event_id_datetime(event_id) - before) < timedelta(seconds=5)
+
+    def test_monotonic_across_calls(self):
+        """Test that bulk and single IDs from one generator strictly increase."""
+        generator = EventIdGenerator()
+        ids = generator.new_ids(10_000) + [generator.new_id() for _ in range(100)] + generator.new_ids(500)
+
+        assert ids == sorted(ids)
+        assert len(set(ids)) == len(ids)
+        assert generator.new_ids(0) == []
+
+    def test_counter_overflow_carries_into_timestamp(self):
+        """Test that exhausting a millisecond's counter keeps IDs ordered."""
+        generator = EventIdGenerator()
+        generator.new_id()
+        generator._last_ms += 10_000
+        generator._last_counter = (1 << 30) - 2
+        ids = generator.new_ids(4)
+
+        assert ids == sorted(ids)
+        assert event_id_datetime(ids[-1]) > event_id_datetime(ids[0])
+
+    def test_seed_and_random_tail_use_separate_bits(self, monkeypatch):
+        """Test that the counter seed does not reuse the random tail's entropy."""
+        # Only the bits the counter seed reads are set
+        monkeypatch.setattr(os, "urandom", lambda n: b"\xff\xff\xff\xf8" + bytes(n - 4))
+        value = uuid.UUID(EventIdGenerator().new_id()).int
+
+        assert value & ((1 << RANDOM_BITS) - 1) == 0
+        counter = (((value >> 64) & 0xFFF) << 18) | ((value >> RANDOM_BITS) & 0x3FFFF)
+        assert counter == (1 << 29) - 1
+
+    def test_unique_across_processes(self):
+        """Test that concurrently generating processes do not collide."""
+        with multiprocessing.get_context("spawn").Pool(2) as pool:
+            batches = pool.map(_child_ids, [20_000, 20_000])
+        ids = batches[0] + batches[1] + new_event_ids(20_000)
+
+        assert len(set(ids)) == len(ids)
@@ -0,0 +1,220 @@
+"""Tests for the persistent job worker."""
+
+import json
+import pickle
+import socket
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LogisticRegression
+
+from job_worker import CANCELLED, COMPLETED, FAILED, QUEUED, RUNNING, JobWorker
+from ml_logging import MLLogger
+from prediction_engine import PredictionEngine
+from train_model import ModelTrainer
+from utils.memory_store import InMemorySupabaseClient
+from utils.preprocessing import FeaturePreprocessor
+
+
+@pytest.fixture
+def worker():
+    """Worker around an engine serving a fitted model from a temporary registry."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmp = Path(tmpdir)
+        engine = PredictionEngine(config_path="ml_pipeline/model_config.yaml")
+        engine.ml_logger = MLLogger(log_dir=str(tmp / "logs"))
+        engine.config["champion_challenger"]["shadow_scoring"] = False
+        features = engine.config["inference"]["input_features"]
+
+        rng = np.random.default_rng(0)
+        X = rng.normal(5.0, 1.5, size=(90, len(features))).astype(np.float32)
+        preprocessor = FeaturePreprocessor()
+        model = LogisticRegression().fit(preprocessor.fit_transform(X.copy()), np.arange(90) % 3)
+        with open(tmp / "worker_v1.pkl", "wb") as f:
+            pickle.dump(model, f)
+        with open(tmp / "worker_v1_preprocessor.pkl", "wb") as f:
+            pickle.dump(preprocessor, f)
+        engine.model_registry = {"models": [{
+            "model_id": "worker_v1",
+            "algorithm": "LogisticRegression",
+            "features": features,
+            "artifact_path": str(tmp / "worker_v1.pkl"),
+        }]}
+        engine.active_model_id = "worker_v1"
+
+        job_worker = JobWorker(engine=engine, client=InMemorySupabaseClient())
+        yield job_worker, X, tmp
+        job_worker.stop()
+
+
+class TestJobWorker:
+    """Test cases for JobWorker."""
+
+    def test_engine_is_warm(self, worker):
+        """Test that the worker loads the model once at start-up."""
+        job_worker, _, _ = worker
+        assert job_worker.engine.model is not None
+        assert job_worker.engine.active_model_id == "worker_v1"
+
+    def test_predict_job(self, worker):
+        """Test a prediction job runs to completion and is mirrored in the jobs table."""
+        job_worker, X, _ = worker
+        job_id = job_worker.submit("predict", {"features": X[0].tolist(), "match_id": "m1"})
+        job = job_worker.wait(job_id, timeout=30)
+
+        assert job["status"] == COMPLETED
+        assert job["result"]["prediction"] in {"H", "D", "V"}
+        row = job_worker.client.table("ml_jobs").select().eq("id", job_id).execute().data[0]
+        assert row["status"] == COMPLETED
+        assert json.loads(row["result"])["match_id"] == "m1"
+
+    def test_batch_predict_job(self, worker):
+        """Test a batch job writes its predictions file."""
+        job_worker, X, tmp = worker
+        features = job_worker.config["inference"]["input_features"]
+        pd.DataFrame(X[:4], columns=features).assign(match_id=["a", "b", "c", "d"]).to_csv(tmp / "batch.csv", index=False)
+
+        job = job_worker.wait(job_worker.submit("batch_predict", {"input": str(tmp / "batch.csv")}), timeout=30)
+
+        assert job["status"] == COMPLETED
+        assert job["result"]["n_predictions"] == 4
+        assert len(pd.read_csv(job["result"]["output"])) == 4
+
+    def test_failed_job(self, worker):
+        """Test that job errors are recorded rather than raised."""
+        job_worker, _, _ = worker
+        job = job_worker.wait(job_worker.submit("predict", {"features": [1.0]}), timeout=30)
+
+        assert job["status"] == FAILED
+        assert job["error"]
+
+    def test_unknown_job_type(self, worker):
+        """Test that unknown job types are rejected."""
+        job_worker, _, _ = worker
+        with pytest.raises(ValueError):
+            job_worker.submit("deploy")
+
+    def test_cancel_queued_training_job(self, worker):
+        """Test that a training job waiting for a process slot can be cancelled."""
+        job_worker, _, _ = worker
+        job_worker._training_slots.acquire()
+        try:
+            job_id = job_worker.submit("train", {"algorithm": "LogisticRegression"})
+            assert job_worker.status(job_id)["status"] == QUEUED
+            assert job_worker.cancel(job_id)
+        finally:
+            job_worker._training_slots.release()
+
+        assert job_worker.wait(job_id, timeout=30)["status"] == CANCELLED
+        assert not job_worker.cancel(job_id)
+
+    def test_poll_queue_table(self, worker):
+        """Test that jobs inserted into the table by other producers are claimed once."""
+        job_worker, X, _ = worker
+        job_worker.client.table("ml_jobs").insert({
+            "id": "external-1",
+            "job_type": "predict",
+            "params": json.dumps({"features": X[1].tolist(), "match_id": "m2"}),
+            "status": QUEUED,
+        }).execute()
+
+        assert job_worker.poll_queue() == ["external-1"]
+        assert job_worker.wait("external-1", timeout=30)["status"] == COMPLETED
+        assert job_worker.poll_queue() == []
+
+    def test_socket_protocol(self, worker):
+        """Test submit and status requests over the local socket."""
+        job_worker, X, _ = worker
+        server = job_worker.serve(port=0)
+
+        with socket.create_connection(server.server_address, timeout=10) as conn:
+            stream = conn.makefile("rw")
+
+            def request(payload):
+                stream.write(json.dumps(payload) + "\n")
+                stream.flush()
+                return json.loads(stream.readline())
+
+            submitted = request({"op": "submit", "job_type": "predict", "params": {"features": X[2].tolist()}})
+            assert submitted["ok"]
+            job_worker.wait(submitted["job_id"], timeout=30)
+            status = request({"op": "status", "job_id": submitted["job_id"]})
+            assert status["job"]["status"] == COMPLETED
+            assert request({"op": "nope"})["ok"] is False
+
+    def test_finished_jobs_are_pruned(self, worker):
+        """Test that finished jobs beyond the cap leave memory but stay readable."""
+        job_worker, X, _ = worker
+        job_worker.max_finished_jobs = 2
+        job_ids = [job_worker.submit("predict", {"features": X[i].tolist()}) for i in range(4)]
+        for job_id in job_ids:
+            job_worker.wait(job_id, timeout=30)
+        # A job is still running when it finishes, so it is pruned on a later pass
+        job_worker._prune_finished()
+
+        assert len(job_worker.jobs) == 2
+        assert set(job_worker._futures) <= set(job_worker.jobs)
+        pruned = next(job_id for job_id in job_ids if job_id not in job_worker.jobs)
+        job = job_worker.status(pruned)
+        assert job["status"] == COMPLETED
+        assert job["result"]["prediction"] in {"H", "D", "V"}
+
+        job_worker.finished_job_ttl = 0
+        job_worker._prune_finished()
+        assert job_worker.jobs == {}
+
+
+@pytest.fixture
+def training_worker(worker, monkeypatch):
+    """Worker whose training jobs write to the temporary registry directory."""
+    job_worker, X, tmp = worker
+    data_path = tmp / "train.csv"
+    ModelTrainer(config_path="ml_pipeline/model_config.yaml")._generate_synthetic_data(n_samples=300).to_csv(
+        data_path, index=False
+    )
+    registry = job_worker.engine.model_registry
+    monkeypatch.setattr(job_worker.engine, "_load_model_registry", lambda: registry)
+    params = {"streaming": True, "data": str(data_path), "models_dir": str(tmp)}
+    yield job_worker, params
+
+
+class TestTrainingJobs:
+    """Test cases for training jobs run in child processes."""
+
+    def test_training_job_reloads_active_model(self, training_worker):
+        """Test claim, child process, result and reload of the retrained active model."""
+        job_worker, params = training_worker
+        engine = job_worker.engine
+        assert isinstance(engine.model, LogisticRegression)
+
+        job = job_worker.wait(job_worker.submit("train", {**params, "model_id": "worker_v1"}), timeout=120)
+
+        assert job["status"] == COMPLETED, job["error"]
+        assert job["result"]["dataset_size"] == 300
+        assert type(engine.model).__name__ == "SGDClassifier"
+        assert engine.active_model_id == "worker_v1"
+
+    def test_training_jobs_respect_process_limit(self, training_worker):
+        """Test that a second training job waits for the single process slot."""
+        job_worker, params = training_worker
+        assert job_worker.max_training_jobs == 1
+        job_ids = [job_worker.submit("train", {**params, "model_id": f"limit_v{i}"}) for i in range(2)]
+
+        max_processes = 0
+        waited = False
+        deadline = time.monotonic() + 120
+        while time.monotonic() < deadline:
+            statuses = [job_worker.status(job_id)["status"] for job_id in job_ids]
+            max_processes = max(max_processes, len(job_worker._processes))
+            waited = waited or (RUNNING in statuses and QUEUED in statuses)
+            if all(status == COMPLETED for status in statuses):
+                break
+            time.sleep(0.05)
+
+        assert all(job_worker.status(job_id)["status"] == COMPLETED for job_id in job_ids)
+        assert max_processes == 1
+        assert waited
@@ -1,6 +1,8 @@
 """Tests for ML logging module."""
 
+import csv
 import json
+import os
 import tempfile
 import uuid
 from pathlib import Path
@@ -8,6 +10,7 @@ from pathlib import Path
 import pytest
 
 from ml_logging import MLLogger
+from utils.evaluation import EvaluationManager
 
 
 @pytest.fixture
@@ -82,6 +85,67 @@ class TestMLLogger:
             content = f.read()
             assert "evaluated" in content
 
+    def test_log_evaluation_keeps_prediction_metadata(self, logger):
+        """Test that settling merges into the metadata logged with the prediction."""
+        event_id = logger.log_prediction(
+            model_id="test_model_v1",
+            match_id="match_001",
+            prediction="H",
+            confidence=0.85,
+            metadata={"proba": [0.85, 0.1, 0.05]},
+        )
+        logger.log_evaluation(event_id, actual_result="D", accuracy=0.0, metadata={"evaluated_at": "2025-01-02"})
+
+        with open(logger.eval_log_path, "r") as f:
+            row = next(csv.DictReader(f))
+        assert json.loads(row["metadata"]) == {"proba": [0.85, 0.1, 0.05], "evaluated_at": "2025-01-02"}
+        assert row["actual_result"] == "D"
+
+    def test_log_evaluation_feeds_accuracy_monitor(self, temp_log_dir):
+        """Test that settling a logged prediction updates the rolling accuracy monitor."""
+        manager = EvaluationManager()
+        logger = MLLogger(log_dir=temp_log_dir, evaluation_manager=manager)
+        hit = logger.log_prediction(model_id="m1", match_id="a", prediction="H", confidence=0.6, league="EPL")
+        miss = logger.log_prediction(model_id="m1", match_id="b", prediction="V", confidence=0.6, league="EPL")
+
+        logger.log_evaluation(hit, actual_result="H", accuracy=1.0)
+        logger.log_evaluation(miss, actual_result="D", accuracy=0.0)
+        logger.log_evaluation("unknown-event", actual_result="D", accuracy=0.0)
+
+        state = manager.monitor.state("m1", "EPL")
+        assert state["long_samples"] == 2
+        assert state["long_accuracy"] == 0.5
+
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+    def test_forked_writers_do_not_lose_rows(self, logger):
+        """Test that a forked process settling rows does not drop the parent's appends."""
+        event_ids = [
+            logger.log_prediction(model_id="test_model_v1", match_id=f"match_{i}", prediction="H", confidence=0.5)
+            for i in range(20)
+        ]
+        pid = os.fork()
+        if pid == 0:
+            exit_code = 0
+            try:
+                logger.after_fork()
+                for event_id in event_ids:
+                    logger.log_evaluation(event_id, actual_result="H", accuracy=1.0)
+            except BaseException:
+                exit_code = 1
+            finally:
+                os._exit(exit_code)
+        new_ids = [
+            logger.log_prediction(model_id="test_model_v1", match_id=f"match_new_{i}", prediction="D", confidence=0.5)
+            for i in range(20)
+        ]
+        _, status = os.waitpid(pid, 0)
+        assert status == 0
+
+        with open(logger.eval_log_path, "r") as f:
+            rows = {row["event_id"]: row for row in csv.DictReader(f)}
+        assert set(rows) == set(event_ids) | set(new_ids)
+        assert all(rows[event_id]["status"] == "evaluated" for event_id in event_ids)
+
     def test_log_training_event(self, logger):
         """Test logging a training event."""
         run_id = str(uuid.uuid4())
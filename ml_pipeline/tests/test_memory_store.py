@@ -0,0 +1,50 @@
+"""Tests for the in-memory Supabase stand-in."""
+
+from utils.memory_store import InMemorySupabaseClient
+
+
+class TestInMemorySupabaseClient:
+    """Test cases for InMemorySupabaseClient."""
+
+    def test_insert_update_select(self):
+        """Test the insert/update/select calls MLLogger makes."""
+        client = InMemorySupabaseClient()
+        client.table("evaluation_log").insert({"event_id": "e1", "status": "pending"}).execute()
+        client.table("evaluation_log").insert({"event_id": "e2", "status": "pending"}).execute()
+        client.table("evaluation_log").update({"status": "evaluated"}).eq("event_id", "e2").execute()
+
+        pending = client.table("evaluation_log").select("*").eq("status", "pending").execute().data
+        assert [row["event_id"] for row in pending] == ["e1"]
+        assert client.calls == 4
+
+    def test_upsert_on_conflict(self):
+        """Test that upserts update existing keys and insert new ones."""
+        client = InMemorySupabaseClient()
+        client.table("fixtures").upsert([{"match_id": "m1", "p": 0.4}], on_conflict="match_id").execute()
+        client.table("fixtures").upsert(
+            [{"match_id": "m1", "p": 0.6}, {"match_id": "m2", "p": 0.5}], on_conflict="match_id"
+        ).execute()
+
+        rows = client.table("fixtures").select().execute().data
+        assert rows == [{"match_id": "m1", "p": 0.6}, {"match_id": "m2", "p": 0.5}]
+
+    def test_match_id_is_not_a_key(self):
+        """Test that rows sharing a match_id are all matched and none are overwritten."""
+        client = InMemorySupabaseClient()
+        client.table("evaluation_log").insert([
+            {"event_id": "e1", "match_id": "m1", "model_id": "champion"},
+            {"event_id": "e2", "match_id": "m1", "model_id": "challenger"},
+        ]).execute()
+        client.table("evaluation_log").upsert({"event_id": "e3", "match_id": "m1", "model_id": "champion"}).execute()
+
+        rows = client.table("evaluation_log").select("*").eq("match_id", "m1").execute().data
+        assert [row["event_id"] for row in rows] == ["e1", "e2", "e3"]
+
+    def test_delete(self):
+        """Test deleting rows by key."""
+        client = InMemorySupabaseClient()
+        client.table("jobs").insert([{"id": 1}, {"id": 2}]).execute()
+        client.table("jobs").delete().eq("id", 1).execute()
+
+        assert client.table("jobs").select().eq("id", 2).execute().data == [{"id": 2}]
+        assert client.table("jobs").select().eq("id", 1).execute().data == []
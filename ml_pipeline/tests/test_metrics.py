@@ -0,0 +1,92 @@
+"""Tests for in-process metrics."""
+
+import json
+import urllib.request
+
+import pytest
+
+from utils.metrics import LatencyHistogram, MetricsRegistry, serve_metrics
+
+
+class TestLatencyHistogram:
+    """Test cases for LatencyHistogram."""
+
+    def test_quantiles_from_buckets(self):
+        """Test that quantile estimates fall inside the observed bucket."""
+        histogram = LatencyHistogram(bounds=(0.001, 0.01, 0.1))
+        for _ in range(98):
+            histogram.observe(0.0005)
+        histogram.observe(0.05)
+        histogram.observe(0.08)
+
+        assert histogram.count == 100
+        assert histogram.counts == [98, 0, 2, 0]
+        assert 0.0 < histogram.quantile(0.5) <= 0.001
+        assert 0.01 < histogram.quantile(0.99) <= 0.08
+        assert histogram.summary()["max_ms"] == pytest.approx(80.0)
+
+    def test_empty(self):
+        """Test that an empty histogram has no quantiles."""
+        assert LatencyHistogram().quantile(0.99) is None
+
+
+class TestMetricsRegistry:
+    """Test cases for MetricsRegistry."""
+
+    def test_timer_counters_and_gauges(self):
+        """Test recording stage latencies, counters and gauges."""
+        registry = MetricsRegistry()
+        with registry.timer("stage_latency_seconds", {"stage": "inference"}):
+            pass
+        with pytest.raises(RuntimeError):
+            with registry.timer("stage_latency_seconds", {"stage": "inference"}):
+                raise RuntimeError("boom")
+        registry.inc("predictions_total", 3, {"mode": "batch"})
+        registry.inc("predictions_total", 2, {"mode": "batch"})
+        registry.set_gauge("shadow_queue_depth", 4)
+
+        snapshot = registry.snapshot()
+        assert snapshot["latency"][0]["labels"] == {"stage": "inference"}
+        assert snapshot["latency"][0]["count"] == 2
+        assert snapshot["counters"] == [{"name": "predictions_total", "labels": {"mode": "batch"}, "value": 5}]
+        assert snapshot["gauges"][0]["value"] == 4
+        json.dumps(snapshot)
+
+    def test_prometheus_text(self):
+        """Test the Prometheus exposition format."""
+        registry = MetricsRegistry(buckets=(0.01, 0.1))
+        registry.observe("stage_latency_seconds", 0.05, {"stage": "csv_log"})
+        registry.inc("predictions_total", labels={"model_id": 'a"b'})
+
+        text = registry.render_prometheus()
+        assert "# TYPE ml_pipeline_predictions_total counter" in text
+        assert 'ml_pipeline_predictions_total{model_id="a\\"b"} 1' in text
+        assert "# TYPE ml_pipeline_stage_latency_seconds histogram" in text
+        assert 'ml_pipeline_stage_latency_seconds_bucket{stage="csv_log",le="0.01"} 0' in text
+        assert 'ml_pipeline_stage_latency_seconds_bucket{stage="csv_log",le="0.1"} 1' in text
+        assert 'ml_pipeline_stage_latency_seconds_bucket{stage="csv_log",le="+Inf"} 1' in text
+        assert 'ml_pipeline_stage_latency_seconds_count{stage="csv_log"} 1' in text
+
+    def test_disabled_registry_records_nothing(self):
+        """Test that a disabled registry is a no-op."""
+        registry = MetricsRegistry(enabled=False)
+        with registry.timer("stage_latency_seconds"):
+            pass
+        registry.inc("predictions_total")
+
+        assert registry.snapshot() == {"latency": [], "counters": [], "gauges": []}
+
+    def test_http_endpoint(self):
+        """Test serving metrics over HTTP."""
+        registry = MetricsRegistry()
+        registry.inc("predictions_total")
+        server = serve_metrics(registry, port=0)
+        try:
+            base = f"http://127.0.0.1:{server.server_port}"
+            with urllib.request.urlopen(f"{base}/metrics") as response:
+                assert "ml_pipeline_predictions_total 1" in response.read().decode()
+            with urllib.request.urlopen(f"{base}/metrics.json") as response:
+                assert json.loads(response.read())["counters"][0]["value"] == 1
+        finally:
+            server.shutdown()
+            server.server_close()
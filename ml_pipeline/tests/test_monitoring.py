@@ -0,0 +1,97 @@
+"""Tests for live accuracy monitoring."""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from utils.evaluation import EvaluationManager
+from utils.monitoring import RollingAccuracyMonitor
+
+START = datetime(2025, 3, 1, 15, 0)
+
+
+def feed(monitor, day, n_correct, n_wrong, league="EPL", model_id="model_a"):
+    """Record a day's worth of settled predictions."""
+    timestamp = START + timedelta(days=day)
+    for i in range(n_correct + n_wrong):
+        monitor.update(model_id, i < n_correct, league, timestamp)
+
+
+class TestRollingAccuracyMonitor:
+    """Test cases for RollingAccuracyMonitor."""
+
+    def test_rolling_windows(self):
+        """Test short and long window accuracy over daily buckets."""
+        monitor = RollingAccuracyMonitor(short_window_days=3, long_window_days=7, min_samples=1)
+        for day in range(4):
+            feed(monitor, day, 8, 2)
+        for day in range(4, 7):
+            feed(monitor, day, 5, 5)
+
+        state = monitor.state("model_a", "EPL")
+        assert state["short_samples"] == 30
+        assert state["short_accuracy"] == pytest.approx(0.5)
+        assert state["long_accuracy"] == pytest.approx((32 + 15) / 70)
+        assert state["drop"] == pytest.approx(1 - 0.5 / (47 / 70))
+
+    def test_old_days_expire(self):
+        """Test that buckets outside the long window stop counting."""
+        monitor = RollingAccuracyMonitor(short_window_days=1, long_window_days=2, min_samples=1)
+        feed(monitor, 0, 10, 0)
+        feed(monitor, 5, 0, 10)
+
+        state = monitor.state("model_a")
+        assert state["long_samples"] == 10
+        assert state["long_accuracy"] == 0.0
+        assert len(monitor.buckets[("model_a", "all")].days) == 2
+
+    def test_alert_per_league(self):
+        """Test that a drop in one league alerts without affecting another."""
+        monitor = RollingAccuracyMonitor(drop_threshold=0.2, min_samples=10)
+        for day in range(7):
+            feed(monitor, day, 7, 3, league="EPL")
+            if day < 4:
+                feed(monitor, day, 7, 3, league="LaLiga")
+            else:
+                feed(monitor, day, 3, 7, league="LaLiga")
+
+        alerts = {(s["model_id"], s["league"]) for s in monitor.active_alerts()}
+        assert ("model_a", "LaLiga") in alerts
+        assert ("model_a", "EPL") not in alerts
+        assert not monitor.state("model_a", "EPL")["alert"]
+
+    def test_min_samples_suppresses_alert(self):
+        """Test that sparse short windows never alert."""
+        monitor = RollingAccuracyMonitor(min_samples=50)
+        feed(monitor, 0, 10, 0)
+        feed(monitor, 6, 0, 5)
+
+        assert monitor.state("model_a", "EPL")["drop"] == pytest.approx(1.0)
+        assert monitor.active_alerts() == []
+
+    def test_invalid_windows(self):
+        """Test that the short window must fit inside the long window."""
+        with pytest.raises(ValueError):
+            RollingAccuracyMonitor(short_window_days=8, long_window_days=7)
+
+
+class TestEvaluationManagerMonitoring:
+    """Test cases for feeding evaluations through EvaluationManager."""
+
+    def test_record_evaluation(self):
+        """Test that settled evaluations update the monitor."""
+        manager = EvaluationManager()
+        manager.record_evaluation("model_a", "H", "H", league="EPL", timestamp=START)
+        state = manager.record_evaluation("model_a", "H", "D", league="EPL", timestamp=START)
+
+        assert state["league"] == "EPL"
+        assert state["long_accuracy"] == pytest.approx(0.5)
+
+    def test_metrics_history_is_bounded(self):
+        """Test that recorded metrics keep only the most recent entries."""
+        manager = EvaluationManager(max_history=3)
+        for i in range(5):
+            manager.record_metrics("model_a", {"accuracy": i / 10}, dataset_size=100)
+
+        assert len(manager.metrics_history) == 3
+        assert manager.metrics_history[0]["metrics"]["accuracy"] == pytest.approx(0.2)
@@ -111,3 +111,285 @@ class TestPredictionEngineIntegration:
         assert model_info["status"] in ["active", "candidate", "experimental"]
         assert "metrics" in model_info
         assert "accuracy" in model_info["metrics"]
+
+
+@pytest.fixture
+def shadow_engine():
+    """Engine with fitted champion and challenger artifacts in a temporary registry."""
+    import pickle
+
+    import numpy as np
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.linear_model import LogisticRegression
+
+    from ml_logging import MLLogger
+    from utils.preprocessing import FeaturePreprocessor
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmp = Path(tmpdir)
+        engine = PredictionEngine(config_path="ml_pipeline/model_config.yaml")
+        engine.ml_logger = MLLogger(log_dir=str(tmp / "logs"), evaluation_manager=engine.evaluation_manager)
+        features = engine.config["inference"]["input_features"]
+
+        rng = np.random.default_rng(0)
+        X = rng.normal(5.0, 1.5, size=(90, len(features))).astype(np.float32)
+        y = np.arange(90) % 3
+        preprocessor = FeaturePreprocessor()
+        X_scaled = preprocessor.fit_transform(X.copy())
+
+        models = []
+        for model_id, model in (
+            ("champion_v1", LogisticRegression().fit(X_scaled, y)),
+            ("challenger_v1", RandomForestClassifier(n_estimators=10, random_state=0).fit(X_scaled, y)),
+        ):
+            with open(tmp / f"{model_id}.pkl", "wb") as f:
+                pickle.dump(model, f)
+            with open(tmp / f"{model_id}_preprocessor.pkl", "wb") as f:
+                pickle.dump(preprocessor, f)
+            models.append({
+                "model_id": model_id,
+                "algorithm": type(model).__name__,
+                "features": features,
+                "artifact_path": str(tmp / f"{model_id}.pkl"),
+            })
+
+        engine.model_registry = {"models": models, "challenger_model_id": "challenger_v1"}
+        engine.active_model_id = "champion_v1"
+        yield engine, X
+        engine.disable_shadow()
+
+
+class TestShadowScoring:
+    """Test cases for background challenger scoring."""
+
+    def test_shadow_enabled_on_load(self, shadow_engine):
+        """Test that loading the champion also loads the registry challenger."""
+        engine, _ = shadow_engine
+        assert engine.load_model("champion_v1")
+        assert engine.shadow_model_id == "challenger_v1"
+
+    def test_shadow_disabled_for_different_features(self, shadow_engine):
+        """Test that a challenger with other inputs is not shadow-scored."""
+        engine, _ = shadow_engine
+        engine.model_registry["models"][1]["features"] = ["home_team_form"]
+        engine.load_model("champion_v1")
+
+        assert engine.shadow_model is None
+
+    def test_batch_shadow_predictions_are_linked(self, shadow_engine):
+        """Test that challenger predictions are logged against the champion events."""
+        import pandas as pd
+
+        from utils.evaluation import EvaluationManager
+
+        engine, X = shadow_engine
+        engine.load_model("champion_v1")
+        data = pd.DataFrame(X[:6], columns=engine.config["inference"]["input_features"])
+        data["match_id"] = [f"m{i}" for i in range(6)]
+
+        results = engine.batch_predict(data)
+        engine.predict(X[6].tolist(), match_id="m6")
+        engine.wait_for_shadow()
+
+        log = pd.read_csv(engine.ml_logger.eval_log_path)
+        shadow = log[log["model_id"] == "challenger_v1"]
+        assert len(log[log["model_id"] == "champion_v1"]) == 7
+        assert len(shadow) == 7
+        linked = {json.loads(m)["champion_event_id"] for m in shadow["metadata"]}
+        assert set(results["event_id"]) <= linked
+
+        # Settle the champion events and pair them with the shadow predictions
+        for event_id in log.loc[log["model_id"] == "champion_v1", "event_id"]:
+            engine.evaluate_prediction(event_id, "H")
+        log = pd.read_csv(engine.ml_logger.eval_log_path)
+        y_true, champion, challenger = EvaluationManager().paired_outcomes(log, "champion_v1", "challenger_v1")
+
+        assert y_true.tolist() == [0] * 7
+        assert champion.shape == challenger.shape == (7, 3)
+
+    def test_settled_predictions_feed_accuracy_monitor(self, shadow_engine):
+        """Test that evaluate_prediction updates the rolling accuracy per model and league."""
+        engine, X = shadow_engine
+        engine.config["champion_challenger"]["shadow_scoring"] = False
+        engine.load_model("champion_v1")
+        monitor = engine.evaluation_manager.monitor
+
+        result = engine.predict(X[0].tolist(), match_id="m0", league="EPL")
+        assert monitor.state("champion_v1")["long_samples"] == 0
+
+        engine.evaluate_prediction(result["event_id"], result["prediction"])
+        second = engine.predict(X[1].tolist(), match_id="m1", league="EPL")
+        wrong = next(label for label in ("H", "D", "V") if label != second["prediction"])
+        engine.evaluate_prediction(second["event_id"], wrong)
+
+        state = monitor.state("champion_v1", "EPL")
+        assert state["long_samples"] == 2
+        assert state["long_accuracy"] == 0.5
+        assert monitor.state("champion_v1")["long_samples"] == 2
+
+
+class TestPredictionMetrics:
+    """Test cases for prediction-path instrumentation."""
+
+    def test_stage_latencies_and_counters(self, shadow_engine):
+        """Test that predictions record per-stage latencies and counters."""
+        import pandas as pd
+
+        from utils.metrics import MetricsRegistry
+
+        engine, X = shadow_engine
+        engine.metrics = engine.ml_logger.metrics = MetricsRegistry()
+        features = engine.config["inference"]["input_features"]
+
+        engine.predict(X[0].tolist(), "m0")
+        engine.batch_predict(pd.DataFrame(X[:5], columns=features).assign(match_id=[f"m{i}" for i in range(5)]))
+        engine.wait_for_shadow()
+
+        snapshot = engine.metrics.snapshot()
+        stages = {entry["labels"]["stage"]: entry["count"] for entry in snapshot["latency"]}
+        assert stages["model_load"] == 2
+        assert stages["preprocess"] == 2
+        assert stages["inference"] == 2
+        assert stages["decode"] == 2
+        assert stages["csv_log"] == 12
+        counters = {(c["name"], c["labels"].get("mode")): c["value"] for c in snapshot["counters"]}
+        assert counters[("predictions_total", "single")] == 1
+        assert counters[("predictions_total", "batch")] == 5
+        assert "ml_pipeline_shadow_queue_depth 0" in engine.metrics.render_prometheus()
+
+
+class TestBatchResultAssembly:
+    """Test cases for batch_predict output assembly."""
+
+    def test_results_share_input_columns(self, shadow_engine):
+        """Test that input columns are not copied and the input frame is left unchanged."""
+        import numpy as np
+        import pandas as pd
+
+        engine, X = shadow_engine
+        engine.disable_shadow()
+        engine.load_model("champion_v1")
+        features = engine.config["inference"]["input_features"]
+        data = pd.DataFrame(X[:8], columns=features)
+        data["match_id"] = [f"m{i}" for i in range(8)]
+        before = data.copy()
+
+        results = engine.batch_predict(data)
+
+        pd.testing.assert_frame_equal(data, before)
+        assert np.shares_memory(results[features[0]].to_numpy(), data[features[0]].to_numpy())
+        assert results["match_id"].tolist() == data["match_id"].tolist()
+
+        X_scaled = engine.preprocessor.transform(X[:8].copy())
+        probas = engine.model.predict_proba(X_scaled)
+        np.testing.assert_allclose(results["confidence"], probas.max(axis=1), rtol=1e-6)
+        expected = np.array(["H", "D", "V"])[engine.model.predict(X_scaled)]
+        assert np.asarray(results["prediction"]).tolist() == expected.tolist()
+
+    def test_decode_predictions_lookup(self, shadow_engine):
+        """Test label-table decoding for compact and object outputs."""
+        import numpy as np
+        import pandas as pd
+
+        engine, _ = shadow_engine
+        codes = np.array([0, 2, 1, 7])
+
+        engine.compact_dtypes = True
+        decoded = engine._decode_predictions(codes)
+        assert isinstance(decoded, pd.Categorical)
+        assert list(decoded) == ["H", "V", "D", "D"]
+
+        engine.compact_dtypes = False
+        assert engine._decode_predictions(codes).tolist() == ["H", "V", "D", "D"]
+        assert engine._decode_predictions(np.array(["H", "V"])).tolist() == ["H", "V"]
+
+
+class TestModelPreloading:
+    """Test cases for eager model loading and warm-up."""
+
+    def test_preload_warms_serving_models(self, shadow_engine):
+        """Test that champion and challenger are loaded, warmed and served from memory."""
+        engine, X = shadow_engine
+        engine.model_registry["models"].append({
+            "model_id": "retired_v0",
+            "algorithm": "LogisticRegression",
+            "status": "archived",
+            "artifact_path": "missing.pkl",
+        })
+
+        assert engine.preload_model_ids() == ["champion_v1", "challenger_v1"]
+        result = engine.preload_models()
+
+        assert result["ready"]
+        assert engine.ready.is_set()
+        assert set(result["models"]) == {"champion_v1", "challenger_v1"}
+        assert engine.model is engine.warm_models["champion_v1"][0]
+        assert engine.shadow_model is engine.warm_models["challenger_v1"][0]
+        assert engine.predict(X[0].tolist(), "m0")["model_id"] == "champion_v1"
+
+    def test_not_ready_when_a_model_fails_warm_up(self, shadow_engine):
+        """Test that readiness waits for every model, including failing ones."""
+        engine, _ = shadow_engine
+        engine.model_registry["models"].append({
+            "model_id": "member_v1",
+            "algorithm": "LogisticRegression",
+            "status": "active",
+            "artifact_path": "missing.pkl",
+        })
+
+        result = engine.preload_models()
+
+        assert not result["ready"]
+        assert not engine.ready.is_set()
+        assert result["models"]["member_v1"].startswith("failed")
+        assert result["models"]["champion_v1"] == "ready"
+
+
+class TestLegacyArtifacts:
+    """Test cases for models saved before the fitted preprocessor existed."""
+
+    def test_legacy_scaler_is_applied(self, shadow_engine):
+        """Test that a model saved with a bare StandardScaler is served on scaled inputs."""
+        import pickle
+
+        import numpy as np
+        from sklearn.linear_model import LogisticRegression
+        from sklearn.preprocessing import StandardScaler
+
+        engine, X = shadow_engine
+        engine.config["champion_challenger"]["shadow_scoring"] = False
+        tmp = Path(engine.model_registry["models"][0]["artifact_path"]).parent
+        scaler = StandardScaler().fit(X)
+        model = LogisticRegression().fit(scaler.transform(X), np.arange(len(X)) % 3)
+        with open(tmp / "legacy_v1.pkl", "wb") as f:
+            pickle.dump(model, f)
+        with open(tmp / "legacy_v1_scaler.pkl", "wb") as f:
+            pickle.dump(scaler, f)
+        engine.model_registry["models"].append({
+            "model_id": "legacy_v1",
+            "algorithm": "LogisticRegression",
+            "artifact_path": str(tmp / "legacy_v1.pkl"),
+        })
+
+        assert engine.load_model("legacy_v1")
+        result = engine.predict(X[0].tolist(), match_id="m0")
+        expected = model.predict_proba(scaler.transform(X[:1]))[0]
+        assert result["confidence"] == pytest.approx(expected.max(), abs=1e-4)
+
+    def test_model_without_preprocessor_is_refused(self, shadow_engine):
+        """Test that a trained model with no saved preprocessing is not served on raw inputs."""
+        import shutil
+
+        engine, _ = shadow_engine
+        engine.config["champion_challenger"]["shadow_scoring"] = False
+        assert engine.load_model("champion_v1")
+        tmp = Path(engine.model_registry["models"][0]["artifact_path"]).parent
+        shutil.copy(tmp / "challenger_v1.pkl", tmp / "bare_v1.pkl")
+        engine.model_registry["models"].append({
+            "model_id": "bare_v1",
+            "algorithm": "RandomForest",
+            "artifact_path": str(tmp / "bare_v1.pkl"),
+        })
+
+        assert not engine.load_model("bare_v1")
+        assert engine.active_model_id == "champion_v1"
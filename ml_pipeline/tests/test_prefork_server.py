@@ -0,0 +1,97 @@
+"""Tests for the pre-forked prediction server."""
+
+import json
+import os
+import pickle
+import socket
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+
+from ml_logging import MLLogger
+from prediction_engine import PredictionEngine
+from prefork_server import PreforkServer, process_memory
+from utils.preprocessing import FeaturePreprocessor
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+
+
+@pytest.fixture
+def server():
+    """Pre-fork server over a RandomForest large enough to show page sharing."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmp = Path(tmpdir)
+        engine = PredictionEngine(config_path="ml_pipeline/model_config.yaml")
+        engine.ml_logger = MLLogger(log_dir=str(tmp / "logs"))
+        engine.config["ensemble"]["enabled"] = False
+        features = engine.config["inference"]["input_features"]
+
+        rng = np.random.default_rng(0)
+        X = rng.normal(size=(10000, len(features))).astype(np.float32)
+        preprocessor = FeaturePreprocessor()
+        model = RandomForestClassifier(n_estimators=40, random_state=0).fit(
+            preprocessor.fit_transform(X.copy()), rng.integers(0, 3, len(X))
+        )
+        with open(tmp / "forest_v1.pkl", "wb") as f:
+            pickle.dump(model, f)
+        with open(tmp / "forest_v1_preprocessor.pkl", "wb") as f:
+            pickle.dump(preprocessor, f)
+        engine.model_registry = {"models": [{
+            "model_id": "forest_v1",
+            "algorithm": "RandomForest",
+            "features": features,
+            "artifact_path": str(tmp / "forest_v1.pkl"),
+        }]}
+        engine.active_model_id = "forest_v1"
+
+        prefork = PreforkServer(engine=engine, workers=2)
+        prefork.start(port=0)
+        yield prefork, X, (tmp / "forest_v1.pkl").stat().st_size
+        prefork.stop()
+
+
+def request(address, *payloads):
+    """Send JSON-lines requests on one connection and return the responses."""
+    with socket.create_connection(address, timeout=30) as conn:
+        stream = conn.makefile("rw")
+        responses = []
+        for payload in payloads:
+            stream.write(json.dumps(payload) + "\n")
+            stream.flush()
+            responses.append(json.loads(stream.readline()))
+        return responses
+
+
+class TestPreforkServer:
+    """Test cases for PreforkServer."""
+
+    def test_workers_serve_predictions_from_shared_models(self, server):
+        """Test that forked workers predict without private copies of the model."""
+        prefork, X, model_bytes = server
+        prediction, stats = request(
+            prefork.address,
+            {"op": "predict", "features": X[0].tolist(), "match_id": "m0"},
+            {"op": "stats"},
+        )
+
+        assert prediction["ok"]
+        assert prediction["result"]["model_id"] == "forest_v1"
+        assert stats["pid"] in prefork.workers
+        # Each worker counts only its own requests
+        assert [c["value"] for c in stats["metrics"]["counters"] if c["name"] == "predictions_total"] == [1]
+        if stats["memory"]:
+            assert stats["memory"]["private_kb"] * 1024 < model_bytes
+
+    def test_unknown_op_and_memory_report(self, server):
+        """Test error responses and the per-process memory report."""
+        prefork, _, _ = server
+        (response,) = request(prefork.address, {"op": "train"})
+        assert not response["ok"]
+
+        report = prefork.memory_report()
+        assert set(report["processes"]) == {"parent", "worker-0", "worker-1"}
+        if process_memory():
+            assert report["total_pss_kb"] < report["total_rss_kb"]
@@ -0,0 +1,75 @@
+"""Tests for the fitted feature preprocessor."""
+
+import numpy as np
+import pytest
+
+from utils.preprocessing import FeaturePreprocessor
+
+
+@pytest.fixture
+def X():
+    """Feature matrix with a missing value and an outlier."""
+    rng = np.random.default_rng(0)
+    X = rng.normal(5.0, 1.0, size=(200, 3))
+    X[0, 0] = np.nan
+    X[1, 1] = 100.0
+    return X
+
+
+class TestFeaturePreprocessor:
+    """Test cases for FeaturePreprocessor."""
+
+    def test_matches_reference_pipeline(self, X):
+        """Test the fused transform against a step-by-step impute, clip and scale."""
+        preprocessor = FeaturePreprocessor().fit(X)
+
+        X32 = X.astype(np.float32)
+        fill = np.nanmean(X32, axis=0)
+        q1, q3 = np.nanpercentile(X32, [25, 75], axis=0)
+        expected = np.where(np.isnan(X32), fill, X32)
+        expected = np.clip(expected, q1 - 1.5 * (q3 - q1), q3 + 1.5 * (q3 - q1))
+        expected = (expected - expected.mean(axis=0)) / expected.std(axis=0)
+
+        np.testing.assert_allclose(preprocessor.transform(X), expected, atol=1e-4)
+
+    def test_fit_transform_equals_transform(self, X):
+        """Test that training and serving produce identical features."""
+        preprocessor = FeaturePreprocessor()
+        trained = preprocessor.fit_transform(X.astype(np.float32))
+
+        np.testing.assert_allclose(preprocessor.transform(X), trained, atol=1e-5)
+
+    def test_transform_in_place(self, X):
+        """Test that copy=False reuses a float32 buffer."""
+        preprocessor = FeaturePreprocessor().fit(X)
+        buffer = X.astype(np.float32)
+
+        out = preprocessor.transform(buffer, copy=False)
+
+        assert out is buffer
+        assert out.dtype == np.float32
+        assert not np.isnan(out).any()
+
+    def test_serving_does_not_refit(self, X):
+        """Test that a single row is transformed with the training statistics."""
+        preprocessor = FeaturePreprocessor().fit(X)
+        row = preprocessor.transform([5.0, 5.0, 5.0])
+
+        assert row.shape == (1, 3)
+        assert np.abs(row).max() < 1.0
+
+    def test_unsupported_option(self):
+        """Test that unknown config values are rejected."""
+        with pytest.raises(ValueError):
+            FeaturePreprocessor(scaling="MinMaxScaler")
+
+    def test_wraps_legacy_scaler(self, X):
+        """Test that a legacy StandardScaler transforms as before and imputes its means."""
+        from sklearn.preprocessing import StandardScaler
+
+        complete = np.nan_to_num(X, nan=5.0)
+        scaler = StandardScaler().fit(complete)
+        preprocessor = FeaturePreprocessor.from_scaler(scaler)
+
+        np.testing.assert_allclose(preprocessor.transform(complete), scaler.transform(complete), atol=1e-4)
+        np.testing.assert_allclose(preprocessor.transform([np.nan, 5.0, 5.0])[0, 0], 0.0, atol=1e-6)
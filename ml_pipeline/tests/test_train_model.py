@@ -1,6 +1,8 @@
 """Tests for model training."""
 
 import json
+from pathlib import Path
+
 import numpy as np
 import pandas as pd
 import pytest
@@ -112,6 +114,19 @@ class TestModelTrainer:
         assert "algorithm" in result
         assert result["algorithm"] == trainer.config["training"]["algorithm"]
 
+    def test_training_pipeline_stage_instrumentation(self, trainer, tmp_path):
+        """Test per-stage timings and the optional pstats dump."""
+        trainer.config["training"]["instrumentation"] = {"profile_dir": str(tmp_path)}
+        result = trainer.run_training_pipeline(profile=True)
+
+        assert list(result["stages"]) == ["load_data", "prepare_data", "fit", "evaluate", "save_model"]
+        for stage in result["stages"].values():
+            assert stage["wall_seconds"] >= 0
+            assert stage["cpu_seconds"] >= 0
+            assert stage["max_rss_bytes"] > 0
+        assert Path(result["profile_path"]).exists()
+        assert trainer.profiler is None
+
 
 class TestModelTrainerIntegration:
     """Integration tests for ModelTrainer."""
@@ -139,3 +154,108 @@ class TestModelTrainerIntegration:
         # Check if cross-validation metrics are present
         if trainer.config["evaluation"]["cross_validation"]["enabled"]:
             assert "cv_mean" in metrics or True  # Optional
+
+    def test_cross_validation_out_of_fold_metrics(self, trainer):
+        """Test that metrics come from stratified out-of-fold predictions."""
+        df = trainer._generate_synthetic_data(n_samples=300)
+        target = trainer.config["inference"]["prediction_target"]
+        # Shuffled labels carry no signal, so only in-sample scoring could approach 1.0
+        df[target] = np.random.default_rng(0).permutation(df[target].to_numpy())
+        X, y, scaler = trainer.prepare_data(df)
+        model, metrics = trainer.train(X, y, algorithm="RandomForest")
+
+        n_folds = trainer.config["evaluation"]["cross_validation"]["n_folds"]
+        assert len(metrics["cv_fold_seconds"]) == n_folds
+        assert model.score(X, y) > 0.9
+        assert metrics["accuracy"] < 0.6
+
+
+class TestFineTuning:
+    """Test cases for incremental fine-tuning."""
+
+    @pytest.mark.parametrize("algorithm", ["SGDClassifier", "RandomForest", "LogisticRegression"])
+    def test_fine_tune_creates_new_model(self, trainer, algorithm, tmp_path):
+        """Test fine-tuning a saved model on new synthetic matches."""
+        trainer.models_dir = tmp_path
+        base = trainer.run_training_pipeline(algorithm=algorithm, model_id=f"test_{algorithm.lower()}_base")
+        new_data = trainer._generate_synthetic_data(n_samples=60)
+
+        result = trainer.fine_tune(new_data, base_model_id=base["model_id"])
+
+        assert result["status"] == "completed"
+        assert result["base_model_id"] == base["model_id"]
+        assert result["model_id"] != base["model_id"]
+        assert "base_accuracy" in result["metrics"]
+        # Both models are scored on the most recent 20% that the update did not see
+        assert result["metrics"]["holdout_size"] == 12
+
+        model, scaler = trainer.load_model_bundle(result["model_id"])
+        assert len(model.predict(scaler.transform(new_data[trainer.config["inference"]["input_features"]].values))) == 60
+
+        # Only the forest's tree count may differ from the base model's hyperparameters
+        base_model, _ = trainer.load_model_bundle(base["model_id"])
+        base_params, tuned_params = base_model.get_params(), model.get_params()
+        base_params.pop("n_estimators", None)
+        tuned_params.pop("n_estimators", None)
+        assert tuned_params == base_params
+
+    def test_fine_tune_skips_small_batches(self, trainer):
+        """Test that fine-tuning is skipped below min_error_samples."""
+        new_data = trainer._generate_synthetic_data(n_samples=3)
+        result = trainer.fine_tune(new_data, base_model_id="unused")
+
+        assert result["status"] == "skipped"
+
+
+class TestStreamingTraining:
+    """Test cases for out-of-core training."""
+
+    def test_streaming_matches_in_memory_preprocessor(self, trainer, tmp_path):
+        """Test chunked training fits the same preprocessor as a full in-memory pass."""
+        df = trainer._generate_synthetic_data(n_samples=2000)
+        data_path = tmp_path / "train.csv"
+        df.to_csv(data_path, index=False)
+
+        model, preprocessor, metrics, n_rows = trainer.train_streaming(str(data_path), chunk_size=300, n_passes=2)
+
+        _, _, full_preprocessor = trainer.prepare_data(df)
+        assert n_rows == 2000
+        np.testing.assert_allclose(preprocessor.mean_, full_preprocessor.mean_, rtol=1e-4)
+        np.testing.assert_allclose(preprocessor.scale_, full_preprocessor.scale_, rtol=1e-4)
+        assert metrics["holdout_size"] == 200
+        assert 0 <= metrics["accuracy"] <= 1.0
+        assert "log_loss" in metrics
+
+    def test_streaming_pipeline(self, trainer, tmp_path):
+        """Test the streaming pipeline saves a loadable model."""
+        trainer.models_dir = tmp_path
+        data_path = tmp_path / "train.csv"
+        trainer._generate_synthetic_data(n_samples=500).to_csv(data_path, index=False)
+
+        result = trainer.run_streaming_pipeline(str(data_path), model_id="test_streaming_v1")
+
+        assert result["algorithm"] == "SGDClassifier"
+        assert result["dataset_size"] == 500
+        model, scaler = trainer.load_model_bundle("test_streaming_v1")
+        assert hasattr(model, "partial_fit")
+
+
+class TestSyntheticData:
+    """Test cases for the synthetic data generator."""
+
+    def test_class_balance_and_correlation(self, trainer):
+        """Test realistic outcome balance and correlated team features."""
+        df = trainer._generate_synthetic_data(n_samples=20000, random_state=7)
+        shares = df["fulltime_result"].value_counts(normalize=True)
+
+        assert shares[0] > shares[1]
+        assert shares[0] > shares[2]
+        assert 0.2 < shares[1] < 0.35
+        assert df["home_team_form"].corr(df["home_team_strength"]) > 0.5
+        assert abs(df["home_team_form"].corr(df["away_team_strength"])) < 0.05
+
+    def test_seeded_generation_is_reproducible(self, trainer):
+        """Test that the same seed yields the same dataset."""
+        first = trainer._generate_synthetic_data(n_samples=50, random_state=1)
+        second = trainer._generate_synthetic_data(n_samples=50, random_state=1)
+        pd.testing.assert_frame_equal(first, second)
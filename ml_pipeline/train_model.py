@@ -3,7 +3,9 @@ import argparse
 import json
 import logging
 import pickle
+import time
 import uuid
+from contextlib import nullcontext
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, Optional, Tuple
@@ -11,13 +13,44 @@ from typing import Any, Dict, Optional, Tuple
 import numpy as np
 import pandas as pd
 import yaml
-from sklearn.linear_model import LogisticRegression
+from joblib import Parallel, delayed
+from sklearn.base import clone
+from sklearn.linear_model import LogisticRegression, SGDClassifier
 from sklearn.ensemble import RandomForestClassifier
-from sklearn.model_selection import train_test_split, cross_val_score
-from sklearn.preprocessing import StandardScaler
-from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score, roc_auc_score
+from sklearn.model_selection import KFold, StratifiedKFold, train_test_split
+from sklearn.metrics import (
+    accuracy_score,
+    confusion_matrix,
+    f1_score,
+    log_loss,
+    precision_score,
+    recall_score,
+    roc_auc_score,
+)
 
 from ml_logging import MLLogger
+from utils.data_loader import DataLoader
+from utils.dtypes import compact_enabled, feature_dtypes
+from utils.evaluation import metrics_from_confusion
+from utils.preprocessing import FeaturePreprocessor
+from utils.profiling import StageProfiler
+
+
+def _fit_and_predict_fold(
+    model: Any,
+    X: np.ndarray,
+    y: np.ndarray,
+    train_idx: np.ndarray,
+    test_idx: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray, Optional[np.ndarray], Optional[np.ndarray], float]:
+    """Fit a fresh clone on one fold and predict its held-out rows."""
+    start = time.perf_counter()
+    fold_model = clone(model)
+    fold_model.fit(X[train_idx], y[train_idx])
+    y_pred = fold_model.predict(X[test_idx])
+    proba = fold_model.predict_proba(X[test_idx]) if hasattr(fold_model, "predict_proba") else None
+    classes = getattr(fold_model, "classes_", None)
+    return test_idx, y_pred, proba, classes, time.perf_counter() - start
 
 
 class ModelTrainer:
@@ -29,6 +62,8 @@ class ModelTrainer:
         self.logger = self._init_logger()
         self.ml_logger = MLLogger()
         self.run_id = str(uuid.uuid4())
+        self.models_dir = Path("ml_pipeline/models")
+        self.profiler: Optional[StageProfiler] = None
 
     def _load_config(self) -> Dict[str, Any]:
         """Load model configuration from YAML."""
@@ -55,6 +90,10 @@ class ModelTrainer:
             logger.setLevel(logging.INFO)
         return logger
 
+    def _span(self, name: str):
+        """Profile a stage when a profiler is attached to this run."""
+        return self.profiler.span(name) if self.profiler else nullcontext()
+
     def load_data(self) -> Tuple[pd.DataFrame, Optional[pd.DataFrame]]:
         """Load training data."""
         try:
@@ -65,127 +104,227 @@ class ModelTrainer:
                 self.logger.warning(f"Data source not found: {data_source}, generating synthetic data")
                 return self._generate_synthetic_data(), None
 
-            df = pd.read_csv(data_path)
+            # Parsing, imputation and the binary dataset cache live in DataLoader
+            df = DataLoader(self.config, self.logger).load_training_data(data_source)
             self.logger.info(f"Loaded data from {data_source}: {df.shape}")
 
-            # Handle missing values
-            missing_handling = self.config["training"]["preprocessing"]["handle_missing"]
-            if missing_handling == "mean":
-                df = df.fillna(df.mean(numeric_only=True))
-
             return df, None
         except Exception as e:
             self.logger.error(f"Error loading data: {e}")
             raise
 
-    def _generate_synthetic_data(self, n_samples: int = 500) -> pd.DataFrame:
-        """Generate synthetic training data for development."""
-        np.random.seed(42)
+    def _generate_synthetic_data(self, n_samples: int = 500, random_state: int = 42) -> pd.DataFrame:
+        """Generate synthetic training data for development and benchmarks.
+
+        Each match draws a latent home and away team quality. Features prefixed
+        ``home_``/``away_`` load on that side's quality, so they are correlated
+        the way real form and strength ratings are, and the outcome follows an
+        ordered-logit model with a home edge, giving roughly 46% home wins,
+        27% draws and 27% away wins.
+        """
+        rng = np.random.default_rng(random_state)
         input_features = self.config["inference"]["input_features"]
         target = self.config["inference"]["prediction_target"]
 
+        home_quality = rng.standard_normal(n_samples)
+        away_quality = rng.standard_normal(n_samples)
+
         data = {}
         for feat in input_features:
-            data[feat] = np.random.uniform(0, 10, n_samples)
+            noise = rng.standard_normal(n_samples)
+            if feat.startswith("home_") and feat != "home_advantage":
+                latent = 0.8 * home_quality + 0.6 * noise
+            elif feat.startswith("away_"):
+                latent = 0.8 * away_quality + 0.6 * noise
+            else:
+                latent = noise
+            data[feat] = np.clip(5.0 + 1.5 * latent, 0.0, 10.0)
 
         # Generate synthetic target (0=Home, 1=Draw, 2=Away)
-        data[target] = np.random.randint(0, 3, n_samples)
-        data["match_id"] = [f"match_{i:04d}" for i in range(n_samples)]
+        margin = home_quality - away_quality + 0.3 + rng.logistic(0.0, 1.0, n_samples)
+        data[target] = np.where(margin > 0.55, 0, np.where(margin < -1.0, 2, 1))
+        data["match_id"] = np.char.add("match_", np.char.zfill(np.arange(n_samples).astype(str), 4))
 
-        self.logger.info(f"Generated synthetic data: {len(data[target])} samples")
+        self.logger.info(f"Generated synthetic data: {n_samples} samples")
         return pd.DataFrame(data)
 
     def prepare_data(
         self,
         df: pd.DataFrame,
-    ) -> Tuple[np.ndarray, np.ndarray, StandardScaler]:
+    ) -> Tuple[np.ndarray, np.ndarray, FeaturePreprocessor]:
         """Prepare data for training."""
         try:
             input_features = self.config["inference"]["input_features"]
             target = self.config["inference"]["prediction_target"]
 
-            X = df[input_features].values
-            y = df[target].values
+            # One float32 copy of the features; imputation, clipping and scaling run in place on it
+            X = df[input_features].to_numpy(dtype=np.float32, copy=True)
+            y = df[target].to_numpy()
+            if compact_enabled(self.config):
+                y = y.astype(np.int8, copy=False)
 
-            # Apply scaling
-            scaler = StandardScaler()
-            X = scaler.fit_transform(X)
+            preprocessor = FeaturePreprocessor.from_config(self.config)
+            X = preprocessor.fit_transform(X)
 
             self.logger.info(f"Data prepared: X shape {X.shape}, y shape {y.shape}")
-            return X, y, scaler
+            return X, y, preprocessor
         except Exception as e:
             self.logger.error(f"Error preparing data: {e}")
             raise
 
+    def build_model(self, algorithm: str, n_samples: int) -> Any:
+        """Create an unfitted estimator for an algorithm from config hyperparameters."""
+        hyperparams = self.config["training"]["hyperparameters"]
+
+        if algorithm == "LogisticRegression":
+            model = LogisticRegression(
+                max_iter=hyperparams.get("max_iterations", 1000),
+                penalty=hyperparams.get("regularization", "l2"),
+                C=1.0 / hyperparams.get("penalty", 1.0),
+                random_state=42,
+            )
+        elif algorithm == "RandomForest":
+            model = RandomForestClassifier(
+                n_estimators=hyperparams.get("n_estimators", 100),
+                max_depth=hyperparams.get("max_depth", 10),
+                min_samples_split=hyperparams.get("min_samples_split", 5),
+                random_state=42,
+            )
+        elif algorithm == "SGDClassifier":
+            model = SGDClassifier(
+                loss="log_loss",
+                alpha=hyperparams.get("penalty", 1.0) / n_samples,
+                max_iter=hyperparams.get("max_iterations", 1000),
+                random_state=42,
+            )
+        else:
+            raise ValueError(f"Unknown algorithm: {algorithm}")
+
+        return model
+
     def train(
         self,
         X: np.ndarray,
         y: np.ndarray,
         algorithm: Optional[str] = None,
-    ) -> Tuple[Any, Dict[str, float]]:
+    ) -> Tuple[Any, Dict[str, Any]]:
         """Train model."""
         try:
             algorithm = algorithm or self.config["training"]["algorithm"]
-            hyperparams = self.config["training"]["hyperparameters"]
-
-            if algorithm == "LogisticRegression":
-                model = LogisticRegression(
-                    learning_rate=hyperparams.get("learning_rate", 0.01),
-                    max_iter=hyperparams.get("max_iterations", 1000),
-                    penalty=hyperparams.get("regularization", "l2"),
-                    C=1.0 / hyperparams.get("penalty", 1.0),
-                    random_state=42,
-                )
-            elif algorithm == "RandomForest":
-                model = RandomForestClassifier(
-                    n_estimators=hyperparams.get("n_estimators", 100),
-                    max_depth=hyperparams.get("max_depth", 10),
-                    min_samples_split=hyperparams.get("min_samples_split", 5),
-                    random_state=42,
-                )
-            else:
-                raise ValueError(f"Unknown algorithm: {algorithm}")
+            model = self.build_model(algorithm, n_samples=len(y))
 
             # Train model
-            model.fit(X, y)
+            with self._span("fit"):
+                model.fit(X, y)
             self.logger.info(f"Trained {algorithm} model")
 
             # Evaluate
-            metrics = self._evaluate_model(model, X, y)
+            with self._span("evaluate"):
+                metrics = self._evaluate_model(model, X, y)
             return model, metrics
         except Exception as e:
             self.logger.error(f"Error training model: {e}")
             raise
 
-    def _evaluate_model(self, model: Any, X: np.ndarray, y: np.ndarray) -> Dict[str, float]:
-        """Evaluate model performance."""
+    def _cross_validate(
+        self,
+        model: Any,
+        X: np.ndarray,
+        y: np.ndarray,
+    ) -> Optional[Dict[str, Any]]:
+        """Run cross-validation folds in parallel and collect out-of-fold predictions."""
+        cv_config = self.config["evaluation"]["cross_validation"]
+        n_folds = cv_config.get("n_folds", 5)
+        random_state = self.config["training"].get("random_state", 42)
+
+        if cv_config.get("stratified", False):
+            _, class_counts = np.unique(y, return_counts=True)
+            n_splits = min(n_folds, int(class_counts.min()))
+            splitter = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=random_state)
+        else:
+            n_splits = min(n_folds, len(y))
+            splitter = KFold(n_splits=n_splits, shuffle=True, random_state=random_state)
+
+        if n_splits < 2:
+            self.logger.warning(f"Not enough samples per class for {n_folds}-fold cross-validation")
+            return None
+
+        folds = Parallel(n_jobs=cv_config.get("n_jobs", -1))(
+            delayed(_fit_and_predict_fold)(model, X, y, train_idx, test_idx)
+            for train_idx, test_idx in splitter.split(X, y)
+        )
+
+        classes = np.unique(y)
+        y_pred = np.empty_like(y)
+        proba = np.zeros((len(y), len(classes))) if hasattr(model, "predict_proba") else None
+        fold_scores = []
+        fold_seconds = []
+        for test_idx, fold_pred, fold_proba, fold_classes, seconds in folds:
+            y_pred[test_idx] = fold_pred
+            if proba is not None and fold_proba is not None:
+                # A fold may not see every class; place its columns by label.
+                proba[np.ix_(test_idx, np.searchsorted(classes, fold_classes))] = fold_proba
+            fold_scores.append(accuracy_score(y[test_idx], fold_pred))
+            fold_seconds.append(seconds)
+
+        self.logger.info(
+            f"Cross-validated {n_splits} folds in parallel: "
+            f"{', '.join(f'{t:.3f}s' for t in fold_seconds)}"
+        )
+        return {
+            "y_pred": y_pred,
+            "proba": proba,
+            "fold_scores": np.array(fold_scores),
+            "fold_seconds": fold_seconds,
+        }
+
+    def _score_predictions(
+        self,
+        y: np.ndarray,
+        y_pred: np.ndarray,
+        proba: Optional[np.ndarray],
+    ) -> Dict[str, Any]:
+        """Compute classification metrics from predictions and probabilities."""
+        metrics = {
+            "accuracy": float(accuracy_score(y, y_pred)),
+            "precision": float(precision_score(y, y_pred, average="weighted", zero_division=0)),
+            "recall": float(recall_score(y, y_pred, average="weighted", zero_division=0)),
+            "f1_score": float(f1_score(y, y_pred, average="weighted", zero_division=0)),
+        }
+
+        # Add AUC-ROC if applicable
+        if proba is not None:
+            try:
+                if proba.shape[1] == 2:
+                    metrics["auc_roc"] = float(roc_auc_score(y, proba[:, 1]))
+                else:
+                    metrics["auc_roc"] = float(roc_auc_score(y, proba, multi_class="ovr"))
+            except Exception as e:
+                self.logger.warning(f"Could not compute AUC-ROC: {e}")
+
+        return metrics
+
+    def _evaluate_model(self, model: Any, X: np.ndarray, y: np.ndarray) -> Dict[str, Any]:
+        """Evaluate model performance on out-of-fold predictions."""
         try:
-            y_pred = model.predict(X)
-            metrics = {
-                "accuracy": float(accuracy_score(y, y_pred)),
-                "precision": float(precision_score(y, y_pred, average="weighted", zero_division=0)),
-                "recall": float(recall_score(y, y_pred, average="weighted", zero_division=0)),
-                "f1_score": float(f1_score(y, y_pred, average="weighted", zero_division=0)),
-            }
-
-            # Add AUC-ROC if applicable
-            if hasattr(model, "predict_proba"):
-                try:
-                    if len(np.unique(y)) <= 2:
-                        metrics["auc_roc"] = float(roc_auc_score(y, model.predict_proba(X)[:, 1]))
-                    else:
-                        metrics["auc_roc"] = float(
-                            roc_auc_score(y, model.predict_proba(X), multi_class="ovr")
-                        )
-                except Exception as e:
-                    self.logger.warning(f"Could not compute AUC-ROC: {e}")
-
-            # Cross-validation
+            cv_result = None
             if self.config["evaluation"]["cross_validation"]["enabled"]:
-                n_folds = self.config["evaluation"]["cross_validation"]["n_folds"]
-                cv_scores = cross_val_score(model, X, y, cv=n_folds, scoring="accuracy")
-                metrics["cv_mean"] = float(cv_scores.mean())
-                metrics["cv_std"] = float(cv_scores.std())
+                cv_result = self._cross_validate(model, X, y)
+
+            if cv_result is not None:
+                y_pred = cv_result["y_pred"]
+                proba = cv_result["proba"]
+            else:
+                # Without cross-validation the fitted model can only be scored in-sample
+                y_pred = model.predict(X)
+                proba = model.predict_proba(X) if hasattr(model, "predict_proba") else None
+
+            metrics = self._score_predictions(y, y_pred, proba)
+
+            if cv_result is not None:
+                metrics["cv_mean"] = float(cv_result["fold_scores"].mean())
+                metrics["cv_std"] = float(cv_result["fold_scores"].std())
+                metrics["cv_fold_seconds"] = [round(t, 4) for t in cv_result["fold_seconds"]]
 
             return metrics
         except Exception as e:
@@ -195,22 +334,22 @@ class ModelTrainer:
     def save_model(
         self,
         model: Any,
-        scaler: StandardScaler,
+        preprocessor: FeaturePreprocessor,
         model_id: str,
         metrics: Dict[str, float],
     ) -> str:
-        """Save trained model to disk."""
+        """Save trained model and its fitted preprocessor to disk."""
         try:
-            models_dir = Path("ml_pipeline/models")
+            models_dir = self.models_dir
             models_dir.mkdir(parents=True, exist_ok=True)
 
             model_path = models_dir / f"{model_id}.pkl"
             with open(model_path, "wb") as f:
                 pickle.dump(model, f)
 
-            scaler_path = models_dir / f"{model_id}_scaler.pkl"
-            with open(scaler_path, "wb") as f:
-                pickle.dump(scaler, f)
+            preprocessor_path = models_dir / f"{model_id}_preprocessor.pkl"
+            with open(preprocessor_path, "wb") as f:
+                pickle.dump(preprocessor, f)
 
             self.logger.info(f"Saved model to {model_path}")
             return str(model_path)
@@ -222,23 +361,44 @@ class ModelTrainer:
         self,
         algorithm: Optional[str] = None,
         model_id: Optional[str] = None,
+        profile: bool = False,
     ) -> Dict[str, Any]:
-        """Run complete training pipeline."""
-        try:
-            algorithm = algorithm or self.config["training"]["algorithm"]
-            model_id = model_id or f"{algorithm.lower()}_v{int(datetime.utcnow().timestamp())}"
+        """Run complete training pipeline.
+
+        Every stage is measured by a StageProfiler and the per-stage timings
+        are attached to the result and the training run record. With
+        ``profile`` set, a cProfile pstats file is also written for the run.
+        """
+        algorithm = algorithm or self.config["training"]["algorithm"]
+        model_id = model_id or f"{algorithm.lower()}_v{int(datetime.utcnow().timestamp())}"
+
+        instrumentation = self.config["training"].get("instrumentation", {})
+        profile_path = None
+        if profile:
+            profile_dir = Path(instrumentation.get("profile_dir", "ml_pipeline/logs/profiles"))
+            profile_path = profile_dir / f"{model_id}_{self.run_id}.pstats"
+        self.profiler = StageProfiler(
+            trace_memory=instrumentation.get("trace_memory", False),
+            profile_path=profile_path,
+        )
 
+        try:
             # Load data
-            df, _ = self.load_data()
+            with self._span("load_data"):
+                df, _ = self.load_data()
 
             # Prepare data
-            X, y, scaler = self.prepare_data(df)
+            with self._span("prepare_data"):
+                X, y, preprocessor = self.prepare_data(df)
 
             # Train model
             model, metrics = self.train(X, y, algorithm)
 
             # Save model
-            model_path = self.save_model(model, scaler, model_id, metrics)
+            with self._span("save_model"):
+                model_path = self.save_model(model, preprocessor, model_id, metrics)
+
+            stages = self.profiler.summary()
 
             # Log training event
             self.ml_logger.log_training_event(
@@ -247,6 +407,7 @@ class ModelTrainer:
                 metrics=metrics,
                 dataset_size=len(df),
                 source="manual",
+                stages=stages,
             )
 
             result = {
@@ -256,14 +417,318 @@ class ModelTrainer:
                 "dataset_size": len(df),
                 "metrics": metrics,
                 "model_path": model_path,
+                "stages": stages,
+                "duration_seconds": self.profiler.total_seconds(),
                 "timestamp": datetime.utcnow().isoformat(),
             }
 
+            written = self.profiler.close()
+            if written:
+                result["profile_path"] = written
+
             self.logger.info(f"Training pipeline completed: {json.dumps(result, indent=2)}")
             return result
         except Exception as e:
             self.logger.error(f"Training pipeline failed: {e}")
             raise
+        finally:
+            self.profiler.close()
+            self.profiler = None
+
+    def _iter_chunks(self, data_path: Path, chunk_size: int):
+        """Yield (X, y) chunks of the training source with float32 features."""
+        input_features = self.config["inference"]["input_features"]
+        target = self.config["inference"]["prediction_target"]
+        dtypes = feature_dtypes(input_features)
+        if compact_enabled(self.config):
+            dtypes[target] = np.int8
+        reader = pd.read_csv(
+            data_path,
+            usecols=input_features + [target],
+            dtype=dtypes,
+            chunksize=chunk_size,
+        )
+        for chunk in reader:
+            # Owned, writable copy so preprocessing can run in place
+            yield chunk[input_features].to_numpy(dtype=np.float32, copy=True), chunk[target].to_numpy()
+
+    def train_streaming(
+        self,
+        data_path: Optional[str] = None,
+        chunk_size: Optional[int] = None,
+        n_passes: Optional[int] = None,
+    ) -> Tuple[Any, FeaturePreprocessor, Dict[str, Any], int]:
+        """Train an SGD logistic model out-of-core over chunks of the source CSV.
+
+        Peak memory is bounded by the chunk size: a first pass draws a uniform
+        sample of at most ``sample_size`` rows to fit the preprocessor, the
+        model is updated chunk by chunk over ``n_passes`` passes, and metrics
+        are accumulated in a confusion matrix over a held-out slice of every
+        chunk.
+        """
+        try:
+            streaming = self.config["training"].get("streaming", {})
+            data_path = Path(data_path or self.config["training"]["data_source"])
+            chunk_size = chunk_size or streaming.get("chunk_size", 100_000)
+            n_passes = n_passes or streaming.get("n_passes", 5)
+            hyperparams = self.config["training"]["hyperparameters"]
+            random_state = self.config["training"].get("random_state", 42)
+
+            # Every k-th row is held out for validation, mirroring validation_split
+            validation_split = self.config["training"].get("validation_split", 0.1)
+            holdout_every = int(round(1 / validation_split)) if validation_split else 0
+
+            # Pass 0: class labels and a bounded uniform sample (bottom-k random keys)
+            sample_size = streaming.get("sample_size", 100_000)
+            sample_rng = np.random.default_rng(random_state)
+            sample = None
+            sample_keys = np.empty(0)
+            classes = np.array([], dtype=np.int64)
+            n_rows = 0
+            for X_chunk, y_chunk in self._iter_chunks(data_path, chunk_size):
+                classes = np.union1d(classes, np.unique(y_chunk))
+                n_rows += len(y_chunk)
+                sample = X_chunk if sample is None else np.concatenate([sample, X_chunk])
+                sample_keys = np.concatenate([sample_keys, sample_rng.random(len(y_chunk))])
+                if len(sample_keys) > sample_size:
+                    keep = np.argpartition(sample_keys, sample_size)[:sample_size]
+                    sample, sample_keys = sample[keep], sample_keys[keep]
+            if n_rows == 0:
+                raise ValueError(f"No rows in training source: {data_path}")
+
+            preprocessor = FeaturePreprocessor.from_config(self.config).fit(sample)
+            del sample
+
+            model = SGDClassifier(
+                loss="log_loss",
+                alpha=hyperparams.get("penalty", 1.0) / n_rows,
+                random_state=random_state,
+            )
+            rng = np.random.default_rng(random_state)
+
+            for epoch in range(n_passes):
+                offset = 0
+                for X_chunk, y_chunk in self._iter_chunks(data_path, chunk_size):
+                    X_chunk = preprocessor.transform(X_chunk, copy=False)
+                    train_mask = self._train_mask(offset, len(y_chunk), holdout_every)
+                    offset += len(y_chunk)
+                    order = rng.permutation(np.flatnonzero(train_mask))
+                    model.partial_fit(X_chunk[order], y_chunk[order], classes=classes)
+                self.logger.info(f"Streaming pass {epoch + 1}/{n_passes} over {n_rows} rows")
+
+            cm = np.zeros((len(classes), len(classes)), dtype=np.int64)
+            loss_sum = 0.0
+            n_holdout = 0
+            offset = 0
+            for X_chunk, y_chunk in self._iter_chunks(data_path, chunk_size):
+                holdout = ~self._train_mask(offset, len(y_chunk), holdout_every)
+                offset += len(y_chunk)
+                if not holdout.any():
+                    continue
+                X_chunk = preprocessor.transform(X_chunk[holdout], copy=False)
+                y_chunk = y_chunk[holdout]
+                proba = model.predict_proba(X_chunk)
+                cm += confusion_matrix(y_chunk, classes[proba.argmax(axis=1)], labels=classes)
+                loss_sum += log_loss(y_chunk, proba, labels=classes, normalize=False)
+                n_holdout += len(y_chunk)
+
+            metrics: Dict[str, Any] = {}
+            if n_holdout:
+                metrics = metrics_from_confusion(cm)
+                metrics["log_loss"] = float(loss_sum / n_holdout)
+                metrics["holdout_size"] = n_holdout
+
+            self.logger.info(f"Trained streaming SGDClassifier on {n_rows} rows in chunks of {chunk_size}")
+            return model, preprocessor, metrics, n_rows
+        except Exception as e:
+            self.logger.error(f"Error in streaming training: {e}")
+            raise
+
+    @staticmethod
+    def _train_mask(offset: int, n: int, holdout_every: int) -> np.ndarray:
+        """Mark rows of a chunk used for training; the rest are held out."""
+        if not holdout_every:
+            return np.ones(n, dtype=bool)
+        return (np.arange(offset, offset + n) % holdout_every) != 0
+
+    def run_streaming_pipeline(
+        self,
+        data_path: Optional[str] = None,
+        model_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Run the out-of-core training pipeline."""
+        try:
+            algorithm = "SGDClassifier"
+            model_id = model_id or f"{algorithm.lower()}_v{int(datetime.utcnow().timestamp())}"
+
+            model, preprocessor, metrics, n_rows = self.train_streaming(data_path)
+            model_path = self.save_model(model, preprocessor, model_id, metrics)
+
+            self.ml_logger.log_training_event(
+                run_id=self.run_id,
+                model_id=model_id,
+                metrics=metrics,
+                dataset_size=n_rows,
+                source="streaming",
+            )
+
+            result = {
+                "run_id": self.run_id,
+                "model_id": model_id,
+                "algorithm": algorithm,
+                "dataset_size": n_rows,
+                "metrics": metrics,
+                "model_path": model_path,
+                "timestamp": datetime.utcnow().isoformat(),
+            }
+
+            self.logger.info(f"Streaming training pipeline completed: {json.dumps(result, indent=2)}")
+            return result
+        except Exception as e:
+            self.logger.error(f"Streaming training pipeline failed: {e}")
+            raise
+
+    def _load_model_registry(self) -> Dict[str, Any]:
+        """Load model registry."""
+        registry_path = self.models_dir / "model_registry.json"
+        try:
+            with open(registry_path, "r") as f:
+                return json.load(f)
+        except Exception as e:
+            self.logger.error(f"Error loading model registry: {e}")
+            return {}
+
+    def load_model_bundle(self, model_id: str) -> Tuple[Any, FeaturePreprocessor]:
+        """Load a saved model and its preprocessor from disk."""
+        model_path = self.models_dir / f"{model_id}.pkl"
+        preprocessor_path = self.models_dir / f"{model_id}_preprocessor.pkl"
+        if not model_path.exists() or not preprocessor_path.exists():
+            raise FileNotFoundError(f"Model bundle not found for {model_id} in {self.models_dir}")
+
+        with open(model_path, "rb") as f:
+            model = pickle.load(f)
+        with open(preprocessor_path, "rb") as f:
+            preprocessor = pickle.load(f)
+
+        self.logger.info(f"Loaded model bundle: {model_id}")
+        return model, preprocessor
+
+    def _update_model(self, model: Any, X: np.ndarray, y: np.ndarray) -> Any:
+        """Incrementally update a fitted model on new samples."""
+        reinforcement = self.config.get("auto_reinforcement", {})
+        epochs = reinforcement.get("fine_tune_epochs", 5)
+
+        params = model.get_params(deep=False)
+        try:
+            if hasattr(model, "partial_fit"):
+                model.set_params(
+                    learning_rate="constant",
+                    eta0=reinforcement.get("fine_tune_learning_rate", 0.001),
+                )
+                # partial_fit requires the dtype the model was first fitted with
+                X = X.astype(model.coef_.dtype, copy=False)
+                rng = np.random.default_rng(self.config["training"].get("random_state", 42))
+                for _ in range(epochs):
+                    order = rng.permutation(len(y))
+                    model.partial_fit(X[order], y[order], classes=model.classes_)
+            elif isinstance(model, RandomForestClassifier):
+                # New trees are grown on the new samples; existing trees are kept as-is
+                if set(np.unique(y)) != set(model.classes_):
+                    raise ValueError("Warm-start forest update needs samples of every class")
+                model.set_params(
+                    warm_start=True,
+                    n_estimators=model.n_estimators + reinforcement.get("warm_start_trees", 20),
+                )
+                model.fit(X, y)
+                params["n_estimators"] = model.n_estimators
+            elif isinstance(model, LogisticRegression):
+                if set(np.unique(y)) != set(model.classes_):
+                    raise ValueError("Warm-start logistic regression update needs samples of every class")
+                model.set_params(warm_start=True, max_iter=epochs)
+                model.fit(X, y)
+            else:
+                raise ValueError(f"Model does not support incremental updates: {type(model).__name__}")
+        finally:
+            # Fine-tune settings must not carry over into clones or refits of the saved model
+            model.set_params(**params)
+
+        return model
+
+    def fine_tune(
+        self,
+        df: pd.DataFrame,
+        base_model_id: Optional[str] = None,
+        model_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Fine-tune the champion model on new labelled matches."""
+        try:
+            start = time.perf_counter()
+            registry = self._load_model_registry()
+            base_model_id = base_model_id or registry.get("champion_model_id")
+            if not base_model_id:
+                raise ValueError("No base model given and no champion in registry")
+
+            min_samples = self.config.get("auto_reinforcement", {}).get("min_error_samples", 10)
+            if len(df) < min_samples:
+                self.logger.info(f"Insufficient samples for fine-tuning: {len(df)} < {min_samples} required")
+                return {
+                    "run_id": self.run_id,
+                    "base_model_id": base_model_id,
+                    "status": "skipped",
+                    "dataset_size": len(df),
+                }
+
+            model, preprocessor = self.load_model_bundle(base_model_id)
+
+            input_features = self.config["inference"]["input_features"]
+            target = self.config["inference"]["prediction_target"]
+            # The champion's preprocessor stays frozen so the updated model sees the same feature space
+            X = preprocessor.transform(df[input_features].to_numpy(dtype=np.float32, copy=True), copy=False)
+            y = df[target].to_numpy()
+
+            # The most recent rows (batches arrive in time order) are held out, so both
+            # models are scored on matches the update never saw
+            holdout_fraction = self.config.get("auto_reinforcement", {}).get("fine_tune_holdout", 0.2)
+            n_holdout = min(max(1, int(round(len(y) * holdout_fraction))), len(y) - 1)
+            X_update, y_update = X[:-n_holdout], y[:-n_holdout]
+            X_holdout, y_holdout = X[-n_holdout:], y[-n_holdout:]
+
+            base_accuracy = float(accuracy_score(y_holdout, model.predict(X_holdout)))
+            model = self._update_model(model, X_update, y_update)
+
+            proba = model.predict_proba(X_holdout) if hasattr(model, "predict_proba") else None
+            metrics = self._score_predictions(y_holdout, model.predict(X_holdout), proba)
+            metrics["base_accuracy"] = base_accuracy
+            metrics["holdout_size"] = int(n_holdout)
+
+            model_id = model_id or f"{base_model_id}_ft{int(datetime.utcnow().timestamp())}"
+            model_path = self.save_model(model, preprocessor, model_id, metrics)
+
+            self.ml_logger.log_training_event(
+                run_id=self.run_id,
+                model_id=model_id,
+                metrics=metrics,
+                dataset_size=len(df),
+                source="auto_reinforcement",
+            )
+
+            result = {
+                "run_id": self.run_id,
+                "model_id": model_id,
+                "base_model_id": base_model_id,
+                "status": "completed",
+                "dataset_size": len(df),
+                "metrics": metrics,
+                "model_path": model_path,
+                "duration_seconds": round(time.perf_counter() - start, 4),
+                "timestamp": datetime.utcnow().isoformat(),
+            }
+
+            self.logger.info(f"Fine-tuning completed: {json.dumps(result, indent=2)}")
+            return result
+        except Exception as e:
+            self.logger.error(f"Fine-tuning failed: {e}")
+            raise
 
 
 def main():
@@ -286,11 +751,42 @@ def main():
         "--data",
         help="Path to training data CSV",
     )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Write a cProfile pstats file for the training run",
+    )
+    parser.add_argument(
+        "--streaming",
+        action="store_true",
+        help="Train out-of-core over chunks of the data source",
+    )
+    parser.add_argument(
+        "--fine-tune",
+        help="Path to CSV of new labelled matches to fine-tune the champion on",
+    )
+    parser.add_argument(
+        "--base-model-id",
+        help="Model to fine-tune (defaults to the registry champion)",
+    )
 
     args = parser.parse_args()
 
     trainer = ModelTrainer(args.config)
-    result = trainer.run_training_pipeline(algorithm=args.algorithm, model_id=args.model_id)
+    if args.fine_tune:
+        result = trainer.fine_tune(
+            pd.read_csv(args.fine_tune),
+            base_model_id=args.base_model_id,
+            model_id=args.model_id,
+        )
+    elif args.streaming:
+        result = trainer.run_streaming_pipeline(data_path=args.data, model_id=args.model_id)
+    else:
+        result = trainer.run_training_pipeline(
+            algorithm=args.algorithm,
+            model_id=args.model_id,
+            profile=args.profile,
+        )
     print(json.dumps(result, indent=2))
 
 
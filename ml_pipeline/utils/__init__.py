@@ -1,6 +1,19 @@
 """ML Pipeline utilities."""
 
 from .data_loader import DataLoader, get_data_loader
+from .dataset_cache import DatasetCache, get_dataset_cache
 from .evaluation import EvaluationManager, get_evaluation_manager
+from .monitoring import RollingAccuracyMonitor, get_accuracy_monitor
+from .preprocessing import FeaturePreprocessor
 
-__all__ = ["DataLoader", "get_data_loader", "EvaluationManager", "get_evaluation_manager"]
+__all__ = [
+    "DataLoader",
+    "get_data_loader",
+    "DatasetCache",
+    "get_dataset_cache",
+    "EvaluationManager",
+    "get_evaluation_manager",
+    "RollingAccuracyMonitor",
+    "get_accuracy_monitor",
+    "FeaturePreprocessor",
+]
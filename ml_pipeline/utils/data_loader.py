@@ -1,10 +1,18 @@
 """Data loading utilities for ML pipeline."""
 
+import hashlib
+import io
+import numpy as np
 import pandas as pd
+from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Tuple, Optional, List
 import logging
 
+from .dataset_cache import DatasetCache
+from .dtypes import EVALUATION_LOG_DTYPES, compact_enabled, compact_training_frame, feature_dtypes
+from .feature_engineering import engineer_features, is_raw_matches
+
 
 class DataLoader:
     """Load and manage training data."""
@@ -12,9 +20,28 @@ class DataLoader:
     def __init__(self, config: dict, logger: Optional[logging.Logger] = None):
         self.config = config
         self.logger = logger or logging.getLogger(__name__)
+        # Timestamp-sorted evaluation log, reused until the file changes; the byte
+        # offset and hash of the parsed prefix let appends be read on their own
+        self._history_key: Optional[Tuple[str, int, int]] = None
+        self._history: Optional[pd.DataFrame] = None
+        self._history_ts: Optional[np.ndarray] = None
+        self._history_offset = 0
+        self._history_digest: Optional[bytes] = None
 
     def load_training_data(self, path: Optional[str] = None) -> pd.DataFrame:
-        """Load training data from CSV."""
+        """Load training data from CSV.
+
+        Missing values are left in place; they are imputed by the fitted
+        FeaturePreprocessor so training and serving share the same fill
+        values. With ``preprocessing.feature_engineering`` enabled, a raw results table
+        is turned into the engineered training matrix first. When
+        ``training.cache.enabled`` is set, the prepared feature matrix and
+        target are served from the binary dataset cache, and the returned
+        frame holds only the input features and target whether or not the
+        cache was hit. With
+        ``performance.compact_dtypes`` features are parsed straight to float32
+        and the outcome code is stored as int8.
+        """
         data_path = path or self.config.get("training", {}).get("data_source")
         if not data_path:
             self.logger.warning("No data source configured, returning empty DataFrame")
@@ -25,21 +52,166 @@ class DataLoader:
             self.logger.error(f"Data file not found: {data_path}")
             return pd.DataFrame()
 
-        df = pd.read_csv(data_path)
+        training = self.config.get("training", {})
+        input_features = self.config["inference"]["input_features"]
+        target = self.config["inference"]["prediction_target"]
+        compact = compact_enabled(self.config)
+
+        cache = None
+        cache_config = training.get("cache", {})
+        if cache_config.get("enabled", False):
+            cache = DatasetCache(cache_config.get("dir", "ml_pipeline/data/.cache"), self.logger)
+            # Feature store parameters shape engineered features, so they are part of the key
+            spec = {
+                **training.get("preprocessing", {}),
+                "feature_store": self.config.get("feature_store", {}),
+                "compact_dtypes": compact,
+            }
+            key = cache.cache_key(path_obj, input_features, target, spec)
+            cached = cache.load(key)
+            if cached is not None:
+                return cache.to_frame(*cached, input_features, target)
+
+        df = pd.read_csv(data_path, dtype=feature_dtypes(input_features) if compact else None)
         self.logger.info(f"Loaded {len(df)} records from {data_path}")
+        if training.get("preprocessing", {}).get("feature_engineering") and is_raw_matches(df):
+            df = engineer_features(df, self.config)
+            self.logger.info(f"Engineered features for {len(df)} matches")
+        if compact:
+            df = compact_training_frame(df, input_features, target)
+
+        if cache is not None:
+            # Same shape as a cache hit, so callers cannot depend on columns only a miss has
+            X = df[input_features].to_numpy(dtype=np.float32)
+            y = df[target].to_numpy()
+            cache.store(key, X, y)
+            return cache.to_frame(X, y, input_features, target)
         return df
 
     def load_evaluation_log(self, log_path: str = "ml_pipeline/logs/evaluation_log.csv") -> pd.DataFrame:
-        """Load evaluation log from CSV."""
+        """Load evaluation log from CSV.
+
+        With ``performance.compact_dtypes`` the repeated string columns
+        (model, prediction, result, status) load as categoricals and the
+        score columns as float32.
+        """
         path_obj = Path(log_path)
         if not path_obj.exists():
             self.logger.warning(f"Evaluation log not found: {log_path}")
             return pd.DataFrame()
 
-        df = pd.read_csv(log_path)
+        df = pd.read_csv(log_path, dtype=EVALUATION_LOG_DTYPES if compact_enabled(self.config) else None)
         self.logger.info(f"Loaded {len(df)} evaluation records")
         return df
 
+    def load_evaluation_history(self, log_path: str = "ml_pipeline/logs/evaluation_log.csv") -> pd.DataFrame:
+        """Load the evaluation log sorted by timestamp.
+
+        The sorted frame is kept in memory, so repeated window queries cost a
+        binary search each. When the file has only grown since the last load
+        (new predictions appended), just the appended lines are parsed and
+        merged. Any other change, such as an evaluation rewriting a row,
+        reloads the whole file. The unchanged prefix is checked by hashing
+        its bytes, which is far cheaper than parsing them again.
+        """
+        path_obj = Path(log_path)
+        if not path_obj.exists():
+            self.logger.warning(f"Evaluation log not found: {log_path}")
+            return pd.DataFrame()
+
+        stat = path_obj.stat()
+        key = (str(path_obj.resolve()), stat.st_mtime_ns, stat.st_size)
+        if key == self._history_key:
+            return self._history
+
+        with open(path_obj, "rb") as f:
+            grown = (
+                self._history is not None
+                and self._history_key[0] == key[0]
+                and stat.st_size >= self._history_offset
+            )
+            digest = self._hash_prefix(f, self._history_offset) if grown else None
+            if digest is not None and digest.digest() == self._history_digest:
+                # Only whole lines; a writer may be part-way through the last one
+                tail = f.read()
+                end = tail.rfind(b"\n") + 1
+                digest.update(tail[:end])
+                if end:
+                    self._merge_history(self._read_evaluation_csv(
+                        io.BytesIO(tail[:end]), header=None, names=list(self._history.columns)
+                    ))
+                self._history_offset += end
+            else:
+                f.seek(0)
+                data = f.read()
+                end = data.rfind(b"\n") + 1
+                digest = hashlib.blake2b(data[:end])
+                df = self._read_evaluation_csv(io.BytesIO(data[:end])) if end else pd.DataFrame()
+                self.logger.info(f"Loaded {len(df)} evaluation records")
+                self._history = None
+                self._merge_history(df)
+                self._history_offset = end
+
+        self._history_digest = digest.digest()
+        self._history_key = key
+        return self._history
+
+    def _read_evaluation_csv(self, source, **kwargs) -> pd.DataFrame:
+        """Parse evaluation log CSV, with compact dtypes when enabled."""
+        return pd.read_csv(source, dtype=EVALUATION_LOG_DTYPES if compact_enabled(self.config) else None, **kwargs)
+
+    @staticmethod
+    def _hash_prefix(f, n_bytes: int, block_size: int = 1 << 20):
+        """Hash of the first ``n_bytes`` of a file, or None if it is shorter."""
+        f.seek(0)
+        digest = hashlib.blake2b()
+        remaining = n_bytes
+        while remaining:
+            block = f.read(min(block_size, remaining))
+            if not block:
+                return None
+            digest.update(block)
+            remaining -= len(block)
+        return digest
+
+    def _merge_history(self, rows: pd.DataFrame) -> None:
+        """Add rows to the timestamp-sorted history."""
+        if "timestamp" in rows.columns:
+            rows["timestamp"] = pd.to_datetime(rows["timestamp"], format="ISO8601", errors="coerce")
+        if self._history is None:
+            df = rows
+        else:
+            df = pd.concat([self._history, rows], ignore_index=True)
+            # concat widens categoricals with different categories to object
+            for col in self._history.select_dtypes("category").columns:
+                df[col] = df[col].astype("category")
+        if "timestamp" in df.columns:
+            # Evaluations rewrite a row's timestamp, so the file is only mostly ordered
+            if not df["timestamp"].is_monotonic_increasing:
+                df = df.sort_values("timestamp", kind="stable", na_position="first")
+            df = df.reset_index(drop=True)
+            self._history_ts = df["timestamp"].to_numpy(dtype="datetime64[ns]")
+        else:
+            self._history_ts = np.full(len(df), np.datetime64("NaT"), dtype="datetime64[ns]")
+        self._history = df
+
+    def query_window(
+        self,
+        start: datetime,
+        end: Optional[datetime] = None,
+        log_path: str = "ml_pipeline/logs/evaluation_log.csv",
+    ) -> pd.DataFrame:
+        """Evaluation log rows with ``start <= timestamp < end`` as a contiguous slice."""
+        history = self.load_evaluation_history(log_path)
+        if history.empty:
+            return history
+
+        lo = np.searchsorted(self._history_ts, np.datetime64(pd.Timestamp(start), "ns"), side="left")
+        hi = len(history) if end is None else np.searchsorted(
+            self._history_ts, np.datetime64(pd.Timestamp(end), "ns"), side="left"
+        )
+        return history.iloc[lo:max(lo, hi)]
+
     def filter_predictions_by_confidence(
         self,
         df: pd.DataFrame,
@@ -50,12 +222,20 @@ class DataLoader:
         self.logger.info(f"Filtered to {len(filtered)} predictions above {min_confidence} confidence")
         return filtered
 
+    @staticmethod
+    def _error_mask(df: pd.DataFrame) -> np.ndarray:
+        """Rows with a known result that differs from the prediction."""
+        # Compare as strings: compact categoricals of the two columns have different categories
+        prediction = df["prediction"].astype("string")
+        actual = df["actual_result"].astype("string")
+        return (actual.notna() & (prediction != actual).fillna(False)).to_numpy(dtype=bool)
+
     def get_prediction_errors(self, df: pd.DataFrame) -> pd.DataFrame:
         """Extract incorrect predictions from evaluation log."""
         if "prediction" not in df.columns or "actual_result" not in df.columns:
             return pd.DataFrame()
 
-        errors = df[df["prediction"] != df["actual_result"]]
+        errors = df[self._error_mask(df)]
         self.logger.info(f"Found {len(errors)} prediction errors")
         return errors
 
@@ -64,21 +244,19 @@ class DataLoader:
         lookback_days: int = 7,
         min_confidence: float = 0.7,
         min_samples: int = 10,
+        as_of: Optional[datetime] = None,
+        log_path: str = "ml_pipeline/logs/evaluation_log.csv",
     ) -> Tuple[pd.DataFrame, int]:
-        """Prepare fine-tuning dataset from recent prediction errors."""
+        """Prepare fine-tuning dataset from recent high-confidence prediction errors."""
         try:
-            # Load evaluation log
-            eval_df = self.load_evaluation_log()
-            if eval_df.empty:
+            end = as_of or datetime.utcnow()
+            window = self.query_window(end - timedelta(days=lookback_days), end, log_path)
+            if window.empty or "prediction" not in window.columns or "actual_result" not in window.columns:
                 return pd.DataFrame(), 0
 
-            # Filter by date and confidence
-            eval_df["timestamp"] = pd.to_datetime(eval_df.get("timestamp", ""))
-            recent_df = eval_df[eval_df["timestamp"].dt.days_name]  # Simplified
-            high_conf = self.filter_predictions_by_confidence(recent_df, min_confidence)
-
-            # Get errors only
-            errors = self.get_prediction_errors(high_conf)
+            # One combined mask over the window only
+            confidence = window["confidence"].to_numpy(dtype=np.float64, na_value=np.nan)
+            errors = window[(confidence >= min_confidence) & self._error_mask(window)]
 
             if len(errors) < min_samples:
                 self.logger.info(
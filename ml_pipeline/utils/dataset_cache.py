@@ -0,0 +1,109 @@
+"""Binary cache for prepared training datasets."""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+CACHE_FORMAT_VERSION = 2
+
+
+class DatasetCache:
+    """Store parsed float32 feature matrices and targets as memory-mappable .npy files.
+
+    Entries are keyed on the SHA-256 of the source file plus the feature list,
+    target and preprocessing config, so any change to the data or to how it is
+    prepared produces a new entry instead of a stale hit.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = "ml_pipeline/data/.cache",
+        logger: Optional[logging.Logger] = None,
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.logger = logger or logging.getLogger(__name__)
+
+    @staticmethod
+    def file_digest(path: Path, chunk_size: int = 1 << 20) -> str:
+        """Hash a file in fixed-size chunks."""
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(chunk_size), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def cache_key(
+        self,
+        source: Path,
+        input_features: List[str],
+        target: str,
+        preprocessing: Dict[str, Any],
+    ) -> str:
+        """Build the cache key for a source file and preprocessing spec."""
+        spec = {
+            "version": CACHE_FORMAT_VERSION,
+            "source_sha256": self.file_digest(Path(source)),
+            "input_features": list(input_features),
+            "target": target,
+            "preprocessing": preprocessing,
+        }
+        return hashlib.sha256(json.dumps(spec, sort_keys=True).encode()).hexdigest()[:32]
+
+    def load(self, key: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """Memory-map cached arrays, or return None on a miss."""
+        entry = self.cache_dir / key
+        try:
+            X = np.load(entry / "X.npy", mmap_mode="r")
+            y = np.load(entry / "y.npy", mmap_mode="r")
+        except FileNotFoundError:
+            return None
+
+        self.logger.info(f"Dataset cache hit: {key} {X.shape}")
+        return X, y
+
+    def store(self, key: str, X: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Write arrays for a key and return them memory-mapped."""
+        entry = self.cache_dir / key
+        tmp = self.cache_dir / f"{key}.tmp-{os.getpid()}"
+        tmp.mkdir(parents=True, exist_ok=True)
+        np.save(tmp / "X.npy", np.ascontiguousarray(X, dtype=np.float32))
+        np.save(tmp / "y.npy", np.ascontiguousarray(y))
+
+        # Publish the entry with a single rename so readers never see partial files
+        try:
+            os.replace(tmp, entry)
+        except OSError:
+            # Another process stored the same key first
+            shutil.rmtree(tmp, ignore_errors=True)
+
+        self.logger.info(f"Stored dataset cache entry: {key} {X.shape}")
+        return self.load(key)
+
+    def clear(self) -> None:
+        """Remove all cache entries."""
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    @staticmethod
+    def to_frame(
+        X: np.ndarray,
+        y: np.ndarray,
+        input_features: List[str],
+        target: str,
+    ) -> pd.DataFrame:
+        """Wrap cached arrays in a DataFrame without copying the feature matrix."""
+        df = pd.DataFrame(X, columns=input_features, copy=False)
+        df[target] = y
+        return df
+
+
+def get_dataset_cache(config: dict) -> DatasetCache:
+    """Factory function to get DatasetCache instance."""
+    cache_config = config.get("training", {}).get("cache", {})
+    return DatasetCache(cache_config.get("dir", "ml_pipeline/data/.cache"))
@@ -0,0 +1,49 @@
+"""Compact dtype helpers for memory-efficient pipelines."""
+
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+
+# Outcome labels indexed by the encoded target (0=Home, 1=Draw, 2=Visitor)
+OUTCOME_LABELS = ["H", "D", "V"]
+
+EVALUATION_LOG_DTYPES = {
+    "event_id": "string",
+    "event_type": "category",
+    "model_id": "category",
+    "match_id": "string",
+    "prediction": "category",
+    "actual_result": "category",
+    "confidence": np.float32,
+    "accuracy": np.float32,
+    "status": "category",
+}
+
+
+def compact_enabled(config: Dict[str, Any]) -> bool:
+    """Whether the config asks for compact dtypes."""
+    return bool(config.get("performance", {}).get("compact_dtypes", False))
+
+
+def feature_dtypes(input_features: List[str]) -> Dict[str, Any]:
+    """read_csv dtype mapping that parses features straight to float32."""
+    return {feat: np.float32 for feat in input_features}
+
+
+def compact_training_frame(df: pd.DataFrame, input_features: List[str], target: str) -> pd.DataFrame:
+    """Cast features to float32 and the outcome code to int8."""
+    casts: Dict[str, Any] = {feat: np.float32 for feat in input_features if feat in df.columns}
+    if target in df.columns and not df[target].isna().any():
+        casts[target] = np.int8
+    return df.astype(casts, copy=False)
+
+
+def outcome_categorical(codes: np.ndarray) -> pd.Categorical:
+    """Decode outcome codes into a categorical by indexing the label table."""
+    return pd.Categorical.from_codes(np.asarray(codes, dtype=np.int8), categories=OUTCOME_LABELS)
+
+
+def constant_categorical(value: str, n: int) -> pd.Categorical:
+    """A length-n categorical column holding a single repeated value."""
+    return pd.Categorical.from_codes(np.zeros(n, dtype=np.int8), categories=[value])
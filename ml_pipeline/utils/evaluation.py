@@ -2,19 +2,100 @@
 
 import json
 import logging
+from collections import deque
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Deque, Dict, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
+from .dtypes import OUTCOME_LABELS
+from .monitoring import RollingAccuracyMonitor, Timestamp
+
+
+def metrics_from_confusion(cm: np.ndarray) -> Dict[str, float]:
+    """Derive accuracy and weighted precision/recall/F1 from a confusion matrix."""
+    tp = np.diag(cm).astype(float)
+    support = cm.sum(axis=1)
+    predicted = cm.sum(axis=0)
+    total = support.sum()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        precision = np.where(predicted > 0, tp / predicted, 0.0)
+        recall = np.where(support > 0, tp / support, 0.0)
+        f1 = np.where(precision + recall > 0, 2 * precision * recall / (precision + recall), 0.0)
+    weights = support / total if total else support
+    return {
+        "accuracy": float(tp.sum() / total) if total else 0.0,
+        "precision": float(np.dot(weights, precision)),
+        "recall": float(np.dot(weights, recall)),
+        "f1_score": float(np.dot(weights, f1)),
+    }
+
+
+def paired_bootstrap(
+    champion_scores: np.ndarray,
+    challenger_scores: np.ndarray,
+    n_resamples: int = 10000,
+    confidence: float = 0.95,
+    random_state: Optional[int] = 42,
+    max_block_elements: int = 1 << 22,
+) -> Dict[str, np.ndarray]:
+    """Paired bootstrap of the mean challenger-minus-champion difference.
+
+    Scores are (n_matches,) or (n_metrics, n_matches) arrays of per-match
+    values for the same matches. Each block of resamples is drawn as an index
+    matrix, turned into per-match resample counts with a single bincount, and
+    reduced for every metric at once with one matrix product; blocks hold at
+    most ``max_block_elements`` indices so memory stays bounded. P-values are
+    two-sided tests of a zero mean difference.
+    """
+    diffs = np.atleast_2d(np.asarray(challenger_scores, dtype=np.float64) - np.asarray(champion_scores, dtype=np.float64))
+    n = diffs.shape[1]
+    if n == 0:
+        raise ValueError("No paired outcomes to compare")
+
+    rng = np.random.default_rng(random_state)
+    block = max(1, max_block_elements // n)
+    means = np.empty((n_resamples, diffs.shape[0]))
+    for start in range(0, n_resamples, block):
+        stop = min(start + block, n_resamples)
+        size = stop - start
+        idx = rng.integers(0, n, size=(size, n), dtype=np.int64)
+        idx += (np.arange(size) * n)[:, None]
+        counts = np.bincount(idx.ravel(), minlength=size * n).reshape(size, n)
+        means[start:stop] = counts @ diffs.T / n
+    means = means.T
+
+    alpha = 1.0 - confidence
+    lower, upper = np.quantile(means, [alpha / 2, 1 - alpha / 2], axis=1)
+    below = (means <= 0).sum(axis=1)
+    above = (means >= 0).sum(axis=1)
+    p_value = np.minimum(1.0, 2 * (np.minimum(below, above) + 1) / (n_resamples + 1))
+    return {
+        "difference": diffs.mean(axis=1),
+        "ci_lower": lower,
+        "ci_upper": upper,
+        "p_value": p_value,
+    }
+
 
 class EvaluationManager:
     """Manage model evaluation and metrics tracking."""
 
-    def __init__(self, logger: Optional[logging.Logger] = None):
+    def __init__(
+        self,
+        logger: Optional[logging.Logger] = None,
+        monitor: Optional[RollingAccuracyMonitor] = None,
+        max_history: int = 1000,
+        bootstrap_resamples: int = 10000,
+        significance_level: float = 0.05,
+    ):
         self.logger = logger or logging.getLogger(__name__)
-        self.metrics_history: List[Dict[str, Any]] = []
+        self.metrics_history: Deque[Dict[str, Any]] = deque(maxlen=max_history)
+        self.monitor = monitor or RollingAccuracyMonitor(logger=self.logger)
+        self.bootstrap_resamples = bootstrap_resamples
+        self.significance_level = significance_level
 
     def record_metrics(
         self,
@@ -32,6 +113,17 @@ class EvaluationManager:
         self.metrics_history.append(entry)
         self.logger.info(f"Recorded metrics for {model_id}: {metrics}")
 
+    def record_evaluation(
+        self,
+        model_id: str,
+        prediction: str,
+        actual_result: str,
+        league: Optional[str] = None,
+        timestamp: Timestamp = None,
+    ) -> Dict[str, Any]:
+        """Feed a settled prediction to the live accuracy monitor."""
+        return self.monitor.update(model_id, prediction == actual_result, league, timestamp)
+
     def calculate_decay(
         self,
         current_metrics: Dict[str, float],
@@ -81,6 +173,111 @@ class EvaluationManager:
         self.logger.info(f"Comparison result: {comparison}")
         return comparison
 
+    def paired_outcomes(
+        self,
+        eval_df: pd.DataFrame,
+        champion_id: str,
+        challenger_id: str,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Pair settled champion predictions with their shadow challenger predictions.
+
+        Shadow rows carry the champion's event id in their metadata and both
+        sides log full class probabilities, so the result can be passed
+        straight to ``bootstrap_comparison``. Returns outcome codes and the
+        champion and challenger probability matrices.
+        """
+        metadata = eval_df["metadata"].fillna("{}").map(json.loads)
+        model_ids = eval_df["model_id"].astype(str)
+
+        champion = eval_df[(model_ids == champion_id).to_numpy() & eval_df["actual_result"].notna().to_numpy()]
+        champion_proba = metadata[champion.index].map(lambda m: m.get("proba"))
+        champion_by_event = {
+            event_id: (actual, proba)
+            for event_id, actual, proba in zip(champion["event_id"], champion["actual_result"], champion_proba)
+            if proba is not None and actual in OUTCOME_LABELS
+        }
+
+        y_true, champion_rows, challenger_rows = [], [], []
+        shadow = (model_ids == challenger_id).to_numpy()
+        for meta in metadata[shadow]:
+            paired = champion_by_event.get(meta.get("champion_event_id"))
+            if paired is None or meta.get("proba") is None:
+                continue
+            y_true.append(OUTCOME_LABELS.index(paired[0]))
+            champion_rows.append(paired[1])
+            challenger_rows.append(meta["proba"])
+
+        self.logger.info(f"Paired {len(y_true)} settled predictions for {champion_id} vs {challenger_id}")
+        n_classes = len(OUTCOME_LABELS)
+        return (
+            np.asarray(y_true, dtype=np.int64),
+            np.asarray(champion_rows, dtype=np.float64).reshape(-1, n_classes),
+            np.asarray(challenger_rows, dtype=np.float64).reshape(-1, n_classes),
+        )
+
+    def bootstrap_comparison(
+        self,
+        y_true: np.ndarray,
+        champion_proba: np.ndarray,
+        challenger_proba: np.ndarray,
+        n_resamples: Optional[int] = None,
+        significance_level: Optional[float] = None,
+        random_state: Optional[int] = 42,
+    ) -> Dict[str, Any]:
+        """Compare champion and challenger on the same matches with a paired bootstrap.
+
+        ``y_true`` holds outcome codes and the probability matrices have one
+        column per code. The challenger wins when its accuracy is significantly
+        higher and its log-loss is not significantly worse.
+        """
+        if n_resamples is None:
+            n_resamples = self.bootstrap_resamples
+        if significance_level is None:
+            significance_level = self.significance_level
+        if n_resamples < 1:
+            raise ValueError(f"n_resamples must be positive, got {n_resamples}")
+        y_true = np.asarray(y_true, dtype=np.int64)
+        rows = np.arange(len(y_true))
+        scores = {}
+        for name, proba in (("champion", champion_proba), ("challenger", challenger_proba)):
+            proba = np.asarray(proba, dtype=np.float64)
+            correct = (proba.argmax(axis=1) == y_true).astype(np.float64)
+            log_loss = -np.log(np.clip(proba[rows, y_true], 1e-15, 1.0))
+            scores[name] = np.stack([correct, log_loss])
+
+        result = paired_bootstrap(
+            scores["champion"],
+            scores["challenger"],
+            n_resamples=n_resamples,
+            confidence=1.0 - significance_level,
+            random_state=random_state,
+        )
+
+        comparison: Dict[str, Any] = {"n_matches": len(y_true), "n_resamples": n_resamples, "metrics": {}}
+        for i, metric in enumerate(("accuracy", "log_loss")):
+            comparison["metrics"][metric] = {
+                "champion": float(scores["champion"][i].mean()),
+                "challenger": float(scores["challenger"][i].mean()),
+                "difference": float(result["difference"][i]),
+                "ci_lower": float(result["ci_lower"][i]),
+                "ci_upper": float(result["ci_upper"][i]),
+                "p_value": float(result["p_value"][i]),
+                "significant": bool(result["p_value"][i] < significance_level),
+            }
+
+        accuracy = comparison["metrics"]["accuracy"]
+        log_loss = comparison["metrics"]["log_loss"]
+        comparison["challenger_wins"] = (
+            accuracy["significant"] and accuracy["difference"] > 0
+            and not (log_loss["significant"] and log_loss["difference"] > 0)
+        )
+        self.logger.info(
+            f"Bootstrap comparison over {len(y_true)} matches: accuracy diff {accuracy['difference']:+.4f} "
+            f"(p={accuracy['p_value']:.4f}), log-loss diff {log_loss['difference']:+.4f} "
+            f"(p={log_loss['p_value']:.4f}), challenger_wins={comparison['challenger_wins']}"
+        )
+        return comparison
+
     def should_promote_challenger(
         self,
         comparison: Dict[str, Any],
@@ -106,7 +303,7 @@ class EvaluationManager:
             output_file = Path(output_path)
             output_file.parent.mkdir(parents=True, exist_ok=True)
             with open(output_file, "w") as f:
-                json.dump(self.metrics_history, f, indent=2)
+                json.dump(list(self.metrics_history), f, indent=2)
             self.logger.info(f"Exported metrics to {output_path}")
         except Exception as e:
             self.logger.error(f"Failed to export metrics: {e}")
@@ -129,6 +326,13 @@ class EvaluationManager:
             return "poor"
 
 
-def get_evaluation_manager() -> EvaluationManager:
+def get_evaluation_manager(config: Optional[dict] = None) -> EvaluationManager:
     """Factory function to get EvaluationManager instance."""
-    return EvaluationManager()
+    if config is None:
+        return EvaluationManager()
+    champion_challenger = config.get("champion_challenger", {})
+    return EvaluationManager(
+        monitor=RollingAccuracyMonitor.from_config(config),
+        bootstrap_resamples=champion_challenger.get("bootstrap_resamples", 10000),
+        significance_level=champion_challenger.get("significance_level", 0.05),
+    )
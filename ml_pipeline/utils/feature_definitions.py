@@ -0,0 +1,52 @@
+"""Shared team feature definitions for the feature store and the training matrix.
+
+``TeamFeatureStore`` (incremental, serving) and ``build_training_matrix``
+(vectorized, training) must compute identical features, so the raw schema,
+neutral values, scales and window/EWM parameters live here.
+"""
+
+from typing import Any, Dict, Tuple
+
+RAW_COLUMNS = ["date", "home_team", "away_team", "home_goals", "away_goals"]
+
+# Feature values for a team with no prior matches
+NEUTRAL_FORM = 5.0
+NEUTRAL_STRENGTH = 5.0
+NEUTRAL_HOME_ADVANTAGE = 0.5
+NEUTRAL_GOALS = 0.0
+
+# Defaults for the feature_store config section
+DEFAULT_FORM_WINDOW = 5
+DEFAULT_STRENGTH_ALPHA = 0.1
+DEFAULT_HOME_ALPHA = 0.1
+
+MAX_POINTS = 3.0
+# Mean points per match -> 0-10 form scale
+FORM_SCALE = 10.0 / MAX_POINTS
+# Strength moves this much per goal of EWMA goal difference
+STRENGTH_PER_GOAL = 2.0
+MAX_RATING = 10.0
+
+
+def match_points(goals_for: float, goals_against: float) -> int:
+    """League points for one side of a result."""
+    if goals_for > goals_against:
+        return 3
+    if goals_for == goals_against:
+        return 1
+    return 0
+
+
+def strength_from_goal_diff(goal_diff_ewm: float) -> float:
+    """Map an EWMA goal difference onto the 0-10 strength scale."""
+    return min(MAX_RATING, max(0.0, NEUTRAL_STRENGTH + STRENGTH_PER_GOAL * goal_diff_ewm))
+
+
+def feature_params(config: Dict[str, Any]) -> Tuple[int, float, float]:
+    """Form window, strength EWMA alpha and home EWMA alpha from the feature_store config section."""
+    store_config = config.get("feature_store") or {}
+    return (
+        store_config.get("form_window", DEFAULT_FORM_WINDOW),
+        store_config.get("strength_alpha", DEFAULT_STRENGTH_ALPHA),
+        store_config.get("home_alpha", DEFAULT_HOME_ALPHA),
+    )
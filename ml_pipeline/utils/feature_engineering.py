@@ -0,0 +1,141 @@
+"""Vectorized feature engineering from raw match history."""
+
+from typing import Any, Dict
+
+import numpy as np
+import pandas as pd
+
+from .feature_definitions import (
+    DEFAULT_FORM_WINDOW,
+    DEFAULT_HOME_ALPHA,
+    DEFAULT_STRENGTH_ALPHA,
+    FORM_SCALE,
+    MAX_POINTS,
+    MAX_RATING,
+    NEUTRAL_FORM,
+    NEUTRAL_GOALS,
+    NEUTRAL_HOME_ADVANTAGE,
+    NEUTRAL_STRENGTH,
+    RAW_COLUMNS,
+    STRENGTH_PER_GOAL,
+    feature_params,
+)
+
+
+def is_raw_matches(df: pd.DataFrame) -> bool:
+    """Whether a frame is a raw results table rather than an engineered matrix."""
+    return all(col in df.columns for col in RAW_COLUMNS)
+
+
+def _window_mean_before(values: np.ndarray, group_start: np.ndarray, pos: np.ndarray, window: int) -> np.ndarray:
+    """Mean of the previous ``window`` values within each group, NaN when there are none.
+
+    ``values`` must be grouped contiguously and time-ordered within groups;
+    ``group_start`` is the index of each row's first group row and ``pos`` its
+    position within the group.
+    """
+    csum = np.concatenate(([0.0], np.cumsum(values, dtype=np.float64)))
+    idx = np.arange(len(values))
+    lo = np.maximum(group_start, idx - window)
+    count = np.minimum(pos, window)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(count > 0, (csum[idx] - csum[lo]) / count, np.nan)
+
+
+def _ewm_before(values: pd.Series, groups: pd.Series, alpha: float) -> np.ndarray:
+    """EWMA (adjust=False) of prior values within each group, NaN when there are none."""
+    ewm = values.groupby(groups, sort=False).ewm(alpha=alpha, adjust=False).mean()
+    # groupby().ewm() prefixes the group key to the index; realign to the input rows
+    ewm = ewm.droplevel(0).reindex(values.index)
+    return ewm.groupby(groups, sort=False).shift(1).to_numpy()
+
+
+def build_training_matrix(
+    matches: pd.DataFrame,
+    form_window: int = DEFAULT_FORM_WINDOW,
+    strength_alpha: float = DEFAULT_STRENGTH_ALPHA,
+    home_alpha: float = DEFAULT_HOME_ALPHA,
+    target: str = "fulltime_result",
+) -> pd.DataFrame:
+    """Build engineered features and the target for every match in one pass.
+
+    Features use only matches played before each fixture and follow the same
+    definitions as ``TeamFeatureStore``, so a model trained on this matrix sees
+    the same inputs at serving time. Teams are processed with grouped
+    cumulative sums and EWMAs over a long (one row per team per match) view
+    rather than per-match Python loops.
+    """
+    matches = matches.assign(date=pd.to_datetime(matches["date"]))
+    matches = matches.sort_values("date", kind="stable").reset_index(drop=True)
+    n = len(matches)
+    home_goals = matches["home_goals"].to_numpy(dtype=np.float64)
+    away_goals = matches["away_goals"].to_numpy(dtype=np.float64)
+
+    # Long view: rows 0..n-1 are home sides, n..2n-1 away sides; teams as integer codes
+    team_codes, _ = pd.factorize(np.concatenate([matches["home_team"].to_numpy(), matches["away_team"].to_numpy()]))
+    long = pd.DataFrame({
+        "team": team_codes,
+        "match_idx": np.tile(np.arange(n), 2),
+        "is_home": np.repeat([True, False], n),
+        "goals_for": np.concatenate([home_goals, away_goals]),
+        "goals_against": np.concatenate([away_goals, home_goals]),
+    })
+    long["points"] = np.select(
+        [long["goals_for"] > long["goals_against"], long["goals_for"] == long["goals_against"]],
+        [MAX_POINTS, 1.0],
+        0.0,
+    )
+
+    # Group teams contiguously, chronological within each team
+    long = long.sort_values(["team", "match_idx"], kind="stable").reset_index(drop=True)
+    pos = long.groupby("team", sort=False).cumcount().to_numpy()
+    group_start = np.arange(len(long)) - pos
+
+    form = _window_mean_before(long["points"].to_numpy(), group_start, pos, form_window) * FORM_SCALE
+    goals_for = _window_mean_before(long["goals_for"].to_numpy(), group_start, pos, form_window)
+    goals_against = _window_mean_before(long["goals_against"].to_numpy(), group_start, pos, form_window)
+    goal_diff_ewm = _ewm_before(long["goals_for"] - long["goals_against"], long["team"], strength_alpha)
+    strength = np.clip(NEUTRAL_STRENGTH + STRENGTH_PER_GOAL * goal_diff_ewm, 0.0, MAX_RATING)
+
+    long["form"] = np.where(np.isnan(form), NEUTRAL_FORM, form)
+    long["strength"] = np.where(np.isnan(strength), NEUTRAL_STRENGTH, strength)
+    long["goals_for_avg"] = np.where(np.isnan(goals_for), NEUTRAL_GOALS, goals_for)
+    long["goals_against_avg"] = np.where(np.isnan(goals_against), NEUTRAL_GOALS, goals_against)
+
+    home_rows = long[long["is_home"].to_numpy()]
+    home_ewm = _ewm_before(home_rows["points"] / MAX_POINTS, home_rows["team"], home_alpha)
+
+    home = home_rows.set_index("match_idx").sort_index()
+    home_ewm = pd.Series(home_ewm, index=home_rows["match_idx"].to_numpy()).sort_index().to_numpy()
+    away = long[~long["is_home"].to_numpy()].set_index("match_idx").sort_index()
+
+    result = pd.DataFrame({
+        "date": matches["date"],
+        "home_team": matches["home_team"],
+        "away_team": matches["away_team"],
+        "home_team_form": home["form"].to_numpy(),
+        "away_team_form": away["form"].to_numpy(),
+        "home_team_strength": home["strength"].to_numpy(),
+        "away_team_strength": away["strength"].to_numpy(),
+        "home_advantage": np.where(np.isnan(home_ewm), NEUTRAL_HOME_ADVANTAGE, home_ewm),
+        "recent_goals_for": home["goals_for_avg"].to_numpy(),
+        "recent_goals_against": home["goals_against_avg"].to_numpy(),
+    })
+    result[target] = np.select([home_goals > away_goals, home_goals == away_goals], [0, 1], 2)
+    if "match_id" in matches.columns:
+        result["match_id"] = matches["match_id"].to_numpy()
+    else:
+        result["match_id"] = np.char.add("match_", np.arange(n).astype(str))
+    return result
+
+
+def engineer_features(df: pd.DataFrame, config: Dict[str, Any]) -> pd.DataFrame:
+    """Build the training matrix from a raw results table using config parameters."""
+    form_window, strength_alpha, home_alpha = feature_params(config)
+    return build_training_matrix(
+        df,
+        form_window=form_window,
+        strength_alpha=strength_alpha,
+        home_alpha=home_alpha,
+        target=config["inference"]["prediction_target"],
+    )
@@ -0,0 +1,140 @@
+"""Time-ordered event ID generation (UUIDv7 layout)."""
+
+import os
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+# Bit layout (RFC 9562 UUIDv7, fixed-length counter method):
+#   48-bit unix ms | ver 7 | 12-bit counter hi | var 0b10 | 18-bit counter lo | 44 random bits
+COUNTER_BITS = 30
+RANDOM_BITS = 44
+_COUNTER_MASK = (1 << COUNTER_BITS) - 1
+_RANDOM_MASK = np.uint64((1 << RANDOM_BITS) - 1)
+# Fresh milliseconds start the counter in its lower half so a burst cannot overflow it
+_COUNTER_SEED_BITS = COUNTER_BITS - 1
+
+
+def _hyphenate(raw: np.ndarray) -> List[str]:
+    """Format an (n, 16) byte array as canonical 8-4-4-4-12 UUID strings."""
+    n = len(raw)
+    hex_digits = np.frombuffer(raw.tobytes().hex().encode("ascii"), dtype=np.uint8).reshape(n, 32)
+    out = np.full((n, 36), ord("-"), dtype=np.uint8)
+    out[:, 0:8] = hex_digits[:, 0:8]
+    out[:, 9:13] = hex_digits[:, 8:12]
+    out[:, 14:18] = hex_digits[:, 12:16]
+    out[:, 19:23] = hex_digits[:, 16:20]
+    out[:, 24:36] = hex_digits[:, 20:32]
+    text = out.tobytes().decode("ascii")
+    return [text[i:i + 36] for i in range(0, 36 * n, 36)]
+
+
+class EventIdGenerator:
+    """Bulk generator of time-sortable UUIDv7 event IDs.
+
+    IDs sort by creation time, so database indexes on them receive
+    append-mostly keys instead of random ones. Within a millisecond a 30-bit
+    counter keeps IDs from one generator strictly increasing, including
+    across calls. The counter starts at a random point for each new
+    millisecond and every ID carries 44 random bits, both from one
+    ``os.urandom`` draw per batch, so IDs from different processes do not
+    collide in practice; forked children reseed rather than continue the
+    parent's sequence.
+    """
+
+    def __init__(self):
+        self._reset()
+        if hasattr(os, "register_at_fork"):
+            # A forked child reseeds its counter instead of continuing the parent's
+            os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self) -> None:
+        """Forget the last issued slot so the next ID starts a fresh random counter."""
+        self._lock = threading.Lock()
+        self._last_ms = -1
+        self._last_counter = 0
+
+    def _reserve(self, n: int, seed: int) -> Tuple[int, int]:
+        """Claim ``n`` consecutive (ms, counter) slots and return the first."""
+        with self._lock:
+            now_ms = time.time_ns() // 1_000_000
+            if now_ms > self._last_ms:
+                start_ms, start_counter = now_ms, seed
+            else:
+                # Same millisecond (or the clock stepped back): continue the sequence
+                start_ms, start_counter = self._last_ms, self._last_counter + 1
+            end = start_counter + n - 1
+            self._last_ms = start_ms + (end >> COUNTER_BITS)
+            self._last_counter = end & _COUNTER_MASK
+            return start_ms, start_counter
+
+    def new_ids(self, n: int) -> List[str]:
+        """Generate ``n`` increasing event IDs."""
+        if n <= 0:
+            return []
+        entropy = np.frombuffer(os.urandom(8 * (n + 1)), dtype=np.uint64)
+        seed = int(entropy[0]) & ((1 << _COUNTER_SEED_BITS) - 1)
+        start_ms, start_counter = self._reserve(n, seed)
+
+        # Counter overflow carries into the timestamp, which keeps the order
+        sequence = np.arange(start_counter, start_counter + n, dtype=np.uint64)
+        ms = np.uint64(start_ms) + (sequence >> np.uint64(COUNTER_BITS))
+        counter = sequence & np.uint64(_COUNTER_MASK)
+
+        words = np.empty((n, 2), dtype=">u8")
+        words[:, 0] = (ms << np.uint64(16)) | np.uint64(0x7000) | (counter >> np.uint64(18))
+        words[:, 1] = (
+            np.uint64(0b10 << 62)
+            | ((counter & np.uint64(0x3FFFF)) << np.uint64(RANDOM_BITS))
+            | (entropy[1:] & _RANDOM_MASK)
+        )
+        return _hyphenate(words.view(np.uint8).reshape(n, 16))
+
+    def new_id(self) -> str:
+        """Generate one event ID (scalar path, without numpy overhead)."""
+        # 80 bits: the counter seed takes the top bits, the random tail the low 44
+        entropy = int.from_bytes(os.urandom(10), "big")
+        ms, counter = self._reserve(1, entropy >> (80 - _COUNTER_SEED_BITS))
+        value = (
+            (ms << 80)
+            | (0x7 << 76)
+            | ((counter >> 18) << 64)
+            | (0b10 << 62)
+            | ((counter & 0x3FFFF) << RANDOM_BITS)
+            | (entropy & int(_RANDOM_MASK))
+        )
+        return str(uuid.UUID(int=value))
+
+
+def event_id_datetime(event_id: str) -> datetime:
+    """Creation time (UTC, millisecond precision) encoded in an event ID."""
+    ms = uuid.UUID(event_id).int >> 80
+    return datetime.fromtimestamp(ms / 1000, tz=timezone.utc)
+
+
+_generator: Optional[EventIdGenerator] = None
+_generator_lock = threading.Lock()
+
+
+def get_event_id_generator() -> EventIdGenerator:
+    """Factory function for the process-wide event ID generator."""
+    global _generator
+    if _generator is None:
+        with _generator_lock:
+            if _generator is None:
+                _generator = EventIdGenerator()
+    return _generator
+
+
+def new_event_ids(n: int) -> List[str]:
+    """Generate ``n`` time-ordered event IDs."""
+    return get_event_id_generator().new_ids(n)
+
+
+def new_event_id() -> str:
+    """Generate one time-ordered event ID."""
+    return get_event_id_generator().new_id()
@@ -0,0 +1,155 @@
+"""In-memory stand-in for the Supabase client used by benchmarks and tests."""
+
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class _Response:
+    """Query result with the ``data`` attribute of a Supabase response."""
+
+    def __init__(self, data: List[Dict[str, Any]]):
+        self.data = data
+
+
+class _TableQuery:
+    """Chainable query against one in-memory table."""
+
+    def __init__(self, store: "InMemorySupabaseClient", table: str):
+        self.store = store
+        self.table = table
+        self._op: Optional[str] = None
+        self._payload: Any = None
+        self._on_conflict: Optional[str] = None
+        self._filters: List[Tuple[str, Any]] = []
+        self._limit: Optional[int] = None
+
+    def insert(self, rows: Any) -> "_TableQuery":
+        """Insert one row or a list of rows."""
+        self._op, self._payload = "insert", rows
+        return self
+
+    def upsert(self, rows: Any, on_conflict: Optional[str] = None) -> "_TableQuery":
+        """Insert rows, updating those whose conflict key already exists."""
+        self._op, self._payload, self._on_conflict = "upsert", rows, on_conflict
+        return self
+
+    def update(self, values: Dict[str, Any]) -> "_TableQuery":
+        """Update matching rows."""
+        self._op, self._payload = "update", values
+        return self
+
+    def delete(self) -> "_TableQuery":
+        """Delete matching rows."""
+        self._op = "delete"
+        return self
+
+    def select(self, columns: str = "*") -> "_TableQuery":
+        """Select matching rows (all columns)."""
+        self._op = "select"
+        return self
+
+    def eq(self, column: str, value: Any) -> "_TableQuery":
+        """Filter on column equality."""
+        self._filters.append((column, value))
+        return self
+
+    def limit(self, n: int) -> "_TableQuery":
+        """Return at most n rows."""
+        self._limit = n
+        return self
+
+    def execute(self) -> _Response:
+        """Run the query."""
+        return self.store._execute(self)
+
+
+class InMemorySupabaseClient:
+    """Dict-backed tables implementing the subset of the Supabase client the pipeline calls.
+
+    Supports ``table(name).insert/upsert/update/delete/select(...).eq(...).execute()``.
+    Rows are indexed by their unique ``id``/``event_id`` key so equality
+    filters and upserts on that key are O(1); other filters scan. Upserts
+    may name another unique column with ``on_conflict`` (``match_id`` of the
+    fixtures table); ``match_id`` is not a key elsewhere, since the
+    evaluation log holds several rows per match.
+    """
+
+    KEY_COLUMNS = ("id", "event_id")
+
+    def __init__(self):
+        self.tables: Dict[str, List[Dict[str, Any]]] = {}
+        self._indexes: Dict[Tuple[str, str], Dict[Any, int]] = {}
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def table(self, name: str) -> _TableQuery:
+        """Start a query against a table."""
+        return _TableQuery(self, name)
+
+    def _index(self, table: str, column: str) -> Dict[Any, int]:
+        """Row position by key column value, built on first use."""
+        key = (table, column)
+        if key not in self._indexes:
+            rows = self.tables.get(table, [])
+            self._indexes[key] = {row[column]: i for i, row in enumerate(rows) if column in row}
+        return self._indexes[key]
+
+    def _matching(self, query: _TableQuery) -> List[int]:
+        """Positions of rows matching all equality filters."""
+        rows = self.tables.get(query.table, [])
+        if not query._filters:
+            return list(range(len(rows)))
+        column, value = query._filters[0]
+        if column in self.KEY_COLUMNS:
+            pos = self._index(query.table, column).get(value)
+            candidates = [] if pos is None else [pos]
+        else:
+            candidates = range(len(rows))
+        return [i for i in candidates if all(rows[i].get(c) == v for c, v in query._filters)]
+
+    def _append(self, table: str, row: Dict[str, Any]) -> None:
+        """Append a row and keep built indexes current."""
+        rows = self.tables.setdefault(table, [])
+        rows.append(row)
+        for (indexed_table, column), index in self._indexes.items():
+            if indexed_table == table and column in row:
+                index[row[column]] = len(rows) - 1
+
+    def _execute(self, query: _TableQuery) -> _Response:
+        """Apply a query to the tables."""
+        with self._lock:
+            self.calls += 1
+            payload = query._payload
+            if query._op in ("insert", "upsert"):
+                rows = payload if isinstance(payload, list) else [payload]
+                out = []
+                for row in rows:
+                    row = dict(row)
+                    if query._op == "upsert":
+                        conflict = query._on_conflict or next((c for c in self.KEY_COLUMNS if c in row), None)
+                        pos = self._index(query.table, conflict).get(row.get(conflict)) if conflict else None
+                        if pos is not None:
+                            self.tables[query.table][pos].update(row)
+                            out.append(self.tables[query.table][pos])
+                            continue
+                    self._append(query.table, row)
+                    out.append(row)
+                return _Response(out)
+
+            rows = self.tables.get(query.table, [])
+            matched = self._matching(query)
+            if query._op == "update":
+                for i in matched:
+                    rows[i].update(payload)
+                return _Response([rows[i] for i in matched])
+            if query._op == "delete":
+                removed = [rows[i] for i in matched]
+                keep = set(range(len(rows))) - set(matched)
+                self.tables[query.table] = [rows[i] for i in sorted(keep)]
+                self._indexes = {k: v for k, v in self._indexes.items() if k[0] != query.table}
+                return _Response(removed)
+
+            selected = [dict(rows[i]) for i in matched]
+            if query._limit is not None:
+                selected = selected[:query._limit]
+            return _Response(selected)
@@ -0,0 +1,254 @@
+"""In-process latency histograms and counters with Prometheus text exposition."""
+
+import bisect
+import json
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Seconds; log-spaced from 50us to 10s so sub-millisecond stages stay resolvable
+DEFAULT_BUCKETS = (
+    0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _labels(labels: Optional[Dict[str, Any]]) -> Labels:
+    """Hashable, sorted label set."""
+    return tuple(sorted((key, str(value)) for key, value in (labels or {}).items()))
+
+
+def _format_labels(labels: Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+    """Render a label set in Prometheus text format."""
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+    return "{" + ",".join(f'{key}="{value}"' for (key, _), value in zip(pairs, escaped)) + "}"
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram.
+
+    Recording is a binary search and two additions, so it is cheap enough for
+    every request; quantiles are estimated from the buckets by linear
+    interpolation, which is what Prometheus' ``histogram_quantile`` does.
+    """
+
+    __slots__ = ("bounds", "counts", "count", "sum", "max")
+
+    def __init__(self, bounds: Sequence[float] = DEFAULT_BUCKETS):
+        self.bounds = tuple(bounds)
+        # One extra slot for observations above the last bound (+Inf)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        """Record one latency."""
+        self.counts[bisect.bisect_left(self.bounds, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate a quantile in seconds from the bucket counts."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        cumulative = 0
+        for i, n in enumerate(self.counts):
+            if n and cumulative + n >= rank:
+                lower = self.bounds[i - 1] if i > 0 else 0.0
+                upper = self.bounds[i] if i < len(self.bounds) else self.max
+                return min(lower + (upper - lower) * (rank - cumulative) / n, self.max)
+            cumulative += n
+        return self.max
+
+    def summary(self) -> Dict[str, Any]:
+        """Count, mean, max and estimated p50/p90/p99 in milliseconds."""
+        def ms(value: Optional[float]) -> Optional[float]:
+            return round(value * 1000, 4) if value is not None else None
+
+        return {
+            "count": self.count,
+            "mean_ms": ms(self.sum / self.count) if self.count else None,
+            "p50_ms": ms(self.quantile(0.50)),
+            "p90_ms": ms(self.quantile(0.90)),
+            "p99_ms": ms(self.quantile(0.99)),
+            "max_ms": ms(self.max) if self.count else None,
+        }
+
+
+class MetricsRegistry:
+    """Thread-safe latency histograms, counters and gauges for one process.
+
+    Histograms are keyed by metric name and labels (e.g. ``stage``); a
+    snapshot summarises them and ``render_prometheus`` produces the text
+    exposition format for scraping. A disabled registry records nothing.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+        namespace: str = "ml_pipeline",
+    ):
+        self.enabled = enabled
+        self.buckets = tuple(sorted(buckets))
+        self.namespace = namespace
+        self.histograms: Dict[Tuple[str, Labels], LatencyHistogram] = {}
+        self.counters: Dict[Tuple[str, Labels], float] = {}
+        self.gauges: Dict[Tuple[str, Labels], float] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "MetricsRegistry":
+        """Create a registry from the ``metrics`` config section."""
+        metrics_config = config.get("metrics", {})
+        return cls(
+            enabled=metrics_config.get("enabled", True),
+            buckets=metrics_config.get("latency_buckets") or DEFAULT_BUCKETS,
+        )
+
+    def observe(self, name: str, seconds: float, labels: Optional[Dict[str, Any]] = None) -> None:
+        """Record a latency in a histogram."""
+        if not self.enabled:
+            return
+        key = (name, _labels(labels))
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = LatencyHistogram(self.buckets)
+            histogram.observe(seconds)
+
+    @contextmanager
+    def timer(self, name: str, labels: Optional[Dict[str, Any]] = None) -> Iterator[None]:
+        """Record the wall time of the enclosed block, including when it raises."""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, labels)
+
+    def inc(self, name: str, amount: float = 1, labels: Optional[Dict[str, Any]] = None) -> None:
+        """Increase a counter."""
+        if not self.enabled:
+            return
+        key = (name, _labels(labels))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def set_gauge(self, name: str, value: float, labels: Optional[Dict[str, Any]] = None) -> None:
+        """Set a gauge to its current value."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self.gauges[(name, _labels(labels))] = value
+
+    def reset(self) -> None:
+        """Drop all recorded metrics."""
+        with self._lock:
+            self.histograms.clear()
+            self.counters.clear()
+            self.gauges.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """JSON-serialisable summary of all metrics."""
+        def entries(items, value):
+            return [
+                {"name": name, "labels": dict(labels), **value(metric)}
+                for (name, labels), metric in sorted(items, key=lambda item: item[0])
+            ]
+
+        with self._lock:
+            return {
+                "latency": entries(self.histograms.items(), LatencyHistogram.summary),
+                "counters": entries(self.counters.items(), lambda v: {"value": v}),
+                "gauges": entries(self.gauges.items(), lambda v: {"value": v}),
+            }
+
+    def render_prometheus(self) -> str:
+        """All metrics in the Prometheus text exposition format (version 0.0.4)."""
+        lines: List[str] = []
+        with self._lock:
+            for kind, metrics in (("counter", self.counters), ("gauge", self.gauges)):
+                for name in sorted({name for name, _ in metrics}):
+                    full = f"{self.namespace}_{name}"
+                    lines.append(f"# TYPE {full} {kind}")
+                    for (metric, labels), value in sorted(metrics.items()):
+                        if metric == name:
+                            lines.append(f"{full}{_format_labels(labels)} {value}")
+
+            for name in sorted({name for name, _ in self.histograms}):
+                full = f"{self.namespace}_{name}"
+                lines.append(f"# TYPE {full} histogram")
+                for (metric, labels), histogram in sorted(self.histograms.items()):
+                    if metric != name:
+                        continue
+                    cumulative = 0
+                    for bound, n in zip(histogram.bounds, histogram.counts):
+                        cumulative += n
+                        lines.append(f"{full}_bucket{_format_labels(labels, ('le', repr(bound)))} {cumulative}")
+                    lines.append(f"{full}_bucket{_format_labels(labels, ('le', '+Inf'))} {histogram.count}")
+                    lines.append(f"{full}_sum{_format_labels(labels)} {histogram.sum}")
+                    lines.append(f"{full}_count{_format_labels(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+
+def serve_metrics(
+    registry: MetricsRegistry,
+    port: int = 9108,
+    host: str = "127.0.0.1",
+) -> ThreadingHTTPServer:
+    """Serve ``/metrics`` (Prometheus text) and ``/metrics.json`` (snapshot) from a daemon thread.
+
+    Call ``shutdown()`` on the returned server to stop it.
+    """
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path == "/metrics":
+                body = registry.render_prometheus().encode()
+                content_type = "text/plain; version=0.0.4; charset=utf-8"
+            elif self.path == "/metrics.json":
+                body = json.dumps(registry.snapshot()).encode()
+                content_type = "application/json"
+            else:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
+
+
+_registry: Optional[MetricsRegistry] = None
+
+
+def get_metrics_registry(config: Optional[Dict[str, Any]] = None) -> MetricsRegistry:
+    """Factory function for the process-wide metrics registry.
+
+    The first call creates it (from ``config`` when given); later calls return
+    the same registry so the engine and logger report into one place.
+    """
+    global _registry
+    if _registry is None:
+        _registry = MetricsRegistry.from_config(config) if config else MetricsRegistry()
+    return _registry
@@ -0,0 +1,175 @@
+"""Streaming accuracy monitoring for live predictions."""
+
+import logging
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+ALL_LEAGUES = "all"
+
+Timestamp = Union[datetime, date, str, None]
+
+
+class _DayBuckets:
+    """Fixed ring of per-day (correct, total) counters.
+
+    Slot ``day % n_days`` holds the counts for ``day``; a slot is reset when a
+    newer day claims it, so memory stays constant however long the stream runs.
+    """
+
+    __slots__ = ("days", "correct", "total")
+
+    def __init__(self, n_days: int):
+        self.days = [-1] * n_days
+        self.correct = [0] * n_days
+        self.total = [0] * n_days
+
+    def add(self, day: int, correct: bool) -> None:
+        """Count one settled prediction on a day."""
+        slot = day % len(self.days)
+        if self.days[slot] != day:
+            if self.days[slot] > day:
+                # Older than anything the ring still holds
+                return
+            self.days[slot] = day
+            self.correct[slot] = 0
+            self.total[slot] = 0
+        self.correct[slot] += int(correct)
+        self.total[slot] += 1
+
+    def window(self, today: int, n_days: int) -> Tuple[int, int]:
+        """Sum (correct, total) over the ``n_days`` days ending at ``today``."""
+        correct = total = 0
+        for slot_day, slot_correct, slot_total in zip(self.days, self.correct, self.total):
+            if today - n_days < slot_day <= today:
+                correct += slot_correct
+                total += slot_total
+        return correct, total
+
+
+class RollingAccuracyMonitor:
+    """Short- vs long-window live accuracy per model and league.
+
+    Each settled evaluation updates a constant-size ring of daily counters for
+    its (model, league) pair and for the model's all-league aggregate. Rolling
+    accuracy, the relative drop of the short window against the long window and
+    the alert state are derived from at most ``long_window_days`` buckets, so
+    an update is O(1) and memory does not grow with history. Day boundaries
+    follow the evaluation timestamps, which lets the monitor replay a log.
+    """
+
+    def __init__(
+        self,
+        short_window_days: int = 3,
+        long_window_days: int = 7,
+        drop_threshold: float = 0.20,
+        min_samples: int = 20,
+        logger: Optional[logging.Logger] = None,
+    ):
+        if not 0 < short_window_days <= long_window_days:
+            raise ValueError("short_window_days must be positive and at most long_window_days")
+
+        self.short_window_days = short_window_days
+        self.long_window_days = long_window_days
+        self.drop_threshold = drop_threshold
+        self.min_samples = min_samples
+        self.logger = logger or logging.getLogger(__name__)
+
+        self.buckets: Dict[Tuple[str, str], _DayBuckets] = {}
+        self.alerts: Dict[Tuple[str, str], bool] = {}
+        self.today = -1
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "RollingAccuracyMonitor":
+        """Create a monitor from the ``decay_monitoring`` config."""
+        decay_config = config.get("decay_monitoring", {})
+        return cls(
+            short_window_days=decay_config.get("short_window_days", 3),
+            long_window_days=decay_config.get("long_window_days", 7),
+            drop_threshold=decay_config.get("drop_threshold", 0.20),
+            min_samples=decay_config.get("min_window_samples", 20),
+        )
+
+    @staticmethod
+    def _day(timestamp: Timestamp) -> int:
+        """Day number of a timestamp, defaulting to now."""
+        if timestamp is None:
+            return datetime.utcnow().toordinal()
+        if isinstance(timestamp, str):
+            timestamp = datetime.fromisoformat(timestamp)
+        return timestamp.toordinal()
+
+    def update(
+        self,
+        model_id: str,
+        correct: bool,
+        league: Optional[str] = None,
+        timestamp: Timestamp = None,
+    ) -> Dict[str, Any]:
+        """Record one settled prediction and return the updated league state."""
+        day = self._day(timestamp)
+        self.today = max(self.today, day)
+
+        keys = [(model_id, ALL_LEAGUES)]
+        if league is not None and league != ALL_LEAGUES:
+            keys.append((model_id, league))
+
+        for key in keys:
+            buckets = self.buckets.get(key)
+            if buckets is None:
+                buckets = self.buckets[key] = _DayBuckets(self.long_window_days)
+            buckets.add(day, correct)
+            state = self._check_alert(key)
+        return state
+
+    def _check_alert(self, key: Tuple[str, str]) -> Dict[str, Any]:
+        """Recompute the state for a key and log alert transitions."""
+        state = self.state(*key)
+        was_alerting = self.alerts.get(key, False)
+        self.alerts[key] = state["alert"]
+        if state["alert"] and not was_alerting:
+            self.logger.warning(
+                f"Accuracy drop for {key[0]} ({key[1]}): "
+                f"{state['short_accuracy']:.2%} over {self.short_window_days}d vs "
+                f"{state['long_accuracy']:.2%} over {self.long_window_days}d ({state['drop']:.1%} drop)"
+            )
+        elif was_alerting and not state["alert"]:
+            self.logger.info(f"Accuracy drop cleared for {key[0]} ({key[1]})")
+        return state
+
+    def state(self, model_id: str, league: str = ALL_LEAGUES) -> Dict[str, Any]:
+        """Rolling accuracies, relative drop and alert flag for a model and league."""
+        buckets = self.buckets.get((model_id, league))
+        short_correct = short_total = long_correct = long_total = 0
+        if buckets is not None:
+            short_correct, short_total = buckets.window(self.today, self.short_window_days)
+            long_correct, long_total = buckets.window(self.today, self.long_window_days)
+
+        short_accuracy = short_correct / short_total if short_total else None
+        long_accuracy = long_correct / long_total if long_total else None
+        drop = None
+        if short_accuracy is not None and long_accuracy:
+            drop = (long_accuracy - short_accuracy) / long_accuracy
+
+        return {
+            "model_id": model_id,
+            "league": league,
+            "short_accuracy": short_accuracy,
+            "long_accuracy": long_accuracy,
+            "short_samples": short_total,
+            "long_samples": long_total,
+            "drop": drop,
+            "alert": drop is not None and short_total >= self.min_samples and drop >= self.drop_threshold,
+        }
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """States for every tracked model and league."""
+        return [self.state(model_id, league) for model_id, league in sorted(self.buckets)]
+
+    def active_alerts(self) -> List[Dict[str, Any]]:
+        """States currently in alert."""
+        return [state for state in self.snapshot() if state["alert"]]
+
+
+def get_accuracy_monitor(config: dict) -> RollingAccuracyMonitor:
+    """Factory function to get RollingAccuracyMonitor instance."""
+    return RollingAccuracyMonitor.from_config(config)
@@ -0,0 +1,133 @@
+"""Fitted feature preprocessing shared by training and serving."""
+
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+
+class FeaturePreprocessor:
+    """Missing-value imputation, IQR outlier clipping and standard scaling.
+
+    The preprocessor is fitted once at train time and pickled alongside the
+    model, so serving applies exactly the transform the model was trained on.
+    ``transform`` works on a float32 matrix in place: scaling is folded into a
+    single multiply-add, the IQR fences are pre-mapped into scaled space, and
+    NaNs are replaced by the (scaled, clipped) fill values at the end.
+    """
+
+    def __init__(
+        self,
+        handle_missing: Optional[str] = "mean",
+        outlier_detection: Optional[str] = "iqr",
+        scaling: Optional[str] = "StandardScaler",
+        iqr_factor: float = 1.5,
+    ):
+        for option, value, allowed in (
+            ("handle_missing", handle_missing, ("mean", "median")),
+            ("outlier_detection", outlier_detection, ("iqr",)),
+            ("scaling", scaling, ("StandardScaler",)),
+        ):
+            if value is not None and value not in allowed:
+                raise ValueError(f"Unsupported {option}: {value}")
+
+        self.handle_missing = handle_missing
+        self.outlier_detection = outlier_detection
+        self.scaling = scaling
+        self.iqr_factor = iqr_factor
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "FeaturePreprocessor":
+        """Create an unfitted preprocessor from the ``training.preprocessing`` config."""
+        preprocessing = config.get("training", {}).get("preprocessing", {})
+        return cls(
+            handle_missing=preprocessing.get("handle_missing"),
+            outlier_detection=preprocessing.get("outlier_detection"),
+            scaling=preprocessing.get("scaling"),
+            iqr_factor=preprocessing.get("iqr_factor", 1.5),
+        )
+
+    @classmethod
+    def from_scaler(cls, scaler: Any) -> "FeaturePreprocessor":
+        """Wrap a fitted StandardScaler saved by the earlier trainer.
+
+        That trainer filled missing values with the training means and did not
+        clip outliers, so missing inputs are imputed with the scaler's means.
+        """
+        n_features = scaler.n_features_in_
+        preprocessor = cls(handle_missing="mean", outlier_detection=None, scaling="StandardScaler")
+        preprocessor.mean_ = np.asarray(scaler.mean_ if scaler.mean_ is not None else np.zeros(n_features), dtype=np.float64)
+        preprocessor.scale_ = np.asarray(scaler.scale_ if scaler.scale_ is not None else np.ones(n_features), dtype=np.float64)
+        preprocessor.fill_values_ = preprocessor.mean_.copy()
+        preprocessor.lower_ = np.full(n_features, -np.inf)
+        preprocessor.upper_ = np.full(n_features, np.inf)
+        preprocessor._compile()
+        return preprocessor
+
+    def fit(self, X: np.ndarray) -> "FeaturePreprocessor":
+        """Fit imputation values, fences and scaling statistics."""
+        self.fit_transform(np.array(X, dtype=np.float32))
+        return self
+
+    def fit_transform(self, X: np.ndarray) -> np.ndarray:
+        """Fit on X and transform it, in place when X is already float32."""
+        X = np.asarray(X, dtype=np.float32)
+        n_features = X.shape[1]
+
+        if self.handle_missing == "median":
+            fill = np.nanmedian(X, axis=0)
+        elif self.handle_missing == "mean":
+            fill = np.nanmean(X, axis=0, dtype=np.float64)
+        else:
+            fill = np.full(n_features, np.nan)
+        self.fill_values_ = np.nan_to_num(np.asarray(fill, dtype=np.float64), nan=0.0)
+
+        if self.outlier_detection == "iqr":
+            q1, q3 = np.nanpercentile(X, [25, 75], axis=0)
+            spread = self.iqr_factor * (q3 - q1)
+            self.lower_ = np.nan_to_num(q1 - spread, nan=-np.inf)
+            self.upper_ = np.nan_to_num(q3 + spread, nan=np.inf)
+        else:
+            self.lower_ = np.full(n_features, -np.inf)
+            self.upper_ = np.full(n_features, np.inf)
+
+        # Scaling statistics are taken after imputation and clipping
+        self.mean_ = np.zeros(n_features)
+        self.scale_ = np.ones(n_features)
+        self._compile()
+        self.transform(X, copy=False)
+
+        if self.scaling == "StandardScaler":
+            self.mean_ = X.mean(axis=0, dtype=np.float64)
+            scale = X.std(axis=0, dtype=np.float64)
+            self.scale_ = np.where(scale > 0, scale, 1.0)
+            self._compile()
+            X -= self.mean_.astype(np.float32)
+            X /= self.scale_.astype(np.float32)
+        return X
+
+    def _compile(self) -> None:
+        """Precompute the fused multiply-add, scaled fences and scaled fill values."""
+        self._mul = (1.0 / self.scale_).astype(np.float32)
+        self._add = (-self.mean_ / self.scale_).astype(np.float32)
+        self._lower = ((self.lower_ - self.mean_) / self.scale_).astype(np.float32)
+        self._upper = ((self.upper_ - self.mean_) / self.scale_).astype(np.float32)
+        fill = (self.fill_values_ - self.mean_) / self.scale_
+        self._fill = np.clip(fill, self._lower, self._upper).astype(np.float32)
+        self._impute = self.handle_missing is not None
+
+    def transform(self, X: np.ndarray, copy: bool = True) -> np.ndarray:
+        """Impute, clip and scale X as float32.
+
+        With ``copy=False`` a float32 C-contiguous input is transformed in
+        place and returned.
+        """
+        if not hasattr(self, "_mul"):
+            raise ValueError("FeaturePreprocessor is not fitted")
+
+        X = np.array(X, dtype=np.float32, ndmin=2) if copy else np.atleast_2d(np.asarray(X, dtype=np.float32))
+        np.multiply(X, self._mul, out=X)
+        np.add(X, self._add, out=X)
+        np.clip(X, self._lower, self._upper, out=X)
+        if self._impute:
+            np.copyto(X, self._fill, where=np.isnan(X))
+        return X
@@ -0,0 +1,93 @@
+"""Stage-level timing and memory instrumentation."""
+
+import cProfile
+import resource
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+
+def max_rss_bytes() -> int:
+    """Peak resident set size of this process so far."""
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and kilobytes elsewhere
+    return int(max_rss if sys.platform == "darwin" else max_rss * 1024)
+
+
+class StageProfiler:
+    """Record wall time, CPU time and memory for named pipeline stages.
+
+    Each span records wall and process CPU seconds, the process peak RSS after
+    the stage and how much the stage raised it. When ``trace_memory`` is set,
+    tracemalloc runs for the profiler's lifetime and each span also records
+    its peak traced allocation; this is precise but slows allocation-heavy
+    Python code, so it is off by default. ``profile_path`` additionally runs
+    cProfile across all spans and dumps a pstats file on ``close``.
+    """
+
+    def __init__(self, trace_memory: bool = False, profile_path: Optional[str] = None):
+        self.stages: Dict[str, Dict[str, Any]] = {}
+        self.trace_memory = trace_memory
+        self.profile_path = Path(profile_path) if profile_path else None
+        self._profiler: Optional[cProfile.Profile] = None
+        self._started_tracing = False
+
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        if self.profile_path:
+            self._profiler = cProfile.Profile()
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        """Measure the enclosed block as a stage."""
+        rss_before = max_rss_bytes()
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            traced_before, _ = tracemalloc.get_traced_memory()
+        if self._profiler:
+            self._profiler.enable()
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall_start
+            cpu = time.process_time() - cpu_start
+            if self._profiler:
+                self._profiler.disable()
+            rss_after = max_rss_bytes()
+
+            stage = {
+                "wall_seconds": round(wall, 4),
+                "cpu_seconds": round(cpu, 4),
+                "max_rss_bytes": rss_after,
+                "rss_growth_bytes": rss_after - rss_before,
+            }
+            if self.trace_memory:
+                _, traced_peak = tracemalloc.get_traced_memory()
+                stage["traced_peak_bytes"] = int(traced_peak - traced_before)
+            self.stages[name] = stage
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Return recorded stages in execution order."""
+        return dict(self.stages)
+
+    def total_seconds(self) -> float:
+        """Sum of wall time across recorded stages."""
+        return round(sum(stage["wall_seconds"] for stage in self.stages.values()), 4)
+
+    def close(self) -> Optional[str]:
+        """Stop tracing and write the pstats file if profiling was requested."""
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        if self._profiler and self.profile_path:
+            self.profile_path.parent.mkdir(parents=True, exist_ok=True)
+            self._profiler.dump_stats(str(self.profile_path))
+            self._profiler = None
+            return str(self.profile_path)
+        return None